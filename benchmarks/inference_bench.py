@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Compare prediction latency and memory of the Keras and NumPy inference paths.
+
+Each backend runs in its own interpreter so import cost and peak RSS are
+measured in isolation:
+
+    python benchmarks/inference_bench.py                 # random-weight model
+    python benchmarks/inference_bench.py --model lstm_model.h5 --npz lstm_model.npz
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+def _percentile_ms(samples, q):
+    ordered = sorted(samples)
+    return 1000.0 * ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process image in MB."""
+    # ru_maxrss survives fork+exec and would include the parent's footprint;
+    # VmHWM belongs to the current address space only.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(args):
+    """Measure one backend inside this process and print a JSON result."""
+    started = time.perf_counter()
+    import numpy as np
+    if args.worker == "keras":
+        import tensorflow as tf
+        model = tf.keras.models.load_model(args.model, compile=False)
+        lookback, n_features = model.input_shape[1], model.input_shape[2]
+
+        def predict_one(x):
+            return np.array([model(x, training=True).numpy()[0][0] for _ in range(args.mc)])
+
+        def predict_batch(x):
+            return model(x, training=False).numpy()
+    else:
+        from inference import NumpyLSTMRuntime
+        runtime = NumpyLSTMRuntime.load(args.npz)
+        lookback, n_features = runtime.input_shape
+
+        def predict_one(x):
+            return runtime.predict_mc(x, args.mc)[:, 0, 0]
+
+        def predict_batch(x):
+            return runtime.predict(x)
+    load_s = time.perf_counter() - started
+
+    rng = np.random.default_rng(0)
+    x = rng.random((1, lookback, n_features), dtype=np.float32)
+    predict_one(x)  # warm-up
+    latencies = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        predict_one(x)
+        latencies.append(time.perf_counter() - t0)
+
+    batch = rng.random((args.batch, lookback, n_features), dtype=np.float32)
+    predict_batch(batch)
+    t0 = time.perf_counter()
+    for _ in range(5):
+        predict_batch(batch)
+    batch_s = (time.perf_counter() - t0) / 5
+
+    print(json.dumps({
+        "backend": args.worker,
+        "load_s": round(load_s, 3),
+        "mc_p50_ms": round(_percentile_ms(latencies, 0.50), 3),
+        "mc_p99_ms": round(_percentile_ms(latencies, 0.99), 3),
+        "batch_windows_per_s": round(args.batch / batch_s, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def build_random_model(workdir, lookback, n_features):
+    """Save a random-weight model and its NumPy export for benchmarking."""
+    os.environ.setdefault("OANDA_ACCESS_TOKEN", "benchmark")  # config refuses to import without credentials
+    os.environ.setdefault("OANDA_ACCOUNT_ID", "benchmark")
+    from model import build_model
+    from inference import export_numpy_model
+    model = build_model(lookback, n_features)
+    model_path = os.path.join(workdir, "bench_model.h5")
+    npz_path = os.path.join(workdir, "bench_model.npz")
+    model.save(model_path, include_optimizer=False)
+    export_numpy_model(model, npz_path)
+    return model_path, npz_path
+
+
+def compare(model_path, npz_path, runs, mc, batch):
+    results = []
+    for backend in ("keras", "numpy"):
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", backend, "--model", model_path,
+               "--npz", npz_path, "--runs", str(runs), "--mc", str(mc),
+               "--batch", str(batch)]
+        env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+        out = subprocess.run(cmd, capture_output=True, text=True, env=env, check=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="Saved Keras model (.h5); a random one is built if omitted")
+    parser.add_argument("--npz", help="NumPy export of --model")
+    parser.add_argument("--lookback", type=int, default=50, help="Window length for the random model")
+    parser.add_argument("--features", type=int, default=1, help="Input features for the random model")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--mc", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--worker", choices=["keras", "numpy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        model_path, npz_path = args.model, args.npz
+        if not model_path:
+            model_path, npz_path = build_random_model(workdir, args.lookback, args.features)
+        results = compare(model_path, npz_path, args.runs, args.mc, args.batch)
+
+    print(f"{'backend':<8} {'load s':>8} {'MC p50 ms':>10} {'MC p99 ms':>10} {'batch win/s':>12} {'RSS MB':>8}")
+    for r in results:
+        print(f"{r['backend']:<8} {r['load_s']:>8} {r['mc_p50_ms']:>10} {r['mc_p99_ms']:>10} "
+              f"{r['batch_windows_per_s']:>12} {r['peak_rss_mb']:>8}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
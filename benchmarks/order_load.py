@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Drive orders through `APIManager.execute_trade` against the local mock exchange.
+
+Measures order throughput and ack latency (risk check, signing, HTTP round
+trip and journal enqueue) and how the path behaves when the venue throttles
+or fails:
+
+    python benchmarks/order_load.py                                  # 2000 Coinbase orders, 8 workers
+    python benchmarks/order_load.py --concurrency 1,4,16 --latency 0.01
+    python benchmarks/order_load.py --venue oanda --rate-limit 200 --error-rate 0.01
+    python benchmarks/order_load.py --url http://127.0.0.1:8800      # a running mock_exchange.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+SYMBOLS = {"coinbase": "BTC-USD", "oanda": "EUR_USD"}
+
+
+def _percentile_ms(samples, q):
+    ordered = sorted(samples)
+    return 1000.0 * ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _configure_environment(url):
+    """Credentials and endpoints for the mock; must run before config is imported."""
+    os.environ.setdefault("OANDA_ACCESS_TOKEN", "load-test")
+    os.environ.setdefault("OANDA_ACCOUNT_ID", "101-001-0000000-001")
+    os.environ.setdefault("COINBASE_API_KEY", "load-test")
+    os.environ.setdefault("COINBASE_API_SECRET", "bG9hZC10ZXN0LXNlY3JldA==")  # cbpro signs with a base64 secret
+    os.environ.setdefault("COINBASE_API_PASSPHRASE", "load-test")
+    os.environ.setdefault("DB_FILE", os.path.join(tempfile.mkdtemp(prefix="coinfx-load-"), "trades.db"))
+    os.environ["COINBASE_API_URL"] = url
+    os.environ["OANDA_API_URL"] = url
+
+
+def run_load(manager, venue, orders, concurrency):
+    """Send `orders` alternating buy/sell orders from `concurrency` threads; returns latencies in seconds."""
+    symbol = SYMBOLS[venue]
+
+    def send(i):
+        t0 = time.perf_counter()
+        manager.execute_trade(symbol, i % 2, venue, amount="100")
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="order-load") as pool:
+        return list(pool.map(send, range(orders)))
+
+
+def summarize(venue, concurrency, latencies, wall, before, after):
+    outcomes = {k: after.get(k, 0) - before.get(k, 0) for k in set(after) | set(before)}
+    return {
+        "venue": venue,
+        "concurrency": concurrency,
+        "orders": len(latencies),
+        "wall_s": round(wall, 3),
+        "orders_per_s": round(len(latencies) / wall, 1),
+        "p50_ms": round(_percentile_ms(latencies, 0.50), 3),
+        "p99_ms": round(_percentile_ms(latencies, 0.99), 3),
+        "max_ms": round(1000.0 * max(latencies), 3),
+        "accepted": outcomes.get("accepted", 0),
+        "throttled": outcomes.get("throttled", 0),
+        "errors": outcomes.get("errors", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--venue", choices=sorted(SYMBOLS), default="coinbase")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--concurrency", default="8", help="Worker threads; a comma-separated list sweeps")
+    parser.add_argument("--url", help="Use a running mock exchange instead of starting one in-process")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock venue latency per request, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Mock venue requests/s before 429s")
+    parser.add_argument("--burst", type=float, default=None)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON only")
+    args = parser.parse_args()
+
+    _configure_environment((args.url or "http://127.0.0.1").rstrip("/"))
+    import logging
+    from config import TRADING_CONFIG
+    from genetic_trading import APIManager
+    from journal import get_journal
+    from mock_exchange import MockExchange
+    from risk import RiskEngine
+
+    exchange = None
+    if not args.url:
+        # Venue-side counts (accepted / 429 / 5xx) are only available for an in-process exchange.
+        exchange = MockExchange(port=0, ws_port=None, latency=args.latency, jitter=args.jitter,
+                                error_rate=args.error_rate, rate_limit=args.rate_limit, burst=args.burst,
+                                seed=0).start()
+        TRADING_CONFIG["COINBASE_API_URL"] = TRADING_CONFIG["OANDA_API_URL"] = exchange.rest_url
+    logging.getLogger("genetic_trading").setLevel(logging.WARNING)  # one info line per order would dominate
+
+    # Limits wide open so every order reaches the venue; the checks themselves still run.
+    risk = RiskEngine(capital=1e12, max_position_size=1.0, max_concurrent_trades=10 ** 6, cooldown=0)
+    manager = APIManager(risk_engine=risk)
+
+    results = []
+    try:
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            run_load(manager, args.venue, min(args.orders, 50), concurrency)  # warm connections
+            before = exchange.stats()[args.venue] if exchange else {}
+            t0 = time.perf_counter()
+            latencies = run_load(manager, args.venue, args.orders, concurrency)
+            wall = time.perf_counter() - t0
+            after = exchange.stats()[args.venue] if exchange else {}
+            results.append(summarize(args.venue, concurrency, latencies, wall, before, after))
+    finally:
+        get_journal().flush()
+        if exchange is not None:
+            exchange.stop()
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    print(f"{'venue':<9} {'workers':>7} {'orders/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'accepted':>9} {'429':>6} {'5xx':>6}")
+    for r in results:
+        print(f"{r['venue']:<9} {r['concurrency']:>7} {r['orders_per_s']:>9} {r['p50_ms']:>8} {r['p99_ms']:>8} "
+              f"{r['max_ms']:>8} {r['accepted']:>9} {r['throttled']:>6} {r['errors']:>6}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite for the trading hot paths, with JSON baselines.
+
+    python benchmarks/suite.py                        # run and compare with baselines.json
+    python benchmarks/suite.py --only ga_evolve,feed_decode
+    python benchmarks/suite.py --update               # record new baselines
+    python benchmarks/suite.py --threshold 0.5        # allow 50% slowdown before failing
+    python benchmarks/suite.py --recording recordings/  # decode a recorded feed instead
+
+Every case runs on synthetic data (or a FeedRecorder recording) with no
+network access. The exit status is 1 when any case is slower than its
+baseline median by more than the threshold (BENCH_THRESHOLD, default 0.25).
+Baselines are machine specific; record them on the machine that gates.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+sys.path.insert(0, BASE_DIR)
+
+# Keep every file the pipeline touches out of the working tree.
+WORKDIR = tempfile.mkdtemp(prefix="coinfx-bench-")
+os.environ.setdefault("OANDA_ACCESS_TOKEN", "benchmark")  # config refuses to import without credentials
+os.environ.setdefault("OANDA_ACCOUNT_ID", "benchmark")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+for _var, _name in (("SCALER_FILE", "scaler.npz"), ("MODEL_FILE", "lstm_model.h5"),
+                    ("INFERENCE_FILE", "lstm_model.npz"), ("DB_FILE", "trades.db"),
+                    ("TRADE_LOG_FILE", "trade_log.csv")):
+    os.environ[_var] = os.path.join(WORKDIR, _name)
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_candles(n, seed=0, start=1_700_000_000, granularity=300):
+    """Random-walk OHLCV candles in Coinbase column order."""
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    return pd.DataFrame({
+        "time": start + granularity * np.arange(n),
+        "low": close - spread,
+        "high": close + spread,
+        "open": np.roll(close, 1),
+        "close": close,
+        "volume": rng.uniform(0.1, 5.0, n),
+    })
+
+
+def synthetic_frames(n, seed=0):
+    """Raw ticker and level-2 frames, roughly the mix of a BTC-USD session."""
+    rng = np.random.default_rng(seed)
+    prices = 30_000 + np.cumsum(rng.normal(0, 2.0, n))
+    levels = [[f"{30_000 - i:.2f}", "0.5"] for i in range(1, 200)]
+    frames = [json.dumps({"type": "snapshot", "product_id": "BTC-USD", "bids": levels,
+                          "asks": [[f"{30_000 + i:.2f}", "0.5"] for i in range(1, 200)]})]
+    for i, price in enumerate(prices):
+        if i % 3:
+            side = "buy" if i % 2 else "sell"
+            level = price - 1 if side == "buy" else price + 1
+            frames.append(json.dumps({"type": "l2update", "product_id": "BTC-USD",
+                                      "changes": [[side, f"{level:.2f}", f"{rng.uniform(0, 2):.4f}"]]}))
+        else:
+            frames.append(json.dumps({"type": "ticker", "product_id": "BTC-USD", "price": f"{price:.2f}",
+                                      "last_size": f"{rng.uniform(0, 0.1):.6f}"}))
+    return frames
+
+
+# ✅ Benchmark cases: setup(args) returns a zero-argument callable to time
+# (optionally with an item count for throughput). The callable returns the
+# pipeline result so failures, which log and return None, are caught.
+
+def bench_ga_evolve(args):
+    from genetic_trading import GeneticTradingStrategy
+    prices = synthetic_candles(1000)["close"].to_numpy()
+
+    def run():
+        np.random.seed(0)
+        return GeneticTradingStrategy(prices, pop_size=40, generations=5).evolve()
+    return run
+
+
+def bench_ga_rules_evolve(args):
+    from genetic_trading import RuleBasedStrategy
+    prices = synthetic_candles(100_000)["close"].to_numpy()
+
+    def run():
+        np.random.seed(0)
+        return RuleBasedStrategy(prices, pop_size=40, generations=5).evolve()
+    return run
+
+
+def bench_portfolio_backtest(args):
+    from portfolio import PortfolioBacktest
+    closes = np.column_stack([synthetic_candles(20_000, seed=i)["close"].to_numpy() for i in range(5)])
+    backtest = PortfolioBacktest(closes)
+    return lambda: backtest.run(), closes.size
+
+
+def bench_preprocess_close(args):
+    from data_handler import preprocess_data
+    df = synthetic_candles(50_000)
+    return lambda: preprocess_data(df.copy(), save_scaler=False, features=["close"])
+
+
+def bench_preprocess_features(args):
+    from data_handler import preprocess_data
+    df = synthetic_candles(50_000)
+    return lambda: preprocess_data(df.copy(), save_scaler=False, features=["close", "rsi", "atr", "returns"])
+
+
+def bench_predict_price(args):
+    import data_handler
+    import model
+    from config import TRADING_CONFIG
+    from inference import export_numpy_model
+    from scaler import OnlineScaler, model_fingerprint
+
+    lookback = TRADING_CONFIG["LOOKBACK"]
+    net = model.build_model(lookback, 1)
+    net.save(TRADING_CONFIG["MODEL_FILE"], include_optimizer=False)
+    version = model_fingerprint(TRADING_CONFIG["MODEL_FILE"])
+    closes = synthetic_candles(5000)["close"].to_numpy()
+    scaler = OnlineScaler()
+    scaler.fit(closes.reshape(-1, 1))
+    scaler.save(TRADING_CONFIG["SCALER_FILE"], model_version=version)
+    export_numpy_model(net, TRADING_CONFIG["INFERENCE_FILE"], model_version=version)
+
+    data_handler.reset_live_state()
+    for price in closes[-lookback:]:
+        data_handler.handle_feed_message({"price": price, "last_size": 0.01})
+    model.seed_mc(0)
+    # Keep the timed path free of retraining.
+    return lambda: model.predict_price(retrain_on_drift=False, mc_runs=20)
+
+
+def bench_feed_decode(args):
+    import data_handler
+    from feed_replay import iter_frames
+    if args.recording:
+        frames = [raw for _, raw in iter_frames(args.recording)]
+    else:
+        frames = synthetic_frames(20_000)
+
+    def run():
+        data_handler.reset_live_state()
+        for raw in frames:
+            data_handler.handle_feed_message(json.loads(raw))
+        return len(data_handler.data_buffer)
+    return run, len(frames)
+
+
+def bench_historical_load(args):
+    import data_handler
+    candles = synthetic_candles(300)[["time", "low", "high", "open", "close", "volume"]]
+    payload = candles.iloc[::-1].values.tolist()  # the API returns newest first
+    response = mock.Mock(status_code=200, json=lambda: payload, raise_for_status=lambda: None)
+
+    def run():
+        with mock.patch.object(data_handler.requests, "get", return_value=response):
+            return data_handler.get_historical_data("BTC", cache={})
+    return run
+
+
+BENCHMARKS = {
+    "ga_evolve": bench_ga_evolve,
+    "ga_rules_evolve": bench_ga_rules_evolve,
+    "portfolio_backtest": bench_portfolio_backtest,
+    "preprocess_close": bench_preprocess_close,
+    "preprocess_features": bench_preprocess_features,
+    "predict_price": bench_predict_price,
+    "feed_decode": bench_feed_decode,
+    "historical_load": bench_historical_load,
+}
+
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        # The pipeline logs and returns None on failure; never time the error path.
+        out = fn()
+        if out is None or isinstance(out, tuple) and out[0] is None:
+            raise RuntimeError("benchmark case returned no result; see the log for the error")
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def run_suite(names, args):
+    results = {}
+    for name in names:
+        setup = BENCHMARKS[name](args)
+        fn, items = setup if isinstance(setup, tuple) else (setup, None)
+        samples = measure(fn, args.repeat)
+        result = {
+            "median_s": round(statistics.median(samples), 6),
+            "min_s": round(min(samples), 6),
+            "repeat": len(samples),
+        }
+        if items:
+            result["items_per_s"] = round(items / result["median_s"], 1)
+        results[name] = result
+        print(f"{name:<22} median {result['median_s'] * 1000:>10.2f} ms   min {result['min_s'] * 1000:>10.2f} ms"
+              + (f"   {result['items_per_s']:>12,.0f}/s" if items else ""))
+    return results
+
+
+def compare(results, baselines, threshold):
+    """Returns (name, baseline_s, current_s, ratio) for every case slower than allowed."""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            continue
+        ratio = result["median_s"] / baseline["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline["median_s"], result["median_s"], ratio))
+    return regressions
+
+
+def load_baselines(path):
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("results", {})
+
+
+def save_baselines(path, results):
+    existing = load_baselines(path)
+    existing.update(results)
+    with open(path, "w") as f:
+        json.dump({
+            "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                        "processor": platform.machine(), "cpus": os.cpu_count()},
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "results": existing,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="Comma-separated case names; default runs all")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCH_THRESHOLD", 0.25)),
+                        help="Allowed fractional slowdown versus the baseline median")
+    parser.add_argument("--baselines", default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true", help="Write results as the new baselines")
+    parser.add_argument("--recording", help="FeedRecorder directory for the feed_decode case")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})")
+
+    results = run_suite(names, args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if args.update:
+        save_baselines(args.baselines, results)
+        print(f"Baselines written to {args.baselines}")
+        return 0
+
+    baselines = load_baselines(args.baselines)
+    missing = [n for n in names if n not in baselines]
+    if missing:
+        print(f"No baseline for: {', '.join(missing)} (run with --update to record)")
+    regressions = compare(results, baselines, args.threshold)
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x, "
+              f"limit {1 + args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Compare LSTM training throughput across TensorFlow execution profiles.
+
+Each profile trains in its own interpreter, because thread pools and the
+precision policy are fixed once TensorFlow starts:
+
+    python benchmarks/training_bench.py                     # all profiles
+    python benchmarks/training_bench.py --profiles default,xla --epochs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+CPUS = os.cpu_count() or 1
+
+# Environment overrides per profile; anything unset keeps the TRADING_CONFIG default.
+PROFILES = {
+    "default": {},
+    "threads": {"TF_INTRA_OP_THREADS": str(max(1, CPUS - 1)), "TF_INTER_OP_THREADS": "1"},
+    "xla": {"TF_JIT_COMPILE": "true"},
+    "tfdata": {"TF_DATA_CACHE": "true", "TF_DATA_PREFETCH": "true"},
+    "mixed": {"TF_MIXED_PRECISION": "true"},
+    "all": {"TF_INTRA_OP_THREADS": str(max(1, CPUS - 1)), "TF_INTER_OP_THREADS": "1", "TF_JIT_COMPILE": "true",
+            "TF_DATA_CACHE": "true", "TF_DATA_PREFETCH": "true", "TF_MIXED_PRECISION": "true"},
+}
+
+
+def run_worker(args):
+    """Train on synthetic windows in this process and print a JSON result."""
+    import numpy as np
+    import tensorflow as tf
+    from config import TRADING_CONFIG
+    from model import build_model
+    from tf_runtime import compile_options, training_data, tf_profile
+
+    rng = np.random.default_rng(0)
+    lookback = TRADING_CONFIG["LOOKBACK"]
+    series = np.cumsum(rng.normal(0, 1, args.samples + lookback)).astype("float32")
+    series = (series - series.min()) / (series.max() - series.min())
+    X = np.lib.stride_tricks.sliding_window_view(series[:-1], lookback)[:args.samples, :, None]
+    y = series[lookback:lookback + args.samples, None]
+
+    model = build_model(lookback, 1)
+    model.compile(optimizer=tf.keras.optimizers.Adam(1e-3), loss="mse", **compile_options())
+    x_fit, y_fit, fit_kwargs = training_data(X, y, args.batch)
+
+    epoch_times = []
+    for _ in range(args.epochs):
+        t0 = time.perf_counter()
+        history = model.fit(x_fit, y_fit, epochs=1, verbose=0, **fit_kwargs)
+        epoch_times.append(time.perf_counter() - t0)
+
+    steady = epoch_times[1:] or epoch_times
+    print(json.dumps({
+        "profile": args.worker,
+        "settings": tf_profile(),
+        "policy": tf.keras.mixed_precision.global_policy().name,
+        "first_epoch_s": round(epoch_times[0], 3),
+        "wall_s": round(sum(epoch_times), 3),
+        "samples_per_s": round(args.samples / (sum(steady) / len(steady)), 1),
+        "final_loss": round(float(history.history["loss"][-1]), 6),
+    }))
+
+
+def compare(profiles, samples, epochs, batch):
+    results = []
+    for name in profiles:
+        env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3", **PROFILES[name])
+        env.setdefault("OANDA_ACCESS_TOKEN", "benchmark")  # config refuses to import without credentials
+        env.setdefault("OANDA_ACCOUNT_ID", "benchmark")
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", name, "--samples", str(samples),
+               "--epochs", str(epochs), "--batch", str(batch)]
+        proc = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        if proc.returncode != 0:
+            results.append({"profile": name, "error": proc.stderr.strip().splitlines()[-1:]})
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="Comma-separated profile names")
+    parser.add_argument("--samples", type=int, default=4096, help="Training windows")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--worker", choices=list(PROFILES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    names = [n.strip() for n in args.profiles.split(",")]
+    unknown = [n for n in names if n not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profiles: {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+    results = compare(names, args.samples, args.epochs, args.batch)
+
+    print(f"{'profile':<9} {'policy':<15} {'1st epoch s':>11} {'wall s':>8} {'samples/s':>10} {'loss':>10}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['profile']:<9} failed: {r['error']}")
+            continue
+        print(f"{r['profile']:<9} {r['policy']:<15} {r['first_epoch_s']:>11} {r['wall_s']:>8} "
+              f"{r['samples_per_s']:>10} {r['final_loss']:>10}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
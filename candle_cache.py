@@ -0,0 +1,91 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from config import get_logger
+
+logger = get_logger(__name__)
+
+
+class _InFlight:
+    __slots__ = ("done", "value")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+class CandleCache:
+    """Process-wide LRU cache for candle frames with candle-aware expiry.
+
+    Keys are ``(asset, granularity, start, end)``. An open-ended range
+    (``end`` is None) changes when the current candle closes, so it expires
+    at the next granularity boundary plus `grace` seconds; a range that ended
+    before the current candle is immutable and kept for `closed_ttl`.
+    Concurrent misses for one key share a single fetch.
+    """
+
+    def __init__(self, max_entries=64, grace=2.0, closed_ttl=24 * 3600, clock=time.time):
+        self.max_entries = max_entries
+        self.grace = grace
+        self.closed_ttl = closed_ttl
+        self.clock = clock
+        self.hits = self.misses = self.coalesced = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def expires_at(self, granularity, end=None):
+        now = self.clock()
+        if end is not None and end < math.floor(now / granularity) * granularity:
+            return now + self.closed_ttl
+        return math.floor(now / granularity) * granularity + granularity + self.grace
+
+    def get_or_fetch(self, key, fetch):
+        """Returns the cached value for `key`, or calls `fetch()` once for all concurrent callers.
+
+        `fetch` returning None (a failed request) is passed to every waiting
+        caller but not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if self.clock() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = _InFlight()
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.coalesced += 1
+
+        if not owner:
+            pending.done.wait()
+            return pending.value
+
+        try:
+            pending.value = fetch()
+        finally:
+            with self._lock:
+                if pending.value is not None:
+                    _, granularity, _, end = key
+                    self._entries[key] = (pending.value, self.expires_at(granularity, end))
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                del self._in_flight[key]
+            pending.done.set()
+        return pending.value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -3,6 +3,7 @@ import dotenv
 import logging
 import time
 import threading
+from log_pipeline import configure_logging
 
 # ✅ Load Environment Variables Securely
 dotenv.load_dotenv(override=True)
@@ -11,18 +12,24 @@ dotenv.load_dotenv(override=True)
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
-logging.basicConfig(
-    filename=os.path.join(LOG_DIR, "trading.log"),
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
+# Records are queued on the caller's thread and written by a background listener,
+# so the feed and inference loops never wait on file I/O.
+configure_logging(
+    os.path.join(LOG_DIR, "trading.log"),
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    fmt=os.getenv("LOG_FORMAT", "text"),
+    max_bytes=int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024)),
+    backup_count=int(os.getenv("LOG_BACKUP_COUNT", 5)),
+    rotate_when=os.getenv("LOG_ROTATE_WHEN") or None,
+    throttle_spec=os.getenv("LOG_THROTTLE", "malformed_tick=10/60,ws_reconnect=5/60,tick_listener=5/60,scaler_range=1/60"),
 )
 
 logger = logging.getLogger(__name__)
 
 # ✅ Ensure logger function is correctly defined
-def get_logger():
-    """Returns the global logger instance."""
-    return logger
+def get_logger(name=None):
+    """Returns the global logger instance, or a named per-module logger."""
+    return logging.getLogger(name) if name else logger
 
 # ✅ Define Required & Optional API Credentials
 REQUIRED_ENV_VARS = {
@@ -77,16 +84,72 @@ TRADING_CONFIG = {
     "LEARNING_RATE": float(os.getenv("LEARNING_RATE", 0.001)),
     "EPOCHS": int(os.getenv("EPOCHS", 5)),
     "BATCH_SIZE": int(os.getenv("BATCH_SIZE", 16)),
-    "SCALER_FILE": os.getenv("SCALER_FILE", os.path.join(BASE_DIR, "scaler.pkl")),
+    "SCALER_FILE": os.getenv("SCALER_FILE", os.path.join(BASE_DIR, "scaler.npz")),
     "MODEL_FILE": os.getenv("MODEL_FILE", os.path.join(BASE_DIR, "lstm_model.h5")),
+    "INFERENCE_FILE": os.getenv("INFERENCE_FILE", os.path.join(BASE_DIR, "lstm_model.npz")),
+    "INFERENCE_BACKEND": os.getenv("INFERENCE_BACKEND", "numpy"),
     "DB_FILE": os.getenv("DB_FILE", os.path.join(BASE_DIR, "trades.db")),
     "TRADE_LOG_FILE": os.getenv("TRADE_LOG_FILE", os.path.join(BASE_DIR, "trade_log.csv")),
+    "COINBASE_API_URL": os.getenv("COINBASE_API_URL", "https://api.pro.coinbase.com").rstrip("/"),
+    "COINBASE_WS_URL": os.getenv("COINBASE_WS_URL", "wss://ws-feed.pro.coinbase.com"),
+    "OANDA_ENVIRONMENT": os.getenv("OANDA_ENVIRONMENT", "practice"),
+    "OANDA_API_URL": os.getenv("OANDA_API_URL", "").rstrip("/"),
+    "LIVE_FEED_LEVEL2": os.getenv("LIVE_FEED_LEVEL2", "false").lower() in ("1", "true", "yes"),
+    "FEED_RECORD_DIR": os.getenv("FEED_RECORD_DIR", ""),
+    "FEED_REPLAY_PATH": os.getenv("FEED_REPLAY_PATH", ""),
+    "FEED_REPLAY_SPEED": float(os.getenv("FEED_REPLAY_SPEED", 1.0)),
+    "MAX_SLIPPAGE_BPS": float(os.getenv("MAX_SLIPPAGE_BPS", 25)),
+    "JOURNAL_BATCH_SIZE": int(os.getenv("JOURNAL_BATCH_SIZE", 256)),
+    "JOURNAL_FLUSH_INTERVAL": float(os.getenv("JOURNAL_FLUSH_INTERVAL", 1.0)),
+    "HORIZONS": sorted({int(h) for h in os.getenv("HORIZONS", "1,5,15").split(",") if h.strip()}),
+    "HORIZON_STEP_SECONDS": int(os.getenv("HORIZON_STEP_SECONDS", 300)),
+    "MODEL_FEATURES": [f.strip() for f in os.getenv("MODEL_FEATURES", "close").split(",") if f.strip()],
+    "FEATURE_EMA_FAST": int(os.getenv("FEATURE_EMA_FAST", 12)),
+    "FEATURE_EMA_SLOW": int(os.getenv("FEATURE_EMA_SLOW", 26)),
+    "FEATURE_RSI_PERIOD": int(os.getenv("FEATURE_RSI_PERIOD", 14)),
+    "FEATURE_ATR_PERIOD": int(os.getenv("FEATURE_ATR_PERIOD", 14)),
+    "FEATURE_VOL_WINDOW": int(os.getenv("FEATURE_VOL_WINDOW", 20)),
+    "FEATURE_VWAP_WINDOW": int(os.getenv("FEATURE_VWAP_WINDOW", 48)),  # candles; same window live and in training
+    "TF_INTRA_OP_THREADS": int(os.getenv("TF_INTRA_OP_THREADS", 0)),
+    "TF_INTER_OP_THREADS": int(os.getenv("TF_INTER_OP_THREADS", 0)),
+    "TF_JIT_COMPILE": os.getenv("TF_JIT_COMPILE", "false").lower() in ("1", "true", "yes"),
+    "TF_DATA_CACHE": os.getenv("TF_DATA_CACHE", "true").lower() in ("1", "true", "yes"),
+    "TF_DATA_PREFETCH": os.getenv("TF_DATA_PREFETCH", "true").lower() in ("1", "true", "yes"),
+    "TF_MIXED_PRECISION": os.getenv("TF_MIXED_PRECISION", "false").lower() in ("1", "true", "yes"),
+    "SHADOW_MODE": os.getenv("SHADOW_MODE", "false").lower() in ("1", "true", "yes"),
+    "SHADOW_WINDOW": int(os.getenv("SHADOW_WINDOW", 200)),
+    "SHADOW_MIN_SAMPLES": int(os.getenv("SHADOW_MIN_SAMPLES", 50)),
+    "SHADOW_MAX_SAMPLES": int(os.getenv("SHADOW_MAX_SAMPLES", 500)),
+    "SHADOW_MARGIN": float(os.getenv("SHADOW_MARGIN", 0.05)),
+    "DRIFT_RESIDUAL_ALPHA": float(os.getenv("DRIFT_RESIDUAL_ALPHA", 0.05)),
+    "DRIFT_RESIDUAL_Z": float(os.getenv("DRIFT_RESIDUAL_Z", 4.0)),
+    "DRIFT_WARMUP": int(os.getenv("DRIFT_WARMUP", 30)),
+    "DRIFT_INPUT_ALPHA": float(os.getenv("DRIFT_INPUT_ALPHA", 0.01)),
+    "DRIFT_INPUT_Z": float(os.getenv("DRIFT_INPUT_Z", 3.0)),
+    "DRIFT_RANGE_LIMIT": float(os.getenv("DRIFT_RANGE_LIMIT", 0.25)),
+    "DRIFT_MIN_TICKS": int(os.getenv("DRIFT_MIN_TICKS", 200)),
+    "DRIFT_COOLDOWN": float(os.getenv("DRIFT_COOLDOWN", 900)),
+    "CANDLE_CACHE_MAX_ENTRIES": int(os.getenv("CANDLE_CACHE_MAX_ENTRIES", 64)),
+    "CANDLE_CACHE_GRACE": float(os.getenv("CANDLE_CACHE_GRACE", 2.0)),
+    "GA_POPULATION_DIR": os.getenv("GA_POPULATION_DIR", os.path.join(BASE_DIR, "ga_populations")),
+    "GA_ELITE_FRACTION": float(os.getenv("GA_ELITE_FRACTION", 0.2)),
+    "GA_PATIENCE": int(os.getenv("GA_PATIENCE", 15)),
+    "GA_ENCODING": os.getenv("GA_ENCODING", "bits").lower(),
+    "GA_FEE_RATE": float(os.getenv("GA_FEE_RATE", 0.001)),
+    "PORTFOLIO_ASSETS": [a.strip() for a in os.getenv("PORTFOLIO_ASSETS", "BTC-USD,ETH-USD,LTC-USD,XRP-USD,ADA-USD").split(",") if a.strip()],
+    "PIPELINE_MODE": os.getenv("PIPELINE_MODE", "thread").lower(),
+    "PIPELINE_RING_CAPACITY": int(os.getenv("PIPELINE_RING_CAPACITY", 65536)),
+    "PIPELINE_PREDICT_INTERVAL": float(os.getenv("PIPELINE_PREDICT_INTERVAL", 10)),
+    "PROFILER_ENABLED": os.getenv("PROFILER_ENABLED", "false").lower() in ("1", "true", "yes"),
+    "PROFILER_INTERVAL": float(os.getenv("PROFILER_INTERVAL", 0.01)),
+    "PROFILER_OUTPUT_DIR": os.getenv("PROFILER_OUTPUT_DIR", os.path.join(BASE_DIR, "profiles")),
 }
 
 RISK_MANAGEMENT = {
     "MAX_POSITION_SIZE": float(os.getenv("MAX_POSITION_SIZE", 0.1)),
     "MAX_CONCURRENT_TRADES": int(os.getenv("MAX_CONCURRENT_TRADES", 5)),
     "POSITION_COOLDOWN": int(os.getenv("POSITION_COOLDOWN", 60)),
+    "ACCOUNT_CAPITAL": float(os.getenv("ACCOUNT_CAPITAL", 1000)),
 }
 
 # ✅ Ensure Required Files Exist
@@ -113,4 +176,4 @@ def auto_reload_env(interval=60):
         time.sleep(interval)
 
 # ✅ Start Background Thread for Auto-Reloading
-threading.Thread(target=auto_reload_env, daemon=True).start()
+threading.Thread(target=auto_reload_env, name="env-reloader", daemon=True).start()
@@ -4,25 +4,55 @@ import numpy as np
 import websockets
 import asyncio
 import json
-import pickle
 import time
-from collections import deque
-from sklearn.preprocessing import MinMaxScaler
+from collections import defaultdict, deque
+from datetime import datetime
 from config import TRADING_CONFIG, get_logger
+from indicators import FEATURE_COLUMNS, BarFeatureEngine, compute_features
+from scaler import OnlineScaler
+from orderbook import OrderBookManager
+from feed_replay import FeedRecorder
+from profiler import profiled
+from candle_cache import CandleCache
 
-logger = get_logger()
+logger = get_logger(__name__)
 data_buffer = deque(maxlen=1000)
+feature_buffers = defaultdict(lambda: deque(maxlen=1000))  # closed-candle feature rows per product
+live_features = {}  # BarFeatureEngine per product
+tick_listeners = []
+order_books = OrderBookManager()
+feed_recorder = FeedRecorder(TRADING_CONFIG["FEED_RECORD_DIR"]) if TRADING_CONFIG["FEED_RECORD_DIR"] else None
+candle_cache = CandleCache(max_entries=TRADING_CONFIG["CANDLE_CACHE_MAX_ENTRIES"], grace=TRADING_CONFIG["CANDLE_CACHE_GRACE"])
+
+def register_tick_listener(callback):
+    """Call `callback(product_id, price)` for every live ticker price."""
+    tick_listeners.append(callback)
 SCALER_FILE = TRADING_CONFIG["SCALER_FILE"]
 
-def get_historical_data(asset, granularity=300, cache=None):
-    """Fetch historical market data with caching and retry logic."""
-    if cache is None:
-        cache = {}
+def get_historical_data(asset, granularity=300, cache=None, start=None, end=None):
+    """Fetch historical market data with caching and retry logic.
 
-    if (asset, granularity) in cache:
+    Results are shared through the process-wide `candle_cache` unless a
+    dict is passed as `cache`. `start`/`end` are epoch seconds; omit `end`
+    for the latest candles. Callers get their own copy of the frame.
+    """
+    if cache is not None:
+        if (asset, granularity) not in cache:
+            df = _fetch_candles(asset, granularity, start, end)
+            if df is None:
+                return None
+            cache[(asset, granularity)] = df
         return cache[(asset, granularity)]
 
-    url = f"https://api.pro.coinbase.com/products/{asset}-USD/candles?granularity={granularity}"
+    df = candle_cache.get_or_fetch((asset, granularity, start, end),
+                                   lambda: _fetch_candles(asset, granularity, start, end))
+    return None if df is None else df.copy()
+
+def _fetch_candles(asset, granularity, start=None, end=None):
+    url = f"{TRADING_CONFIG['COINBASE_API_URL']}/products/{asset}-USD/candles?granularity={granularity}"
+    for name, value in (("start", start), ("end", end)):
+        if value is not None:
+            url += f"&{name}={time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(value))}"
     max_retries = 3
     retry_delay = 5
 
@@ -38,8 +68,6 @@ def get_historical_data(asset, granularity=300, cache=None):
             df = pd.DataFrame(data, columns=["time", "low", "high", "open", "close", "volume"])
             df["time"] = pd.to_datetime(df["time"], unit="s")
             df.sort_values("time", inplace=True)
-
-            cache[(asset, granularity)] = df
             return df
 
         except (requests.RequestException, ValueError) as e:
@@ -49,8 +77,76 @@ def get_historical_data(asset, granularity=300, cache=None):
             else:
                 return None
 
-def preprocess_data(df, save_scaler=True):
-    """Preprocess historical price data for AI model training or prediction."""
+def model_feature_columns(features=None):
+    """Returns the ordered model input columns, with "close" first."""
+    features = features or TRADING_CONFIG["MODEL_FEATURES"]
+    unknown = [f for f in features if f not in FEATURE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown model features: {', '.join(unknown)}")
+    return ["close"] + [f for f in features if f != "close"]
+
+def primary_product():
+    """The product the model is trained on and served for."""
+    return TRADING_CONFIG.get("LIVE_FEED_PRODUCTS", ["BTC-USD"])[0]
+
+def latest_window(lookback, features=None):
+    """Returns the most recent `lookback` live rows shaped (lookback, n_features).
+
+    Rows beyond "close" are closed-candle features of the primary product and
+    may number fewer than `lookback` until enough candles have closed.
+    """
+    features = model_feature_columns(features)
+    if features == ["close"]:
+        return np.array(list(data_buffer)[-lookback:], dtype=float).reshape(-1, 1)
+    columns = [FEATURE_COLUMNS.index(f) for f in features]
+    rows = list(feature_buffers[primary_product()])[-lookback:]
+    return np.array(rows).reshape(-1, len(FEATURE_COLUMNS))[:, columns]
+
+def latest_row(features=None):
+    """The newest live input row, without copying the buffers; None before the first row."""
+    features = model_feature_columns(features)
+    if features == ["close"]:
+        return np.array([data_buffer[-1]], dtype=float) if data_buffer else None
+    rows = feature_buffers[primary_product()]
+    return np.asarray(rows[-1])[[FEATURE_COLUMNS.index(f) for f in features]] if rows else None
+
+def _uses_features():
+    return model_feature_columns() != ["close"]
+
+def _feature_engine(product_id):
+    engine = live_features.get(product_id)
+    if engine is None:
+        engine = live_features[product_id] = BarFeatureEngine(TRADING_CONFIG["HORIZON_STEP_SECONDS"])
+    return engine
+
+def warm_live_features(product_ids=None):
+    """Seed each product's candle features from history so inference can start without waiting for candles."""
+    for product_id in product_ids or [primary_product()]:
+        df = get_historical_data(product_id.split("-")[0], TRADING_CONFIG["HORIZON_STEP_SECONDS"])
+        if df is None or df.empty:
+            logger.warning(f"No history to warm {product_id} features; they start cold.")
+            continue
+        engine = live_features[product_id] = BarFeatureEngine(TRADING_CONFIG["HORIZON_STEP_SECONDS"])
+        rows = feature_buffers[product_id]
+        rows.clear()
+        rows.extend(engine.warm_start(df))
+
+def _tick_time(data):
+    if isinstance(data.get("time"), (int, float)):
+        return float(data["time"])  # epoch seconds, e.g. from the pipeline's tick ring
+    try:
+        return datetime.fromisoformat(data["time"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, ValueError):
+        return time.time()
+
+def preprocess_data(df, save_scaler=True, features=None, horizons=None):
+    """Preprocess historical price data for AI model training or prediction.
+
+    `features` selects FEATURE_COLUMNS for multi-feature input (defaults to
+    MODEL_FEATURES); "close" is always the first column and the target.
+    `horizons` (defaults to HORIZONS) gives the steps ahead of each target
+    column, so y has one column per horizon.
+    """
     try:
         if df is None or df.empty:
             raise ValueError("DataFrame is empty or None. Cannot preprocess.")
@@ -60,61 +156,120 @@ def preprocess_data(df, save_scaler=True):
         if df["close"].isnull().any():
             raise ValueError("Invalid numerical values detected in 'close' column.")
 
-        scaler = MinMaxScaler()
-        scaled_data = scaler.fit_transform(df["close"].values.reshape(-1, 1))
+        features = model_feature_columns(features)
+
+        if features == ["close"]:
+            values = df["close"].values.reshape(-1, 1)
+        else:
+            values = compute_features(df)[features].to_numpy()
+
+        scaler = OnlineScaler()
+        scaled_data = scaler.fit_transform(values)
 
+        horizons = horizons or TRADING_CONFIG["HORIZONS"]
+        offsets = np.array(horizons) - 1
         X, y = [], []
-        for i in range(TRADING_CONFIG["LOOKBACK"], len(scaled_data)):
+        for i in range(TRADING_CONFIG["LOOKBACK"], len(scaled_data) - offsets.max()):
             X.append(scaled_data[i - TRADING_CONFIG["LOOKBACK"]:i])
-            y.append(scaled_data[i])
+            y.append(scaled_data[i + offsets, 0])
 
         if save_scaler:
             try:
-                with open(SCALER_FILE, "wb") as f:
-                    pickle.dump(scaler, f)
+                scaler.save(SCALER_FILE)
             except Exception as e:
                 logger.error(f"Failed to save SCALER_FILE: {e}")
 
-        return np.array(X).reshape(-1, TRADING_CONFIG["LOOKBACK"], 1), np.array(y), scaler
+        return np.array(X).reshape(-1, TRADING_CONFIG["LOOKBACK"], len(features)), np.array(y), scaler
 
     except Exception as e:
         logger.error(f"Error in data preprocessing: {e}")
         return None, None, None
 
-async def fetch_live_data():
-    """Fetch live market data using Coinbase WebSocket API with automatic reconnection."""
+@profiled("feed")
+def handle_feed_message(data):
+    """Apply one decoded feed message to the order books, buffers and tick listeners.
+
+    Returns the ticker price when the message carried one, else None.
+    """
+    if order_books.handle(data):
+        return None
+
+    if "price" not in data:
+        return None
+
+    try:
+        price = float(data["price"])
+        volume = float(data.get("last_size") or 0.0)
+        data_buffer.append(price)
+        if _uses_features():
+            product_id = data.get("product_id") or primary_product()
+            row = _feature_engine(product_id).update(price, _tick_time(data), volume)
+            if row is not None:
+                feature_buffers[product_id].append(row)
+    except Exception:
+        logger.warning("Ignored malformed price data: %s", data, extra={"rate_key": "malformed_tick"})
+        return None
+
+    for listener in tick_listeners:
+        try:
+            listener(data.get("product_id"), price)
+        except Exception as e:
+            logger.error("Tick listener failed: %s", e, extra={"rate_key": "tick_listener"})
+    return price
+
+def reset_live_state():
+    """Clear buffers, indicator state and order books (e.g. before a replay)."""
+    data_buffer.clear()
+    feature_buffers.clear()
+    live_features.clear()
+    order_books.books.clear()
+
+async def fetch_live_data(handler=None):
+    """Fetch live market data using Coinbase WebSocket API with automatic reconnection.
+
+    Decoded messages go to `handler` (defaults to handle_feed_message).
+    """
+    handler = handler or handle_feed_message
     product_ids = TRADING_CONFIG.get("LIVE_FEED_PRODUCTS", ["BTC-USD"])
+    channels = [{"name": "ticker", "product_ids": product_ids}]
+    if TRADING_CONFIG["LIVE_FEED_LEVEL2"]:
+        channels.append({"name": "level2", "product_ids": product_ids})
 
     while True:
         try:
-            async with websockets.connect("wss://ws-feed.pro.coinbase.com") as ws:
+            async with websockets.connect(TRADING_CONFIG["COINBASE_WS_URL"]) as ws:
                 await ws.send(json.dumps({
                     "type": "subscribe",
-                    "channels": [{"name": "ticker", "product_ids": product_ids}]
+                    "channels": channels
                 }))
 
                 while True:
                     response = await ws.recv()
-                    data = json.loads(response)
-
-                    if "price" in data:
-                        try:
-                            price = float(data["price"])
-                            data_buffer.append(price)
-                        except Exception:
-                            logger.warning(f"Ignored malformed price data: {data}")
-                            continue
+                    if feed_recorder is not None:
+                        feed_recorder.record(response)
+                    handler(json.loads(response))
 
         except websockets.exceptions.ConnectionClosed as e:
-            logger.warning(f"WebSocket disconnected: {e}. Reconnecting in 5 seconds...")
+            logger.warning("WebSocket disconnected: %s. Reconnecting in 5 seconds...", e, extra={"rate_key": "ws_reconnect"})
             await asyncio.sleep(5)
 
         except Exception as e:
-            logger.error(f"Unexpected WebSocket error: {e}. Restarting in 5 seconds...")
+            logger.error("Unexpected WebSocket error: %s. Restarting in 5 seconds...", e, extra={"rate_key": "ws_reconnect"})
             await asyncio.sleep(5)
 
-def start_live_data_listener():
-    """Start the live data listener for real-time market updates."""
+def start_live_data_listener(handler=None, warm=True):
+    """Start the live data listener for real-time market updates.
+
+    When FEED_REPLAY_PATH is set, recorded frames are replayed in place of the
+    websocket at FEED_REPLAY_SPEED. `warm=False` skips seeding the live
+    features, for a process that only forwards messages.
+    """
+    if warm and _uses_features() and not TRADING_CONFIG["FEED_REPLAY_PATH"]:
+        warm_live_features(TRADING_CONFIG.get("LIVE_FEED_PRODUCTS", ["BTC-USD"]))
+    if TRADING_CONFIG["FEED_REPLAY_PATH"]:
+        from feed_replay import replay_feed
+        replay_feed(TRADING_CONFIG["FEED_REPLAY_PATH"], speed=TRADING_CONFIG["FEED_REPLAY_SPEED"], handler=handler)
+        return
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    loop.run_until_complete(fetch_live_data())
\ No newline at end of file
+    loop.run_until_complete(fetch_live_data(handler))
\ No newline at end of file
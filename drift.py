@@ -0,0 +1,157 @@
+import collections
+import threading
+import numpy as np
+from config import TRADING_CONFIG, get_logger
+
+logger = get_logger(__name__)
+
+
+class DriftMonitor:
+    """Streaming drift detection for the live model in O(1) memory per tick.
+
+    Three signals, each an exponentially weighted average so no history is kept:
+
+    * residuals: relative forecast errors, scored once each forecast's horizon
+      has elapsed. The first `warmup` errors after a (re)train set the
+      baseline; drift is an EWMA control-chart breach, i.e. the smoothed error
+      rising `residual_z` standard errors above that baseline. Errors are
+      clipped at 3 baseline deviations first, so one wild forecast cannot
+      breach the limit on its own.
+    * input shift: the smoothed live inputs moving more than `input_z`
+      training standard deviations from the training mean.
+    * range violations: the smoothed share of ticks outside the scaler's
+      fitted [min, max] exceeding `range_limit`.
+    """
+
+    def __init__(self, residual_alpha=None, residual_z=None, warmup=None, input_alpha=None, input_z=None,
+                 range_limit=None, min_ticks=None):
+        self.residual_alpha = residual_alpha or TRADING_CONFIG["DRIFT_RESIDUAL_ALPHA"]
+        self.residual_z = residual_z or TRADING_CONFIG["DRIFT_RESIDUAL_Z"]
+        self.warmup = warmup or TRADING_CONFIG["DRIFT_WARMUP"]
+        self.input_alpha = input_alpha or TRADING_CONFIG["DRIFT_INPUT_ALPHA"]
+        self.input_z = input_z or TRADING_CONFIG["DRIFT_INPUT_Z"]
+        self.range_limit = range_limit or TRADING_CONFIG["DRIFT_RANGE_LIMIT"]
+        self.min_ticks = min_ticks or TRADING_CONFIG["DRIFT_MIN_TICKS"]
+        self.version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pending = collections.deque()
+        self.residuals = 0
+        self._base_mean = 0.0
+        self._base_m2 = 0.0
+        self._residual_ewma = None
+        self.ticks = 0
+        self._input_ewma = None
+        self._range_ewma = 0.0
+
+    def bind(self, scaler, version):
+        """Take the training statistics of model `version` as the reference; restarts on a new version."""
+        if version == self.version:
+            return
+        with self._lock:
+            self.version = version
+            self._mean = np.asarray(scaler.mean_, dtype=float)
+            self._std = np.sqrt(np.maximum(np.asarray(scaler.var_, dtype=float), 1e-12))
+            self._min = np.asarray(scaler.data_min_, dtype=float)
+            self._max = np.asarray(scaler.data_max_, dtype=float)
+            self._reset()
+
+    # ✅ Streaming updates
+
+    def observe_input(self, row):
+        """Fold one live input row (the model's feature columns) into the input statistics."""
+        if self.version is None:
+            return
+        row = np.asarray(row, dtype=float)
+        a = self.input_alpha
+        with self._lock:
+            outside = float(((row < self._min) | (row > self._max)).any())
+            self._range_ewma += a * (outside - self._range_ewma)
+            self._input_ewma = row if self._input_ewma is None else self._input_ewma + a * (row - self._input_ewma)
+            self.ticks += 1
+
+    def record_prediction(self, predicted, due):
+        """Queue a forecast to be scored against the first price seen at or after `due`."""
+        with self._lock:
+            self._pending.append((due, predicted))
+
+    def on_price(self, price, ts):
+        with self._lock:
+            while self._pending and self._pending[0][0] <= ts:
+                _, predicted = self._pending.popleft()
+                self._observe_residual(abs(predicted - price) / max(abs(price), 1e-9))
+
+    def _observe_residual(self, error):
+        self.residuals += 1
+        if self.residuals <= self.warmup:
+            # Welford's running mean/variance for the baseline.
+            delta = error - self._base_mean
+            self._base_mean += delta / self.residuals
+            self._base_m2 += delta * (error - self._base_mean)
+            if self.residuals == self.warmup:
+                self._residual_ewma = self._base_mean
+            return
+        error = min(error, self._base_mean + 3.0 * self._base_std())
+        self._residual_ewma += self.residual_alpha * (error - self._residual_ewma)
+
+    def _base_std(self):
+        return max(np.sqrt(self._base_m2 / max(self.warmup - 1, 1)), 1e-12)
+
+    # ✅ Alerts
+
+    def residual_score(self):
+        """Standard errors the smoothed residual sits above its baseline, or None during warm-up."""
+        if self._residual_ewma is None:
+            return None
+        a = self.residual_alpha
+        return (self._residual_ewma - self._base_mean) / (self._base_std() * np.sqrt(a / (2.0 - a)))
+
+    def input_score(self):
+        """Largest shift of the smoothed inputs from the training mean, in training standard deviations."""
+        if self._input_ewma is None:
+            return None
+        return float(np.max(np.abs(self._input_ewma - self._mean) / self._std))
+
+    def check(self):
+        """Reasons the model has drifted; empty while everything is within its thresholds."""
+        reasons = []
+        with self._lock:
+            residual = self.residual_score()
+            if residual is not None and residual > self.residual_z:
+                reasons.append(f"forecast error {residual:.1f} standard errors above baseline")
+            if self.ticks >= self.min_ticks:
+                shift = self.input_score()
+                if shift > self.input_z:
+                    reasons.append(f"inputs shifted {shift:.1f} sd from the training mean")
+                if self._range_ewma > self.range_limit:
+                    reasons.append(f"{self._range_ewma:.0%} of recent ticks outside the training range")
+        return reasons
+
+    def state(self):
+        with self._lock:
+            residual = self.residual_score()
+            shift = self.input_score()
+            return {
+                "version": self.version,
+                "residuals": self.residuals,
+                "residual_z": None if residual is None else round(float(residual), 3),
+                "ticks": self.ticks,
+                "input_z": None if shift is None else round(shift, 3),
+                "range_violations": round(self._range_ewma, 4),
+                "pending": len(self._pending),
+            }
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_drift_monitor():
+    """Returns the process-wide drift monitor."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = DriftMonitor()
+        return _monitor
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Record raw feed frames and replay them deterministically through the pipeline.
+
+    python feed_replay.py replay recordings/ --speed 10 --predict-every 50
+    python feed_replay.py replay recordings/ --speed 0      # as fast as possible
+"""
+
+import argparse
+import contextlib
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from config import get_logger
+
+logger = get_logger(__name__)
+
+
+class FeedRecorder:
+    """Appends raw feed frames with receive timestamps to gzip-compressed chunks.
+
+    Each line is ``<recv_time_ns>\\t<raw frame>``. Compression and disk writes
+    happen on a background thread; the feed thread only enqueues.
+    """
+
+    def __init__(self, directory, chunk_frames=100_000, chunk_seconds=3600, max_queue=100_000):
+        self.directory = directory
+        self.chunk_frames = chunk_frames
+        self.chunk_seconds = chunk_seconds
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="feed-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, raw, recv_ns=None):
+        """Queue one raw frame; never blocks the caller."""
+        try:
+            self._queue.put_nowait((recv_ns or time.time_ns(), raw))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Write out queued frames and close the current chunk."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _open_chunk(self, first_ns):
+        path = os.path.join(self.directory, f"feed-{first_ns:020d}.jsonl.gz")
+        return gzip.open(path, "at", encoding="utf-8", compresslevel=6)
+
+    def _run(self):
+        handle, frames, opened_at = None, 0, 0.0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            recv_ns, raw = item
+            if handle is None or frames >= self.chunk_frames or time.monotonic() - opened_at >= self.chunk_seconds:
+                if handle is not None:
+                    handle.close()
+                handle, frames, opened_at = self._open_chunk(recv_ns), 0, time.monotonic()
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            handle.write(f"{recv_ns}\t{raw}\n")
+            frames += 1
+        if handle is not None:
+            handle.close()
+
+
+def iter_frames(source):
+    """Yield (recv_ns, raw) from a recording directory, a chunk file or a list of chunks."""
+    if isinstance(source, (list, tuple)):
+        paths = list(source)
+    elif os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(source, "feed-*.jsonl.gz")))
+    else:
+        paths = [source]
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                recv_ns, _, raw = line.rstrip("\n").partition("\t")
+                yield int(recv_ns), raw
+
+
+def _default_handler():
+    from data_handler import handle_feed_message
+    return handle_feed_message
+
+
+def replay_feed(source, speed=1.0, handler=None, clock=time.monotonic, sleep=time.sleep):
+    """Replay recorded frames into `handler` (defaults to the live feed handler).
+
+    `speed` is a multiple of real time; 0 or None replays as fast as possible.
+    Returns the number of frames replayed.
+    """
+    handler = handler or _default_handler()
+    first_ns = start = None
+    count = 0
+    for recv_ns, raw in iter_frames(source):
+        if speed:
+            if first_ns is None:
+                first_ns, start = recv_ns, clock()
+            delay = start + (recv_ns - first_ns) / 1e9 / speed - clock()
+            if delay > 0:
+                sleep(delay)
+        handler(json.loads(raw))
+        count += 1
+    logger.info(f"Replayed {count} feed frames from {source}.")
+    return count
+
+
+@contextlib.contextmanager
+def _isolated_model_state():
+    """Swap in a fresh drift monitor and shadow evaluator, restoring the process-wide ones afterwards."""
+    import drift
+    import shadow
+    with drift._monitor_lock, shadow._shadow_lock:
+        saved = drift._monitor, shadow._shadow
+        drift._monitor, shadow._shadow = drift.DriftMonitor(), shadow.ShadowEvaluator()
+    try:
+        yield
+    finally:
+        with drift._monitor_lock, shadow._shadow_lock:
+            drift._monitor, shadow._shadow = saved
+
+
+def _percentiles_ms(samples):
+    if not samples:
+        return {"p50_ms": None, "p99_ms": None}
+    arr = np.asarray(samples) * 1000.0
+    return {"p50_ms": round(float(np.percentile(arr, 50)), 4), "p99_ms": round(float(np.percentile(arr, 99)), 4)}
+
+
+class ReplayHarness:
+    """Drives feed -> buffer -> prediction -> signal -> order offline and times each stage.
+
+    `predictor()` is called every `predict_every` ticks and returns a price
+    (or a dict with a "price" key); `order_fn(product_id, signal)` receives
+    the resulting signal. Defaults are the live `predict_price` without
+    drift retraining and a dry-run order sink, so no exchange is contacted.
+    The run uses its own drift monitor and shadow evaluator, so it neither
+    feeds nor is affected by the process-wide ones.
+    """
+
+    def __init__(self, source, speed=None, predict_every=50, predictor=None, order_fn=None, seed=0):
+        self.source = source
+        self.speed = speed
+        self.predict_every = predict_every
+        self.predictor = predictor
+        self.order_fn = order_fn or self._dry_run_order
+        self.seed = seed
+        self.orders = []
+        self.stage_times = {"ingest": [], "predict": [], "signal": [], "order": [], "end_to_end": []}
+
+    def _dry_run_order(self, product_id, signal):
+        self.orders.append((product_id, signal))
+
+    def run(self):
+        import data_handler
+        data_handler.reset_live_state()
+        with _isolated_model_state():
+            return self._run(data_handler)
+
+    def _run(self, data_handler):
+        predictor = self.predictor
+        if predictor is None:
+            import model
+            model.seed_mc(self.seed)
+            predictor = lambda: model.predict_price(retrain_on_drift=False)
+
+        ticks = 0
+        timings = self.stage_times
+
+        def on_frame(message):
+            nonlocal ticks
+            t0 = time.perf_counter()
+            price = data_handler.handle_feed_message(message)
+            t1 = time.perf_counter()
+            timings["ingest"].append(t1 - t0)
+            if price is None:
+                return
+            ticks += 1
+            if ticks % self.predict_every:
+                return
+
+            prediction = predictor()
+            t2 = time.perf_counter()
+            timings["predict"].append(t2 - t1)
+            if prediction is None:
+                return
+            predicted = prediction["price"] if isinstance(prediction, dict) else prediction
+            signal = 1 if predicted > price else 0
+            t3 = time.perf_counter()
+            timings["signal"].append(t3 - t2)
+            self.order_fn(message.get("product_id"), signal)
+            t4 = time.perf_counter()
+            timings["order"].append(t4 - t3)
+            timings["end_to_end"].append(t4 - t0)
+
+        started = time.perf_counter()
+        frames = replay_feed(self.source, speed=self.speed, handler=on_frame)
+        elapsed = time.perf_counter() - started
+
+        report = {
+            "frames": frames,
+            "ticks": ticks,
+            "elapsed_s": round(elapsed, 4),
+            "frames_per_s": round(frames / elapsed, 1) if elapsed else None,
+            "ticks_per_s": round(ticks / elapsed, 1) if elapsed else None,
+            "orders": len(timings["order"]),
+        }
+        for stage, samples in timings.items():
+            report[stage] = _percentiles_ms(samples)
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay = sub.add_parser("replay", help="Replay a recording through the pipeline and report throughput")
+    replay.add_argument("source", help="Recording directory or chunk file")
+    replay.add_argument("--speed", type=float, default=0.0, help="Multiple of real time; 0 = max speed")
+    replay.add_argument("--predict-every", type=int, default=50)
+    replay.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = ReplayHarness(args.source, speed=args.speed, predict_every=args.predict_every, seed=args.seed).run()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,129 @@
 import numpy as np
+import pandas as pd
 import random
 import logging
 import os
+import copy
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import oandapyV20
 import oandapyV20.endpoints.orders as orders
+import oandapyV20.endpoints.pricing as pricing
+from oandapyV20.oandapyV20 import TRADING_ENVIRONMENTS
 import cbpro
 from config import TRADING_CONFIG, get_logger
+from journal import get_journal
+from indicators import EMA, RSI, compute_features, ema, rsi
+from risk import RiskEngine
+from profiler import profiled
 
-logger = get_logger()
+logger = get_logger(__name__)
+
+# Warmed live rule evaluators, keyed by (caller key, genes); see RuleBasedStrategy.latest_signal.
+_live_rule_signals = {}
+_live_rule_signals_lock = threading.Lock()  # GA button and trading threads may ask for the same asset at once
+_LIVE_RULE_SIGNALS_MAX = 16
 
 class APIManager:
     """Handles API authentication and trade execution for OANDA and Coinbase."""
 
-    def __init__(self):
+    def __init__(self, risk_engine=None, order_books=None):
         self.oanda_client = self._initialize_oanda_client()
         self.coinbase_client = self._initialize_coinbase_client()
+        self.order_books = order_books
+        self.risk_engine = risk_engine or RiskEngine()
+        self.risk_engine.on_trigger(self._on_risk_trigger)
+        self._exit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="risk-exit")
 
     def _initialize_oanda_client(self):
         token = os.getenv("OANDA_ACCESS_TOKEN")
-        return oandapyV20.API(access_token=token) if token else None
+        if not token:
+            return None
+        environment = TRADING_CONFIG["OANDA_ENVIRONMENT"]
+        if TRADING_CONFIG["OANDA_API_URL"]:
+            # oandapyV20 only knows its own hosts; register the override (e.g. mock_exchange) as an environment.
+            environment = "custom"
+            TRADING_ENVIRONMENTS[environment] = {"api": TRADING_CONFIG["OANDA_API_URL"],
+                                                 "stream": TRADING_CONFIG["OANDA_API_URL"]}
+        return oandapyV20.API(access_token=token, environment=environment)
 
     def _initialize_coinbase_client(self):
         key = os.getenv("COINBASE_API_KEY")
         secret = os.getenv("COINBASE_API_SECRET")
         passphrase = os.getenv("COINBASE_API_PASSPHRASE")
-        return cbpro.AuthenticatedClient(key, secret, passphrase) if key and secret and passphrase else None
+        if not (key and secret and passphrase):
+            return None
+        return cbpro.AuthenticatedClient(key, secret, passphrase, api_url=TRADING_CONFIG["COINBASE_API_URL"])
+
+    def _on_risk_trigger(self, position, reason, price):
+        # Runs on the feed thread: hand the closing order to a worker so the
+        # websocket loop never waits on the exchange.
+        self._exit_executor.submit(self._close_position, position, reason)
+
+    def _close_position(self, position, reason):
+        signal = 0 if position.side == "long" else 1
+        logger.info(f"Closing {position.venue}:{position.symbol} on {reason}.")
+        if position.venue == "oanda":
+            # OANDA sizes in units; the book holds units valued at the entry price (see _notional).
+            price = 1.0 if position.symbol.startswith("USD_") else position.entry_price
+            amount = str(int(round(abs(position.notional) / price)))
+        else:
+            amount = f"{abs(position.notional):.2f}"
+        self.execute_trade(position.symbol, signal, position.venue, amount=amount)
+        current = self.risk_engine.positions.get((position.venue, position.symbol))
+        if current is not None and current.closing:
+            self.risk_engine.rearm(position.venue, position.symbol)  # exit order failed
 
+    def _oanda_quote(self, symbol):
+        """Mid price from OANDA pricing, recorded in the risk book; None when unavailable."""
+        try:
+            response = self.oanda_client.request(
+                pricing.PricingInfo(os.getenv("OANDA_ACCOUNT_ID"), params={"instruments": symbol}))
+            quote = response["prices"][0]
+            mid = (float(quote["bids"][0]["price"]) + float(quote["asks"][0]["price"])) / 2.0
+        except Exception as e:
+            logger.warning(f"No OANDA quote for {symbol}: {e}", extra={"rate_key": "oanda_quote"})
+            return None
+        self.risk_engine.on_tick(symbol, mid)
+        return mid
+
+    def _notional(self, platform, symbol, side, amount, price=None):
+        """Order size in account currency (USD) for the risk book, or None when it cannot be valued.
+
+        Coinbase `amount` is quote funds already. OANDA `amount` is units of the
+        base currency: USD_xxx units are dollars, xxx_USD units are valued at
+        `price`, the last price or a fresh quote. Orders that reduce a position
+        are valued at its entry price so closing all its units empties the book.
+        """
+        if platform != "oanda":
+            return float(amount)
+        units = abs(int(float(amount)))
+        base, _, quote = symbol.partition("_")
+        if base == "USD":
+            return float(units)
+        if quote != "USD":
+            return None  # crosses would need a conversion rate to USD
+        position = self.risk_engine.positions.get((platform, symbol))
+        if position is not None and position.entry_price and (position.side == "long") != (side == "buy"):
+            return units * position.entry_price
+        price = price or self.risk_engine.last_price(symbol) or (self._oanda_quote(symbol) if self.oanda_client else None)
+        return None if price is None else units * price
+
+    @profiled("order")
     def execute_trade(self, symbol, signal, platform, amount="100"):
+        side = "buy" if signal == 1 else "sell"
+        notional = self._notional(platform, symbol, side, amount)
+        if notional is None:
+            allowed, reason = False, f"cannot value {amount} {symbol} units in USD"
+        else:
+            allowed, reason = self.risk_engine.check_order(platform, symbol, side, notional)
+        if not allowed:
+            logger.warning(f"Risk check rejected {side.upper()} {symbol} on {platform}: {reason}")
+            get_journal().record_trade(platform, symbol, side, float(amount), status="rejected", detail=reason)
+            return
         try:
             if platform == "oanda" and self.oanda_client:
                 order_data = {
@@ -38,28 +135,53 @@ class APIManager:
                     }
                 }
                 account_id = os.getenv("OANDA_ACCOUNT_ID")
-                self.oanda_client.request(orders.OrderCreate(account_id, data=order_data))
+                response = self.oanda_client.request(orders.OrderCreate(account_id, data=order_data))
                 logger.info(f"OANDA: Executed {'BUY' if signal == 1 else 'SELL'} on {symbol} for {amount} units.")
+                fill_price = ((response or {}).get("orderFillTransaction") or {}).get("price")
+                if fill_price:
+                    # Book at the fill so stop/take levels sit around the real entry.
+                    self.risk_engine.on_tick(symbol, float(fill_price))
+                    notional = self._notional(platform, symbol, side, amount, price=float(fill_price))
 
             elif platform == "coinbase" and self.coinbase_client:
-                self.coinbase_client.place_market_order(
+                book = self.order_books.get(symbol) if self.order_books else None
+                if book is not None and book.synced:
+                    slippage = book.slippage_bps(side, funds=float(amount))
+                    if slippage == math.inf:
+                        raise ValueError(f"Order for ${amount} is larger than the visible {symbol} book depth.")
+                    if slippage is not None and slippage > TRADING_CONFIG["MAX_SLIPPAGE_BPS"]:
+                        raise ValueError(f"Estimated slippage {slippage:.1f} bps exceeds MAX_SLIPPAGE_BPS.")
+                response = self.coinbase_client.place_market_order(
                     product_id=symbol,
                     side="buy" if signal == 1 else "sell",
                     funds=str(amount)
                 )
+                # cbpro returns error bodies instead of raising on 4xx/5xx (e.g. 429 rate limits).
+                if isinstance(response, dict) and "message" in response and "id" not in response:
+                    raise ValueError(f"Coinbase rejected the order: {response['message']}")
                 logger.info(f"Coinbase: Executed {'BUY' if signal == 1 else 'SELL'} on {symbol} with ${amount}.")
 
             else:
                 raise ValueError("Invalid platform or missing API client.")
 
+            price = self.risk_engine.last_price(symbol)
+            self.risk_engine.on_fill(platform, symbol, side, notional, price)
+            get_journal().record_trade(platform, symbol, side, float(amount), price=price, status="submitted")
+
         except Exception as e:
-            logger.error(f"Trade execution error: {e}")
+            logger.error(f"Trade execution error: {e}", extra={"rate_key": "trade_error"})
+            get_journal().record_trade(platform, symbol, side, float(amount), status="error", detail=str(e))
 
 
 class GeneticTradingStrategy:
     """Genetic Algorithm for evolving trading strategies."""
 
-    def __init__(self, market_data, pop_size=100, generations=200, mutation_rate=0.02, crossover_rate=0.7):
+    encoding = "bits"
+
+    def __init__(self, market_data, pop_size=100, generations=200, mutation_rate=0.02, crossover_rate=0.7,
+                 patience=None, tolerance=1e-6):
+        self.frame = market_data if isinstance(market_data, pd.DataFrame) else None
+        self._features = None
         self.data = self._prepare_data(market_data)
         if len(self.data) < 2:
             raise ValueError("Market data must have at least two prices for strategy generation.")
@@ -68,17 +190,59 @@ class GeneticTradingStrategy:
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
+        self.patience = patience
+        self.tolerance = tolerance
         self.population = self._initialize_population()
+        self.fitness = None
+        self.best = None
+        self.best_fitness = None
+        self.warm_started = False
+        self.history = []
+        self.stats = {}
 
     def _prepare_data(self, data):
+        if isinstance(data, pd.DataFrame) and "close" in data:
+            return pd.to_numeric(data["close"], errors="coerce").to_numpy(dtype=float)
         arr = np.array(data)
-        if len(arr.shape) > 1 and arr.shape[1] > 1:
-            arr = arr[:, 1]  # use price column
+        if len(arr.shape) > 1:
+            arr = arr[:, 1] if arr.shape[1] > 1 else arr[:, 0]  # use price column
         return arr.astype(float)
 
+    @property
+    def features(self):
+        """Indicator frame for the market data, computed once and shared by rule evaluation."""
+        if self._features is None:
+            frame = self.frame if self.frame is not None else pd.DataFrame({"close": self.data})
+            self._features = compute_features(frame)
+        return self._features
+
+    @property
+    def gene_times(self):
+        """Candle timestamp (int ns) each gene acts on, or None when the data has no time column."""
+        if self.frame is None or "time" not in self.frame:
+            return None
+        return pd.to_datetime(self.frame["time"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)[:self.strategy_size]
+
     def _initialize_population(self):
         return [np.random.randint(0, 2, size=self.strategy_size).tolist() for _ in range(self.pop_size)]
 
+    def seed_population(self, chromosomes):
+        """Replace part of the random population with `chromosomes` (e.g. last run's elite).
+
+        Seeds fill at most half the population, together with mutated copies of
+        them; the rest stays random to keep diversity.
+        """
+        seeds = [np.asarray(c).tolist() for c in chromosomes if len(c) == self.strategy_size]
+        if not seeds:
+            return False
+        half = self.pop_size // 2
+        seeded = seeds[:half]
+        while len(seeded) < half:
+            seeded.append(self._mutate(seeds[len(seeded) % len(seeds)]))
+        self.population = seeded + self.population[len(seeded):]
+        self.warm_started = True
+        return True
+
     def _evaluate_fitness(self, chromosome):
         capital = 1000.0
         position = 0.0
@@ -98,13 +262,20 @@ class GeneticTradingStrategy:
 
         return capital
 
-    def _select_parents(self):
-        fitness_scores = np.array([self._evaluate_fitness(chromo) for chromo in self.population])
+    def _population_fitness(self):
+        return np.array([self._evaluate_fitness(chromo) for chromo in self.population])
+
+    def _selection_probabilities(self, fitness_scores):
+        if fitness_scores.min() < 0:
+            # Losses larger than the starting capital (high-priced assets) give negative fitness.
+            fitness_scores = fitness_scores - fitness_scores.min()
         total_fitness = np.sum(fitness_scores)
         if total_fitness == 0:
             fitness_scores = np.ones_like(fitness_scores)
             total_fitness = np.sum(fitness_scores)
-        probabilities = fitness_scores / total_fitness
+        return fitness_scores / total_fitness
+
+    def _select_parents(self, probabilities):
         idx = np.random.choice(len(self.population), size=2, p=probabilities)
         return self.population[idx[0]], self.population[idx[1]]
 
@@ -117,18 +288,346 @@ class GeneticTradingStrategy:
     def _mutate(self, chromo):
         return [1 - gene if random.random() < self.mutation_rate else gene for gene in chromo]
 
+    @profiled("ga_evolve")
     def evolve(self):
-        for _ in range(self.generations):
+        """Evolve the population and return the best chromosome seen.
+
+        Fitness is evaluated once per generation and reused for every parent
+        draw. With `patience`, evolution stops once the best fitness has not
+        improved by more than `tolerance` (relative) for that many generations.
+        """
+        started = time.perf_counter()
+        fitness = self._population_fitness()
+        best_idx = int(np.argmax(fitness))
+        best, best_fitness = self.population[best_idx], fitness[best_idx]
+        self.history = [float(best_fitness)]
+        converged_at, stale = None, 0
+
+        for generation in range(1, self.generations + 1):
+            probabilities = self._selection_probabilities(fitness)
             next_gen = []
             for _ in range(self.pop_size // 2):
-                p1, p2 = self._select_parents()
+                p1, p2 = self._select_parents(probabilities)
                 c1, c2 = self._crossover(p1, p2)
                 next_gen.extend([self._mutate(c1), self._mutate(c2)])
             self.population = next_gen
-        best = max(self.population, key=self._evaluate_fitness)
-        logger.info(f"Evolved strategy fitness: {self._evaluate_fitness(best):.2f}")
+            fitness = self._population_fitness()
+
+            gen_best = int(np.argmax(fitness))
+            improved = fitness[gen_best] > best_fitness + self.tolerance * abs(best_fitness)
+            if fitness[gen_best] > best_fitness:
+                best, best_fitness = self.population[gen_best], fitness[gen_best]
+            self.history.append(float(best_fitness))
+            stale = 0 if improved else stale + 1
+            if self.patience and stale >= self.patience:
+                converged_at = generation - stale
+                break
+
+        self.fitness = fitness
+        self.best, self.best_fitness = best, float(best_fitness)
+        self.stats = {
+            "warm": self.warm_started,
+            "generations": len(self.history) - 1,
+            "converged_at": converged_at if converged_at is not None else len(self.history) - 1,
+            "best_fitness": round(float(best_fitness), 2),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+        logger.info(f"Evolved strategy fitness: {best_fitness:.2f} "
+                    f"({'warm' if self.warm_started else 'cold'} start, {self.stats['generations']} generations)")
         return best
 
+    def elite(self, fraction=0.2):
+        """Best chromosomes of the final population, best first.
+
+        The best chromosome seen during evolution leads the elite even when an
+        earlier generation produced it and the final population lost it.
+        """
+        fitness = self.fitness if self.fitness is not None else self._population_fitness()
+        count = max(1, int(len(self.population) * fraction))
+        elite = [self.population[i] for i in np.argsort(fitness)[::-1][:count]]
+        if self.best is not None and not any(np.array_equal(self.best, c) for c in elite):
+            elite = [self.best] + elite[:count - 1]
+        return elite
+
+    def latest_signal(self, best, key=None):
+        """Signal for the most recent candle under chromosome `best`."""
+        return best[-1]
+
     def backtest(self):
         best = self.evolve()
-        return round(self._evaluate_fitness(best), 2)
\ No newline at end of file
+        return round(self._evaluate_fitness(best), 2)
+
+
+# Rule genome: each gene is in [0, 1] and decodes linearly into its range.
+RULE_GENES = (
+    ("ema_fast", 3, 50, True),
+    ("ema_gap", 5, 150, True),          # slow period = fast + gap
+    ("rsi_period", 5, 30, True),
+    ("rsi_entry_max", 40.0, 90.0, False),
+    ("rsi_exit", 55.0, 95.0, False),
+    ("stop_loss", 0.005, 0.10, False),
+    ("take_profit", 0.01, 0.20, False),
+)
+
+
+def decode_rule(genes):
+    """Map a rule chromosome to its parameters."""
+    params = {}
+    for gene, (name, low, high, integer) in zip(genes, RULE_GENES):
+        value = low + min(max(float(gene), 0.0), 1.0) * (high - low)
+        params[name] = int(round(value)) if integer else value
+    params["ema_slow"] = params["ema_fast"] + params.pop("ema_gap")
+    return params
+
+
+def rule_positions(close, fast, slow, rsi_values, params):
+    """Position (1 long / 0 flat) held after each bar's close for a decoded rule.
+
+    Works on one series or on a time x asset matrix; every step runs along axis 0.
+    """
+    p = params
+    # Hysteresis: exits win, entries latch, otherwise keep the previous state.
+    marks = np.where((fast < slow) | (rsi_values > p["rsi_exit"]), 0.0,
+                     np.where((fast > slow) & (rsi_values < p["rsi_entry_max"]), 1.0, np.nan))
+    frame = pd.DataFrame(marks) if marks.ndim == 2 else pd.Series(marks)
+    state = frame.ffill().fillna(0.0).to_numpy() > 0
+
+    idx = np.arange(len(close)).reshape((-1,) + (1,) * (close.ndim - 1))
+    starts = state & ~np.concatenate((np.zeros_like(state[:1]), state[:-1]))
+    entry_idx = np.maximum.accumulate(np.where(starts, idx, 0), axis=0)
+    entry_price = np.take_along_axis(close, entry_idx, axis=0)
+    hit = state & ((close <= entry_price * (1 - p["stop_loss"])) | (close >= entry_price * (1 + p["take_profit"])))
+    # A stop/take hit closes the rest of its entry segment.
+    hits = np.cumsum(hit, axis=0)
+    at_entry = np.take_along_axis(hits, entry_idx, axis=0) - np.take_along_axis(hit, entry_idx, axis=0)
+    return (state & (hits - at_entry == 0)).astype(np.int8)
+
+
+class RuleSignal:
+    """Live O(1)-per-bar evaluation of an evolved rule; matches RuleBasedStrategy.positions."""
+
+    def __init__(self, genes):
+        self.params = decode_rule(genes)
+        self._fast = EMA(self.params["ema_fast"])
+        self._slow = EMA(self.params["ema_slow"])
+        self._rsi = RSI(self.params["rsi_period"])
+        self.state = 0        # the entry/exit conditions alone
+        self.position = 0     # state after stop-loss/take-profit exits
+        self.entry_price = None
+
+    def update(self, close):
+        """Feed one closed bar; returns 1 to be long over the next bar, else 0."""
+        fast, slow, rsi_value = self._fast.update(close), self._slow.update(close), self._rsi.update(close)
+        p = self.params
+        if fast < slow or rsi_value > p["rsi_exit"]:
+            state = 0
+        elif fast > slow and rsi_value < p["rsi_entry_max"]:
+            state = 1
+        else:
+            state = self.state
+        if state and not self.state:
+            self.entry_price, self.position = close, 1
+        elif not state:
+            self.entry_price, self.position = None, 0
+        elif self.position and (close <= self.entry_price * (1 - p["stop_loss"]) or
+                                close >= self.entry_price * (1 + p["take_profit"])):
+            self.position = 0  # stopped out; wait for the entry conditions to reset
+        self.state = state
+        return self.position
+
+    def warm(self, closes):
+        for close in closes:
+            self.update(float(close))
+        return self.position
+
+
+class RuleBasedStrategy(GeneticTradingStrategy):
+    """GA over fixed-length rule parameters instead of one bit per candle.
+
+    A chromosome is len(RULE_GENES) floats (EMA crossover periods, RSI
+    period and thresholds, stop-loss and take-profit), so its size does not
+    depend on history length. Fitness is computed with array operations over
+    the whole series; indicator arrays are cached per period and shared by
+    the population. The evolved rule can be run live with RuleSignal.
+    """
+
+    encoding = "rules"
+
+    def __init__(self, market_data, *args, fee_rate=None, indicator_cache_size=64, **kwargs):
+        self.fee_rate = fee_rate if fee_rate is not None else TRADING_CONFIG["GA_FEE_RATE"]
+        self._indicator_cache = {}
+        self._indicator_cache_size = indicator_cache_size
+        super().__init__(market_data, *args, **kwargs)
+        self.strategy_size = len(RULE_GENES)
+        self._returns = self.data[1:] / self.data[:-1] - 1.0
+
+    def _initialize_population(self):
+        return [np.random.random(len(RULE_GENES)).tolist() for _ in range(self.pop_size)]
+
+    def _mutate(self, chromo):
+        return [min(max(gene + random.gauss(0.0, 0.1), 0.0), 1.0) if random.random() < self.mutation_rate else gene
+                for gene in chromo]
+
+    def _indicator(self, kind, period):
+        key = (kind, period)
+        values = self._indicator_cache.get(key)
+        if values is None:
+            if len(self._indicator_cache) >= self._indicator_cache_size:
+                self._indicator_cache.pop(next(iter(self._indicator_cache)))
+            values = ema(self.data, period) if kind == "ema" else rsi(self.data, period)
+            self._indicator_cache[key] = values
+        return values
+
+    def positions(self, chromosome):
+        """Position (1 long / 0 flat) held after each bar's close, vectorized."""
+        p = decode_rule(chromosome)
+        close = self.data
+        fast, slow = self._indicator("ema", p["ema_fast"]), self._indicator("ema", p["ema_slow"])
+        rsi_values = self._indicator("rsi", p["rsi_period"])
+        return rule_positions(close, fast, slow, rsi_values, p)
+
+    def _evaluate_fitness(self, chromosome):
+        position = self.positions(chromosome)
+        strategy_returns = position[:-1] * self._returns
+        trades = np.count_nonzero(np.diff(position, prepend=0))
+        growth = np.exp(np.sum(np.log1p(strategy_returns))) * (1.0 - self.fee_rate) ** trades
+        return 1000.0 * growth
+
+    def latest_signal(self, best, key=None):
+        """Current position under rule `best`, from a live evaluator kept across calls.
+
+        The evaluator for (`key`, `best`) is warmed once over the closed bars;
+        later calls (e.g. the next trading cycle for the same asset) feed it
+        only the bars it has not seen, and it is rebuilt when `best` changes
+        or the window no longer reaches the last bar it saw. The newest bar
+        may still be forming, so it is evaluated on a copy.
+        """
+        times = None
+        if self.frame is not None and "time" in self.frame:
+            times = pd.to_datetime(self.frame["time"]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        cache_key = (key, tuple(best))
+        with _live_rule_signals_lock:
+            signal, start = None, 0
+            cached = _live_rule_signals.get(cache_key)
+            if cached is not None and times is not None:
+                seen = cached[1]
+                i = int(np.searchsorted(times, seen))
+                if i < len(times) - 1 and times[i] == seen:
+                    signal, start = cached[0], i + 1
+            if signal is None:
+                if len(_live_rule_signals) >= _LIVE_RULE_SIGNALS_MAX:
+                    _live_rule_signals.pop(next(iter(_live_rule_signals)))
+                signal = RuleSignal(best)
+            signal.warm(self.data[start:-1])
+            if times is not None:
+                _live_rule_signals[cache_key] = (signal, times[-2] if len(times) > 1 else times[-1])
+            signal = copy.deepcopy(signal)
+        return signal.update(float(self.data[-1]))
+
+
+def create_strategy(market_data, encoding=None, **kwargs):
+    """Build a GA strategy for GA_ENCODING ("bits" per candle or "rules")."""
+    encoding = encoding or TRADING_CONFIG["GA_ENCODING"]
+    if encoding == "rules":
+        return RuleBasedStrategy(market_data, **kwargs)
+    if encoding != "bits":
+        raise ValueError(f"Unknown GA encoding: {encoding}")
+    return GeneticTradingStrategy(market_data, **kwargs)
+
+
+class PopulationStore:
+    """Persists each run's elite chromosomes per (asset, granularity) to warm-start the next run.
+
+    Bit genomes are tied to candles, so saved chromosomes are realigned to the
+    new window by candle time: genes for candles still in the window are kept,
+    genes for new candles repeat the last known decision. Every run's
+    convergence stats go to ``convergence.jsonl`` for warm/cold comparison.
+    """
+
+    def __init__(self, directory=None, elite_fraction=None, min_overlap=0.5):
+        self.directory = directory or TRADING_CONFIG["GA_POPULATION_DIR"]
+        self.elite_fraction = elite_fraction if elite_fraction is not None else TRADING_CONFIG["GA_ELITE_FRACTION"]
+        self.min_overlap = min_overlap
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, asset, granularity):
+        return os.path.join(self.directory, f"{asset}-{granularity}.npz")
+
+    def save(self, strategy, asset, granularity=300):
+        elite = strategy.elite(self.elite_fraction)
+        if strategy.encoding == "rules":
+            np.savez(self._path(asset, granularity), chromosomes=np.array(elite), encoding="rules")
+            return True
+        times = strategy.gene_times
+        if times is None:
+            return False
+        np.savez(self._path(asset, granularity), chromosomes=np.array(elite, dtype=np.int8), times=times,
+                 encoding="bits")
+        return True
+
+    def seed(self, strategy, asset, granularity=300):
+        """Seed `strategy` from the saved population; returns True on a warm start."""
+        path = self._path(asset, granularity)
+        if not os.path.isfile(path):
+            return False
+        try:
+            with np.load(path) as saved:
+                encoding = str(saved["encoding"]) if "encoding" in saved else "bits"
+                chromosomes = saved["chromosomes"]
+                old_times = saved["times"] if "times" in saved else None
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable GA population {path}: {e}")
+            return False
+        if encoding != strategy.encoding:
+            return False
+        if encoding == "rules":
+            # Rule parameters do not depend on the window; reuse them as they are.
+            return strategy.seed_population(chromosomes)
+        new_times = strategy.gene_times
+        if new_times is None:
+            return False
+        realigned = realign_chromosomes(chromosomes, old_times, new_times, self.min_overlap)
+        return realigned is not None and strategy.seed_population(realigned)
+
+    def record_run(self, asset, granularity, stats):
+        with open(os.path.join(self.directory, "convergence.jsonl"), "a") as f:
+            f.write(json.dumps({"asset": asset, "granularity": granularity, "ts": time.time(), **stats}) + "\n")
+
+    def convergence_summary(self):
+        """Mean generations-to-convergence and run time for warm versus cold starts."""
+        runs = {"warm": [], "cold": []}
+        path = os.path.join(self.directory, "convergence.jsonl")
+        if os.path.isfile(path):
+            with open(path) as f:
+                for line in f:
+                    run = json.loads(line)
+                    runs["warm" if run.get("warm") else "cold"].append(run)
+        return {kind: {"runs": len(items),
+                       "mean_converged_at": round(float(np.mean([r["converged_at"] for r in items])), 2) if items else None,
+                       "mean_seconds": round(float(np.mean([r["seconds"] for r in items])), 4) if items else None}
+                for kind, items in runs.items()}
+
+
+def realign_chromosomes(chromosomes, old_times, new_times, min_overlap=0.5):
+    """Map bit genomes saved for `old_times` candles onto `new_times`; None if they barely overlap."""
+    idx = np.searchsorted(old_times, new_times).clip(0, len(old_times) - 1)
+    matched = old_times[idx] == new_times
+    if matched.mean() < min_overlap:
+        return None
+    # Forward-fill: each new candle takes the gene of the latest saved candle at or before it.
+    source = np.where(matched, idx, -1)
+    source = np.maximum.accumulate(source)
+    first = np.argmax(matched)
+    source[:first] = idx[first]
+    return chromosomes[:, source]
+
+
+_population_store = None
+
+
+def get_population_store():
+    """Returns the process-wide GA population store."""
+    global _population_store
+    if _population_store is None:
+        _population_store = PopulationStore()
+    return _population_store
@@ -0,0 +1,310 @@
+import math
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from config import TRADING_CONFIG
+
+FEATURE_COLUMNS = ["close", "ema_fast", "ema_slow", "rsi", "atr", "vwap", "returns", "volatility"]
+
+
+def _ewm(values, alpha):
+    # adjust=False is the plain recursion y[t] = y[t-1] + alpha * (x[t] - y[t-1]),
+    # seeded with the first value, which is exactly what the incremental classes do.
+    # 2-D input (time x asset) is smoothed column by column.
+    values = np.asarray(values, dtype=float)
+    frame = pd.DataFrame(values) if values.ndim == 2 else pd.Series(values)
+    return frame.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _rsi_value(avg_gain, avg_loss):
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+# ✅ Vectorized indicators over historical arrays
+
+def ema(close, period):
+    """Exponential moving average with alpha = 2 / (period + 1)."""
+    return _ewm(close, 2.0 / (period + 1))
+
+
+def rsi(close, period=14):
+    """Wilder RSI; the first bar has no change and reads as neutral."""
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close, axis=0, prepend=close[:1])
+    avg_gain = _ewm(np.clip(delta, 0, None), 1.0 / period)
+    avg_loss = _ewm(np.clip(-delta, 0, None), 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out = np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), out)
+    return out
+
+
+def atr(high, low, close, period=14):
+    """Wilder average true range."""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    true_range[0] = high[0] - low[0]
+    return _ewm(true_range, 1.0 / period)
+
+
+def vwap(high, low, close, volume, window=48):
+    """Volume-weighted average of the typical price over the last `window` bars.
+
+    A fixed window (rather than a running total from the first bar) keeps the
+    value independent of how much history precedes it, so a live engine that
+    has run for days matches a batch over the training window.
+    """
+    typical = (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + np.asarray(close, dtype=float)) / 3.0
+    volume = np.asarray(volume, dtype=float)
+    cum_volume = np.cumsum(volume)
+    cum_pv = np.cumsum(typical * volume)
+    start = np.arange(len(typical)) - window
+    win_volume = cum_volume - np.where(start >= 0, cum_volume[np.maximum(start, 0)], 0.0)
+    win_pv = cum_pv - np.where(start >= 0, cum_pv[np.maximum(start, 0)], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(win_volume > 0, win_pv / win_volume, typical)
+
+
+def log_returns(close):
+    """Bar-to-bar log returns; the first bar is 0."""
+    close = np.asarray(close, dtype=float)
+    return np.diff(np.log(close), prepend=np.log(close[0]))
+
+
+def rolling_volatility(returns, window=20):
+    """Population standard deviation of the last `window` returns."""
+    r = np.asarray(returns, dtype=float)
+    csum = np.cumsum(r)
+    csq = np.cumsum(r * r)
+    idx = np.arange(len(r))
+    start = idx - window
+    n = np.minimum(idx + 1, window)
+    s = csum - np.where(start >= 0, csum[np.maximum(start, 0)], 0.0)
+    sq = csq - np.where(start >= 0, csq[np.maximum(start, 0)], 0.0)
+    mean = s / n
+    return np.sqrt(np.clip(sq / n - mean * mean, 0.0, None))
+
+
+def compute_features(df, ema_fast=None, ema_slow=None, rsi_period=None, atr_period=None, vol_window=None,
+                     vwap_window=None):
+    """Compute the FEATURE_COLUMNS frame for a candle DataFrame in one vectorized pass."""
+    vwap_window = vwap_window or TRADING_CONFIG["FEATURE_VWAP_WINDOW"]
+    ema_fast = ema_fast or TRADING_CONFIG["FEATURE_EMA_FAST"]
+    ema_slow = ema_slow or TRADING_CONFIG["FEATURE_EMA_SLOW"]
+    rsi_period = rsi_period or TRADING_CONFIG["FEATURE_RSI_PERIOD"]
+    atr_period = atr_period or TRADING_CONFIG["FEATURE_ATR_PERIOD"]
+    vol_window = vol_window or TRADING_CONFIG["FEATURE_VOL_WINDOW"]
+
+    close = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float) if "high" in df else close
+    low = df["low"].to_numpy(dtype=float) if "low" in df else close
+    volume = df["volume"].to_numpy(dtype=float) if "volume" in df else np.zeros_like(close)
+
+    returns = log_returns(close)
+    return pd.DataFrame({
+        "close": close,
+        "ema_fast": ema(close, ema_fast),
+        "ema_slow": ema(close, ema_slow),
+        "rsi": rsi(close, rsi_period),
+        "atr": atr(high, low, close, atr_period),
+        "vwap": vwap(high, low, close, volume, vwap_window),
+        "returns": returns,
+        "volatility": rolling_volatility(returns, vol_window),
+    }, index=df.index)
+
+
+# ✅ Incremental O(1) indicators for the live feed
+
+class EMA:
+    """Streaming EMA matching `ema`."""
+
+    def __init__(self, period=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value = None
+
+    def update(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class RSI:
+    """Streaming Wilder RSI matching `rsi`."""
+
+    def __init__(self, period=14):
+        self._gain = EMA(alpha=1.0 / period)
+        self._loss = EMA(alpha=1.0 / period)
+        self._prev = None
+        self.value = None
+
+    def update(self, close):
+        delta = 0.0 if self._prev is None else close - self._prev
+        self._prev = close
+        avg_gain = self._gain.update(max(delta, 0.0))
+        avg_loss = self._loss.update(max(-delta, 0.0))
+        self.value = _rsi_value(avg_gain, avg_loss)
+        return self.value
+
+
+class ATR:
+    """Streaming Wilder ATR matching `atr`."""
+
+    def __init__(self, period=14):
+        self._avg = EMA(alpha=1.0 / period)
+        self._prev_close = None
+        self.value = None
+
+    def update(self, high, low, close):
+        if self._prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = self._avg.update(true_range)
+        return self.value
+
+
+class VWAP:
+    """Streaming rolling-window VWAP matching `vwap`."""
+
+    def __init__(self, window=48):
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._pv = 0.0
+        self._volume = 0.0
+        self.value = None
+
+    def update(self, high, low, close, volume):
+        typical = (high + low + close) / 3.0
+        if len(self._values) == self.window:
+            old_pv, old_volume = self._values[0]
+            self._pv -= old_pv
+            self._volume -= old_volume
+        self._values.append((typical * volume, volume))
+        self._pv += typical * volume
+        self._volume += volume
+        self.value = self._pv / self._volume if self._volume > 0 else typical
+        return self.value
+
+
+class RollingVolatility:
+    """Streaming population std over a fixed window, matching `rolling_volatility`."""
+
+    def __init__(self, window=20):
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self.value = None
+
+    def update(self, x):
+        if len(self._values) == self.window:
+            old = self._values[0]
+            self._sum -= old
+            self._sumsq -= old * old
+        self._values.append(x)
+        self._sum += x
+        self._sumsq += x * x
+        n = len(self._values)
+        mean = self._sum / n
+        self.value = math.sqrt(max(self._sumsq / n - mean * mean, 0.0))
+        return self.value
+
+
+class FeatureEngine:
+    """Incremental counterpart of `compute_features`; each update is O(1)."""
+
+    def __init__(self, ema_fast=None, ema_slow=None, rsi_period=None, atr_period=None, vol_window=None,
+                 vwap_window=None):
+        self.ema_fast = EMA(ema_fast or TRADING_CONFIG["FEATURE_EMA_FAST"])
+        self.ema_slow = EMA(ema_slow or TRADING_CONFIG["FEATURE_EMA_SLOW"])
+        self.rsi = RSI(rsi_period or TRADING_CONFIG["FEATURE_RSI_PERIOD"])
+        self.atr = ATR(atr_period or TRADING_CONFIG["FEATURE_ATR_PERIOD"])
+        self.vwap = VWAP(vwap_window or TRADING_CONFIG["FEATURE_VWAP_WINDOW"])
+        self.volatility = RollingVolatility(vol_window or TRADING_CONFIG["FEATURE_VOL_WINDOW"])
+        self._prev_log = None
+
+    def update(self, close, high=None, low=None, volume=0.0):
+        """Consume one tick or bar and return its feature row in FEATURE_COLUMNS order."""
+        high = close if high is None else high
+        low = close if low is None else low
+        log_close = math.log(close)
+        ret = 0.0 if self._prev_log is None else log_close - self._prev_log
+        self._prev_log = log_close
+        return np.array([
+            close,
+            self.ema_fast.update(close),
+            self.ema_slow.update(close),
+            self.rsi.update(close),
+            self.atr.update(high, low, close),
+            self.vwap.update(high, low, close, volume),
+            ret,
+            self.volatility.update(ret),
+        ])
+
+    def warm_start(self, df):
+        """Replay historical candles so live updates continue from the same state."""
+        close = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float)
+        high = df["high"].to_numpy(dtype=float) if "high" in df else close
+        low = df["low"].to_numpy(dtype=float) if "low" in df else close
+        volume = df["volume"].to_numpy(dtype=float) if "volume" in df else np.zeros_like(close)
+        row = None
+        for c, h, l, v in zip(close, high, low, volume):
+            row = self.update(c, h, l, v)
+        return row
+
+
+class BarFeatureEngine:
+    """FeatureEngine fed with candles built from ticks, so live rows match training rows.
+
+    Training features come from `granularity`-second candles; ticks are
+    folded into the forming candle's OHLCV and the engine only advances when
+    a tick opens the next candle. Rows are therefore the closed-candle rows
+    `compute_features` would produce from history.
+    """
+
+    def __init__(self, granularity=300, **kwargs):
+        self.granularity = granularity
+        self.engine = FeatureEngine(**kwargs)
+        self._bar = None  # [start, high, low, close, volume] of the forming candle
+        self._warmed_until = None  # start of the first candle not covered by warm_start
+
+    def update(self, price, ts, volume=0.0):
+        """Fold one tick in; returns the feature row of the candle it closed, else None."""
+        start = int(ts // self.granularity) * self.granularity
+        if self._warmed_until is not None and start < self._warmed_until:
+            return None  # already part of the warmed history
+        bar = self._bar
+        if bar is None or start > bar[0]:
+            self._bar = [start, price, price, price, volume]
+            if bar is None:
+                return None
+            return self.engine.update(bar[3], bar[1], bar[2], bar[4])
+        # Late ticks from an already closed candle count toward the forming one.
+        bar[1], bar[2], bar[3] = max(bar[1], price), min(bar[2], price), price
+        bar[4] += volume
+        return None
+
+    def warm_start(self, df, now=None):
+        """Replay closed historical candles; returns their feature rows in order.
+
+        A candle still forming at `now` is left for the live ticks to finish;
+        ticks from the replayed candles are ignored afterwards.
+        """
+        if "time" in df:
+            t = df["time"]
+            seconds = (t - pd.Timestamp(0)) // pd.Timedelta(seconds=1) if pd.api.types.is_datetime64_any_dtype(t) else t
+            seconds = pd.to_numeric(seconds).to_numpy()
+            now = time.time() if now is None else now
+            closed = seconds + self.granularity <= now
+            df = df[closed]
+            if closed.any():
+                self._warmed_until = int(seconds[closed].max()) + self.granularity
+        close = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float)
+        high = df["high"].to_numpy(dtype=float) if "high" in df else close
+        low = df["low"].to_numpy(dtype=float) if "low" in df else close
+        volume = df["volume"].to_numpy(dtype=float) if "volume" in df else np.zeros_like(close)
+        return [self.engine.update(c, h, l, v) for c, h, l, v in zip(close, high, low, volume)]
@@ -0,0 +1,266 @@
+import os
+import numpy as np
+from scaler import load_cached
+
+# Deliberately TensorFlow-free: a process that only serves predictions can load
+# the exported weights and run the forward pass with NumPy alone.
+
+INFERENCE_FORMAT_VERSION = 1
+
+
+def _sigmoid(x):
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+}
+
+
+def _activation_name(activation):
+    name = getattr(activation, "__name__", str(activation))
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy export: {name}")
+    return name
+
+
+def export_numpy_model(model, path, model_version=None, horizons=None):
+    """Write a trained Keras LSTM stack to an .npz the NumPy runtime can execute.
+
+    `horizons` records the steps ahead predicted by each output unit.
+    """
+    arrays = {}
+    kinds = []
+    for i, layer in enumerate(model.layers):
+        kind = type(layer).__name__
+        prefix = f"l{i}_"
+        if kind == "LSTM":
+            kernel, recurrent, bias = layer.get_weights()
+            arrays[prefix + "kernel"] = kernel
+            arrays[prefix + "recurrent"] = recurrent
+            arrays[prefix + "bias"] = bias
+            arrays[prefix + "return_sequences"] = np.bool_(layer.return_sequences)
+            if _activation_name(layer.activation) != "tanh" or _activation_name(layer.recurrent_activation) != "sigmoid":
+                raise ValueError("Only tanh/sigmoid LSTM layers can be exported.")
+        elif kind == "LayerNormalization":
+            gamma, beta = layer.get_weights()
+            arrays[prefix + "gamma"] = gamma
+            arrays[prefix + "beta"] = beta
+            arrays[prefix + "epsilon"] = np.float64(layer.epsilon)
+        elif kind == "Dropout":
+            arrays[prefix + "rate"] = np.float64(layer.rate)
+        elif kind == "Dense":
+            kernel, bias = layer.get_weights()
+            arrays[prefix + "kernel"] = kernel
+            arrays[prefix + "bias"] = bias
+            arrays[prefix + "activation"] = np.str_(_activation_name(layer.activation))
+        else:
+            raise ValueError(f"Layer type {kind} is not supported by the NumPy runtime.")
+        kinds.append(kind)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            format_version=np.int64(INFERENCE_FORMAT_VERSION),
+            model_version=np.str_(model_version or ""),
+            input_shape=np.array(model.input_shape[1:], dtype=np.int64),
+            horizons=np.array(horizons or [], dtype=np.int64),
+            layers=np.array(kinds),
+            **arrays,
+        )
+    os.replace(tmp_path, path)
+
+
+class NumpyLSTMRuntime:
+    """Forward pass of an exported LSTM/LayerNorm/Dropout/Dense stack in NumPy.
+
+    Inputs are batches shaped (batch, timesteps, features). MC-dropout samples
+    are drawn by tiling the batch and applying independent dropout masks, so
+    every sample runs through a single vectorized pass.
+    """
+
+    def __init__(self, layers, input_shape, model_version=None, dtype=np.float32, horizons=None):
+        self.layers = layers
+        self.input_shape = tuple(input_shape)
+        self.model_version = model_version
+        self.dtype = dtype
+        self.horizons = list(horizons) if horizons else None
+
+    @classmethod
+    def load(cls, path, dtype=np.float32):
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != INFERENCE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported inference format version {version} in {path}")
+            layers = []
+            for i, kind in enumerate(data["layers"]):
+                kind = str(kind)
+                prefix = f"l{i}_"
+                spec = {"kind": kind}
+                for key in data.files:
+                    if key.startswith(prefix):
+                        value = data[key]
+                        name = key[len(prefix):]
+                        if value.dtype.kind == "f" and value.ndim > 0:
+                            value = value.astype(dtype)
+                        spec[name] = value.item() if value.ndim == 0 else value
+                layers.append(spec)
+            model_version = str(data["model_version"]) or None
+            input_shape = data["input_shape"].tolist()
+            horizons = data["horizons"].tolist() if "horizons" in data.files else None
+        return cls(layers, input_shape, model_version, dtype, horizons)
+
+    @staticmethod
+    def _lstm(x, spec):
+        kernel, recurrent, bias = spec["kernel"], spec["recurrent"], spec["bias"]
+        units = recurrent.shape[0]
+        batch, steps, _ = x.shape
+        # Input projections for every timestep in one matmul; only the
+        # recurrent term stays inside the time loop.
+        projected = x @ kernel + bias
+        h = np.zeros((batch, units), dtype=x.dtype)
+        c = np.zeros((batch, units), dtype=x.dtype)
+        outputs = np.empty((batch, steps, units), dtype=x.dtype) if spec["return_sequences"] else None
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent
+            i = _sigmoid(z[:, :units])
+            f = _sigmoid(z[:, units:2 * units])
+            g = np.tanh(z[:, 2 * units:3 * units])
+            o = _sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return outputs if outputs is not None else h
+
+    def forward(self, x, rng=None):
+        """Run the stack; dropout layers are active only when `rng` is given."""
+        x = np.asarray(x, dtype=self.dtype)
+        for spec in self.layers:
+            kind = spec["kind"]
+            if kind == "LSTM":
+                x = self._lstm(x, spec)
+            elif kind == "LayerNormalization":
+                mean = x.mean(axis=-1, keepdims=True)
+                var = x.var(axis=-1, keepdims=True)
+                x = (x - mean) / np.sqrt(var + spec["epsilon"]) * spec["gamma"] + spec["beta"]
+            elif kind == "Dropout":
+                if rng is not None and spec["rate"] > 0:
+                    keep = 1.0 - spec["rate"]
+                    x = x * (rng.random(x.shape, dtype=self.dtype) < keep) / self.dtype(keep)
+            elif kind == "Dense":
+                x = _ACTIVATIONS[spec["activation"]](x @ spec["kernel"] + spec["bias"])
+        return x
+
+    def predict(self, X):
+        """Deterministic batched prediction, shape (batch, outputs)."""
+        return self.forward(X)
+
+    def predict_mc(self, X, runs=20, rng=None):
+        """MC-dropout samples for a batch, shape (runs, batch, outputs)."""
+        X = np.asarray(X, dtype=self.dtype)
+        rng = rng if rng is not None else np.random.default_rng()
+        tiled = np.broadcast_to(X, (runs,) + X.shape).reshape((-1,) + X.shape[1:])
+        out = self.forward(tiled, rng=rng)
+        return out.reshape((runs, X.shape[0]) + out.shape[1:])
+
+
+def _per_model(param, ndim):
+    """Reshape a (models, ...) parameter so it broadcasts against an `ndim`-dimensional activation."""
+    return param.reshape(param.shape[:1] + (1,) * (ndim - param.ndim) + param.shape[1:])
+
+
+class StackedLSTMRuntime:
+    """Several runtimes with the same architecture evaluated in one forward pass.
+
+    Each weight gets a leading model axis and every matmul is batched over
+    it, so scoring M models runs one timestep loop instead of M. Inputs are
+    shaped (models, batch, timesteps, features), since each model scales the
+    window with its own scaler.
+    """
+
+    def __init__(self, runtimes, dtype=np.float32):
+        first = runtimes[0]
+        for runtime in runtimes[1:]:
+            if runtime.input_shape != first.input_shape or len(runtime.layers) != len(first.layers):
+                raise ValueError("Runtimes with different architectures cannot be stacked.")
+        self.layers = []
+        for specs in zip(*(runtime.layers for runtime in runtimes)):
+            stacked = {}
+            for name, value in specs[0].items():
+                values = [spec.get(name) for spec in specs]
+                if isinstance(value, np.ndarray):
+                    if any(not isinstance(v, np.ndarray) or v.shape != value.shape for v in values):
+                        raise ValueError(f"Layer parameter {name} differs in shape; runtimes cannot be stacked.")
+                    stacked[name] = np.stack(values).astype(dtype)
+                elif any(v != value for v in values):
+                    raise ValueError(f"Layer setting {name} differs; runtimes cannot be stacked.")
+                else:
+                    stacked[name] = value
+            self.layers.append(stacked)
+        self.input_shape = first.input_shape
+        self.model_versions = [runtime.model_version for runtime in runtimes]
+        self.dtype = dtype
+
+    def _lstm(self, x, spec):
+        kernel, recurrent, bias = spec["kernel"], spec["recurrent"], spec["bias"]
+        units = recurrent.shape[-2]
+        models, batch, steps, _ = x.shape
+        projected = x @ _per_model(kernel, 4) + _per_model(bias, 4)
+        h = np.zeros((models, batch, units), dtype=x.dtype)
+        c = np.zeros((models, batch, units), dtype=x.dtype)
+        outputs = np.empty((models, batch, steps, units), dtype=x.dtype) if spec["return_sequences"] else None
+        for t in range(steps):
+            z = projected[:, :, t] + h @ recurrent
+            i = _sigmoid(z[..., :units])
+            f = _sigmoid(z[..., units:2 * units])
+            g = np.tanh(z[..., 2 * units:3 * units])
+            o = _sigmoid(z[..., 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if outputs is not None:
+                outputs[:, :, t] = h
+        return outputs if outputs is not None else h
+
+    def forward(self, x, rng=None):
+        """Run every model on its own slice of `x`; dropout is active only when `rng` is given."""
+        x = np.asarray(x, dtype=self.dtype)
+        for spec in self.layers:
+            kind = spec["kind"]
+            if kind == "LSTM":
+                x = self._lstm(x, spec)
+            elif kind == "LayerNormalization":
+                mean = x.mean(axis=-1, keepdims=True)
+                var = x.var(axis=-1, keepdims=True)
+                x = ((x - mean) / np.sqrt(var + spec["epsilon"]) * _per_model(spec["gamma"], x.ndim)
+                     + _per_model(spec["beta"], x.ndim))
+            elif kind == "Dropout":
+                if rng is not None and spec["rate"] > 0:
+                    keep = 1.0 - spec["rate"]
+                    x = x * (rng.random(x.shape, dtype=self.dtype) < keep) / self.dtype(keep)
+            elif kind == "Dense":
+                x = _ACTIVATIONS[spec["activation"]](x @ _per_model(spec["kernel"], x.ndim)
+                                                     + _per_model(spec["bias"], x.ndim))
+        return x
+
+    def predict(self, X):
+        """Deterministic prediction, shape (models, batch, outputs)."""
+        return self.forward(X)
+
+    def predict_mc(self, X, runs=20, rng=None):
+        """MC-dropout samples, shape (models, runs, batch, outputs)."""
+        X = np.asarray(X, dtype=self.dtype)
+        rng = rng if rng is not None else np.random.default_rng()
+        models, batch = X.shape[:2]
+        tiled = np.broadcast_to(X[:, None], (models, runs) + X.shape[1:]).reshape((models, runs * batch) + X.shape[2:])
+        out = self.forward(tiled, rng=rng)
+        return out.reshape((models, runs, batch) + out.shape[2:])
+
+
+def load_runtime(path):
+    """Returns the runtime for `path`, re-reading the file only when it changes on disk."""
+    return load_cached(path, NumpyLSTMRuntime.load)
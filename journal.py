@@ -0,0 +1,190 @@
+import csv
+import queue
+import sqlite3
+import threading
+import time
+from config import TRADING_CONFIG, get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        time REAL NOT NULL,
+        venue TEXT NOT NULL,
+        asset TEXT NOT NULL,
+        side TEXT NOT NULL,
+        amount REAL,
+        price REAL,
+        status TEXT,
+        detail TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        time REAL NOT NULL,
+        asset TEXT NOT NULL,
+        last_price REAL,
+        predicted REAL,
+        std REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_trades_asset_time ON trades (asset, time)",
+    "CREATE INDEX IF NOT EXISTS idx_predictions_asset_time ON predictions (asset, time)",
+)
+
+_INSERT_SQL = {
+    "trades": "INSERT INTO trades (time, venue, asset, side, amount, price, status, detail) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "predictions": "INSERT INTO predictions (time, asset, last_price, predicted, std) VALUES (?, ?, ?, ?, ?)",
+}
+
+_COLUMNS = {
+    "trades": ["id", "time", "venue", "asset", "side", "amount", "price", "status", "detail"],
+    "predictions": ["id", "time", "asset", "last_price", "predicted", "std"],
+}
+
+
+class TradeJournal:
+    """Write-behind journal that batches trade and prediction records into SQLite."""
+
+    def __init__(self, db_file=None, batch_size=None, flush_interval=None, max_queue=100_000):
+        self.db_file = db_file or TRADING_CONFIG["DB_FILE"]
+        self.batch_size = batch_size or TRADING_CONFIG["JOURNAL_BATCH_SIZE"]
+        self.flush_interval = flush_interval or TRADING_CONFIG["JOURNAL_FLUSH_INTERVAL"]
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+
+    # Hot-path API: enqueue only, never touch disk or block.
+    def _enqueue(self, table, row):
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self.dropped += 1
+
+    def record_trade(self, venue, asset, side, amount, price=None, status="submitted", detail=None, ts=None):
+        """Queue a trade record for the writer thread."""
+        self._enqueue("trades", (ts or time.time(), venue, asset, side, amount, price, status, detail))
+
+    def record_prediction(self, asset, last_price, predicted, std, ts=None):
+        """Queue a prediction record for the writer thread."""
+        self._enqueue("predictions", (ts or time.time(), asset, last_price, predicted, std))
+
+    def flush(self, timeout=5.0):
+        """Block until every record queued so far has been committed."""
+        done = threading.Event()
+        try:
+            self._queue.put(("flush", done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flush pending records and stop the writer thread."""
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Trade journal disabled, cannot open {self.db_file}: {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = {"trades": [], "predictions": []}
+            waiters = []
+            item = first
+            while True:
+                table, payload = item
+                if table == "flush":
+                    waiters.append(payload)
+                else:
+                    batch[table].append(payload)
+                if sum(len(rows) for rows in batch.values()) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                with conn:
+                    for table, rows in batch.items():
+                        if rows:
+                            conn.executemany(_INSERT_SQL[table], rows)
+            except sqlite3.Error as e:
+                logger.error(f"Trade journal write failed, {sum(map(len, batch.values()))} records lost: {e}")
+
+            for waiter in waiters:
+                waiter.set()
+
+        conn.close()
+
+    def query(self, table, asset=None, since=None):
+        """Read committed rows from a journal table using a separate connection."""
+        if table not in _COLUMNS:
+            raise ValueError(f"Unknown journal table: {table}")
+        sql = f"SELECT {', '.join(_COLUMNS[table])} FROM {table}"
+        clauses, params = [], []
+        if asset is not None:
+            clauses.append("asset = ?")
+            params.append(asset)
+        if since is not None:
+            clauses.append("time >= ?")
+            params.append(since)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY time"
+        with sqlite3.connect(self.db_file) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def export_csv(self, path=None, table="trades"):
+        """Export a journal table to CSV (defaults to TRADE_LOG_FILE)."""
+        path = path or TRADING_CONFIG["TRADE_LOG_FILE"]
+        rows = self.query(table)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(_COLUMNS[table])
+            writer.writerows(rows)
+        return path
+
+    def export_parquet(self, path, table="trades"):
+        """Export a journal table to Parquet (requires pandas with pyarrow or fastparquet)."""
+        import pandas as pd
+        df = pd.DataFrame(self.query(table), columns=_COLUMNS[table])
+        df.to_parquet(path, index=False)
+        return path
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """Returns the process-wide trade journal, starting its writer on first use."""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = TradeJournal()
+    return _journal
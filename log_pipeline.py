@@ -0,0 +1,153 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+_listener = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record):
+        # The stock implementation renders the message on the caller's thread;
+        # the listener formats it instead so the feed/inference threads only pay
+        # for building the LogRecord and a queue put.
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+    def format(self, record):
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self._RESERVED and not key.startswith("_"):
+                payload[key] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class ThrottleFilter(logging.Filter):
+    """Per-key rate limiting and sampling for high-frequency log records.
+
+    A record's key is its ``rate_key`` extra when present, otherwise its logger
+    name. ``rate_limits`` maps keys to ``(max_records, per_seconds)`` and
+    ``sample_rates`` maps keys to "keep one record in N". Suppressed counts are
+    appended to the next record that gets through for the same key.
+    """
+
+    def __init__(self, rate_limits=None, sample_rates=None):
+        super().__init__()
+        self.rate_limits = dict(rate_limits or {})
+        self.sample_rates = dict(sample_rates or {})
+        self._windows = {}
+        self._counters = {}
+        self._suppressed = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "rate_key", None) or record.name
+        limit = self.rate_limits.get(key)
+        every = self.sample_rates.get(key)
+        if limit is None and every is None:
+            return True
+
+        with self._lock:
+            allowed = True
+            if every is not None:
+                seen = self._counters.get(key, 0)
+                self._counters[key] = seen + 1
+                allowed = seen % every == 0
+            if allowed and limit is not None:
+                max_records, per = limit
+                now = time.monotonic()
+                start, count = self._windows.get(key, (now, 0))
+                if now - start >= per:
+                    start, count = now, 0
+                allowed = count < max_records
+                self._windows[key] = (start, count + 1 if allowed else count)
+
+            if not allowed:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            suppressed = self._suppressed.pop(key, 0)
+
+        if suppressed:
+            record.msg = f"{record.msg} [+{suppressed} similar suppressed]"
+        return True
+
+
+def parse_throttle_spec(spec):
+    """Parses ``"key=10/60,other=1:100"`` into rate-limit and sampling dicts."""
+    rate_limits, sample_rates = {}, {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        key, _, value = item.partition("=")
+        key, value = key.strip(), value.strip()
+        try:
+            if "/" in value:
+                count, per = value.split("/", 1)
+                rate_limits[key] = (int(count), float(per))
+            elif ":" in value:
+                _, every = value.split(":", 1)
+                sample_rates[key] = max(1, int(every))
+            else:
+                raise ValueError(value)
+        except ValueError:
+            raise ValueError(f"Invalid log throttle spec '{item}', expected key=N/SECONDS or key=1:N")
+    return rate_limits, sample_rates
+
+
+def configure_logging(log_file, level=logging.INFO, fmt="text", max_bytes=10 * 1024 * 1024,
+                      backup_count=5, rotate_when=None, throttle_spec=None):
+    """Routes root logging through a queue to a rotating file handler on a listener thread."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=rotate_when, backupCount=backup_count, encoding="utf-8")
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+    if fmt == "json":
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    rate_limits, sample_rates = parse_throttle_spec(throttle_spec)
+    if rate_limits or sample_rates:
+        queue_handler.addFilter(ThrottleFilter(rate_limits, sample_rates))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -12,12 +12,15 @@ import queue
 import sys
 
 from styles import apply_style
-from data_handler import get_historical_data, start_live_data_listener
+from data_handler import get_historical_data, start_live_data_listener, register_tick_listener, order_books
 from model import train_or_update_model, predict_price, schedule_retrain, stream_predict_on_update
-from genetic_trading import GeneticTradingStrategy, APIManager
+from genetic_trading import APIManager, create_strategy, get_population_store
 from config import get_logger, TRADING_CONFIG
+from profiler import profiler, install_signal_handler
+from pipeline import PipelineSupervisor
+from portfolio import run_portfolio_backtest
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 class CoinFxGUI:
     def __init__(self, root):
@@ -26,16 +29,19 @@ class CoinFxGUI:
         self.root.geometry("1100x720")
         self.root.configure(bg="#121212")
 
-        self.api_manager = APIManager()
+        self.api_manager = APIManager(order_books=order_books)
+        register_tick_listener(self.api_manager.risk_engine.on_tick)
         self.asset_selected = tk.StringVar(value="BTC-USD")
         self.trading_active = False
         self.log_queue = queue.Queue()
         self.predictions = []
+        self.pipeline = None
 
         self.setup_logging_redirect()
         self.setup_ui()
         self.start_background_tasks()
         self.root.after(100, self.update_log_console)
+        self.root.after(2000, self.update_profiler_view)
 
     def setup_logging_redirect(self):
         class QueueHandler:
@@ -55,10 +61,30 @@ class CoinFxGUI:
         self.root.after(100, self.update_log_console)
 
     def start_background_tasks(self):
-        threading.Thread(target=lambda: asyncio.run(async_market_data()), daemon=True).start()
+        if TRADING_CONFIG["PIPELINE_MODE"] == "process":
+            # Feed, inference and execution run in supervised child processes.
+            self.pipeline = PipelineSupervisor()
+            self.pipeline.start()
+            self.root.after(500, self.poll_pipeline_events)
+            return
+        threading.Thread(target=lambda: asyncio.run(async_market_data()), name="market-data", daemon=True).start()
         schedule_retrain(interval_minutes=30)
         stream_predict_on_update(poll_interval=10)
 
+    def poll_pipeline_events(self):
+        try:
+            while True:
+                kind, payload = self.pipeline.events.get_nowait()
+                if kind == "signal":
+                    if "predicted" in payload:  # GA signals carry no prediction
+                        self.prediction_label.config(text=f"Predicted Price: {payload['predicted']:.2f}")
+                        self.predictions.append(payload["predicted"])
+                else:
+                    logger.info(f"Pipeline order: {'BUY' if payload['signal'] == 1 else 'SELL'} {payload['product_id']}")
+        except queue.Empty:
+            pass
+        self.root.after(500, self.poll_pipeline_events)
+
     def setup_ui(self):
         self.tab_control = ttk.Notebook(self.root)
         self.tabs = {
@@ -86,7 +112,7 @@ class CoinFxGUI:
         frame = self.tabs["Dashboard"]
         tk.Label(frame, text="CoinFx Trading Dashboard", font=("Arial", 18, "bold"), bg="#121212", fg="#E0E0E0").pack(pady=10)
 
-        assets = ["BTC-USD", "ETH-USD", "LTC-USD", "XRP-USD", "ADA-USD"]
+        assets = TRADING_CONFIG["PORTFOLIO_ASSETS"]
         self.asset_dropdown = ttk.Combobox(frame, values=assets, textvariable=self.asset_selected)
         self.asset_dropdown.pack(pady=5)
 
@@ -131,12 +157,13 @@ class CoinFxGUI:
     def create_ga_tab(self):
         frame = self.tabs["Genetic Algorithm"]
         tk.Label(frame, text="Genetic Algorithm Optimization", font=("Arial", 14, "bold"), bg="#121212", fg="#E0E0E0").pack(pady=10)
-        tk.Button(frame, text="Run Genetic Algorithm", command=lambda: threading.Thread(target=self.execute_trading_strategy, daemon=True).start()).pack(pady=10)
+        tk.Button(frame, text="Run Genetic Algorithm", command=lambda: threading.Thread(target=self.execute_trading_strategy, name="ga-strategy", daemon=True).start()).pack(pady=10)
 
     def create_backtesting_tab(self):
         frame = self.tabs["Backtesting"]
         tk.Label(frame, text="Backtesting Trading Strategies", font=("Arial", 14, "bold"), bg="#121212", fg="#E0E0E0").pack(pady=10)
         tk.Button(frame, text="Run Backtest", command=self.run_backtest).pack(pady=10)
+        tk.Button(frame, text="Run Portfolio Backtest", command=lambda: threading.Thread(target=self.run_portfolio_backtest, name="portfolio-backtest", daemon=True).start()).pack(pady=10)
 
     def create_logs_tab(self):
         frame = self.tabs["Trade Logs"]
@@ -146,13 +173,44 @@ class CoinFxGUI:
         frame = self.tabs["Settings"]
         tk.Label(frame, text="Settings", font=("Arial", 14, "bold"), bg="#121212", fg="#E0E0E0").pack(pady=10)
 
+        self.profiler_enabled = tk.BooleanVar(value=profiler.enabled)
+        tk.Checkbutton(frame, text="Sampling Profiler", variable=self.profiler_enabled, command=self.toggle_profiler,
+                       bg="#121212", fg="#E0E0E0", selectcolor="#121212").pack(pady=5)
+        tk.Button(frame, text="Write Profile", command=self.write_profile).pack(pady=5)
+        self.profiler_output = tk.Label(frame, text="Profiler off.", font=("Courier", 10), justify=tk.LEFT, bg="#121212", fg="#1DB954")
+        self.profiler_output.pack(pady=5)
+
+    def toggle_profiler(self):
+        if self.profiler_enabled.get():
+            profiler.start()
+        else:
+            profiler.stop()
+        self.update_profiler_view(reschedule=False)
+
+    def write_profile(self):
+        collapsed_path, report_path = profiler.dump()
+        messagebox.showinfo("Profile Written", f"Flamegraph stacks: {collapsed_path}\nReport: {report_path}")
+
+    def update_profiler_view(self, reschedule=True):
+        if profiler.enabled:
+            report = profiler.report()
+            lines = [f"{name:<18} {t['cpu_pct'] or 0:>6.1f}% CPU" for name, t in list(report["threads"].items())[:6]]
+            lines += [f"{name:<18} {s['cpu_ms_per_call']:>8.2f} ms/call  x{s['calls']}" for name, s in report["stages"].items()]
+            self.profiler_output.config(text="\n".join(lines) or "Collecting samples...")
+        else:
+            self.profiler_output.config(text="Profiler off.")
+        if reschedule:
+            self.root.after(2000, self.update_profiler_view)
+
     def train_ai_model(self):
         messagebox.showinfo("Training Started", "AI model training is in progress...")
-        threading.Thread(target=self.async_train_model, daemon=True).start()
+        threading.Thread(target=self.async_train_model, name="model-train", daemon=True).start()
 
     def async_train_model(self):
         try:
-            train_or_update_model()
+            if train_or_update_model() is False:
+                messagebox.showinfo("Training Skipped", "A model training is already running.")
+                return
             messagebox.showinfo("Training Complete", "AI model training finished!")
         except Exception as e:
             logger.error(f"AI Model training failed: {e}")
@@ -180,14 +238,18 @@ class CoinFxGUI:
             messagebox.showinfo("Trading Bot", "Trading is already running!")
             return
         self.trading_active = True
+        if self.pipeline:
+            self.pipeline.set_trading(True)
         self.update_ui_status("Trading Active", disable_start=True, enable_stop=True)
-        threading.Thread(target=self.execute_trading_strategy, daemon=True).start()
+        threading.Thread(target=self.execute_trading_strategy, name="ga-strategy", daemon=True).start()
 
     def stop_trading(self):
         if not self.trading_active:
             messagebox.showinfo("Trading Bot", "Trading is not active!")
             return
         self.trading_active = False
+        if self.pipeline:
+            self.pipeline.set_trading(False)
         self.update_ui_status("Trading Stopped", disable_stop=True, enable_start=True)
 
     def execute_trading_strategy(self):
@@ -199,22 +261,44 @@ class CoinFxGUI:
             messagebox.showerror("Data Error", f"Failed to fetch market data for {asset}!")
             self.trading_active = False
             return
-        strategy = GeneticTradingStrategy(market_data)
+        # Seed from the previous cycle's elite: the window has only moved a few candles.
+        store = get_population_store()
+        strategy = create_strategy(market_data, patience=TRADING_CONFIG["GA_PATIENCE"])
+        store.seed(strategy, asset, 300)
         best_strategy = strategy.evolve()
-        signal = best_strategy[-1]
+        store.save(strategy, asset, 300)
+        store.record_run(asset, 300, strategy.stats)
+        signal = strategy.latest_signal(best_strategy, key=asset)
         logger.info(f"Executing trade with signal: {signal}")
-        self.api_manager.execute_trade(asset, signal, "coinbase")
+        if self.pipeline:
+            # The execution process owns the position book and the live ticks.
+            self.pipeline.submit_signal(asset, signal, source="ga")
+        else:
+            self.api_manager.execute_trade(asset, signal, "coinbase")
 
     def run_backtest(self):
         asset = self.asset_selected.get()
         market_data = get_historical_data(asset.split("-")[0])
-        if not market_data:
+        if market_data is None or market_data.empty:
             messagebox.showerror("Backtest Error", "Failed to fetch market data!")
             return
-        strategy = GeneticTradingStrategy(market_data)
+        strategy = create_strategy(market_data)
         results = strategy.backtest()
         messagebox.showinfo("Backtest Complete", f"Backtest Results: {results}")
 
+    def run_portfolio_backtest(self):
+        """Backtest every configured asset as one portfolio in a single vectorized pass."""
+        result = run_portfolio_backtest()
+        if result is None:
+            self.root.after(0, messagebox.showerror, "Backtest Error", "Failed to fetch market data!")
+            return
+        m = result["metrics"]
+        lines = [f"Portfolio: {m['total_return']:+.2%}  Sharpe {m['sharpe']:.2f}  "
+                 f"max DD {m['max_drawdown']:.2%}  trades {m['trades']}"]
+        for asset, am in result["asset_metrics"].items():
+            lines.append(f"{asset}: P&L {am['pnl']:+.2f}  alone {am['total_return']:+.2%}  trades {am['trades']}")
+        self.root.after(0, messagebox.showinfo, "Portfolio Backtest Complete", "\n".join(lines))
+
     def update_ui_status(self, status_text, disable_start=False, enable_start=False, disable_stop=False, enable_stop=False):
         self.root.after(0, self.market_data_label.config, {"text": f"Status: {status_text}"})
         if disable_start:
@@ -234,6 +318,7 @@ async def async_market_data():
         logger.error(f"Market Data Listener Error: {e}")
 
 if __name__ == "__main__":
+    install_signal_handler()
     root = tk.Tk()
     app = CoinFxGUI(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""Local stand-in for the exchange endpoints CoinFx uses, for order-path load tests.
+
+    Coinbase REST  GET  /products/<id>/candles      POST /orders
+    Coinbase WS    subscribe -> subscriptions, ticker, level2 snapshot / l2update
+    OANDA v20      GET  /v3/accounts/<id>/pricing   POST /v3/accounts/<id>/orders
+
+Point the bot at it with COINBASE_API_URL, COINBASE_WS_URL and OANDA_API_URL.
+Response latency, injected 5xx errors and per-venue rate limits (429s) are
+configurable, so throttling can be exercised without touching a real venue:
+
+    python mock_exchange.py --port 8800 --ws-port 8801 --latency 0.02 --rate-limit 50
+"""
+
+import argparse
+import asyncio
+import calendar
+import collections
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+from config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PRODUCTS = {"BTC-USD": 43000.0, "ETH-USD": 2300.0, "LTC-USD": 70.0, "XRP-USD": 0.55, "ADA-USD": 0.5}
+DEFAULT_INSTRUMENTS = {"EUR_USD": 1.08, "GBP_USD": 1.27, "USD_JPY": 150.0}
+
+
+def _iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts)) + f".{int(ts % 1 * 1e6):06d}Z"
+
+
+def _parse_time(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return calendar.timegm(time.strptime(value[:19], "%Y-%m-%dT%H:%M:%S"))
+
+
+class TokenBucket:
+    """`rate` requests per second with bursts up to `burst`; a rate of 0 never throttles."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        if not self.rate:
+            return True
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as the real venues and the requests sessions use
+    disable_nagle_algorithm = True  # headers and body go out in separate writes; don't stall on delayed ACKs
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        exchange = self.server.exchange
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if len(parts) == 3 and parts[0] == "products" and parts[2] == "candles":
+            status, payload = exchange.candles(parts[1], query)
+        elif len(parts) == 4 and parts[:2] == ["v3", "accounts"] and parts[3] == "pricing":
+            status, payload = exchange.oanda_pricing(self.headers, query)
+        else:
+            status, payload = 404, {"message": "NotFound"}
+        self._send(status, payload)
+
+    def do_POST(self):
+        exchange = self.server.exchange
+        parts = urlparse(self.path).path.strip("/").split("/")
+        body = self._body()
+        if parts == ["orders"]:
+            status, payload = exchange.coinbase_order(self.headers, body)
+        elif len(parts) == 4 and parts[:2] == ["v3", "accounts"] and parts[3] == "orders":
+            status, payload = exchange.oanda_order(self.headers, parts[2], body)
+        else:
+            status, payload = 404, {"message": "NotFound"}
+        self._send(status, payload)
+
+
+class MockExchange:
+    """In-process Coinbase/OANDA stand-in with configurable latency, errors and rate limits.
+
+    REST runs on a threading HTTP server and the websocket feed on its own
+    event loop thread; `port=0` / `ws_port=0` pick free ports. `stats()`
+    counts accepted, throttled and failed requests per venue.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, ws_port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit=0.0, burst=None, products=None, instruments=DEFAULT_INSTRUMENTS, tick_interval=0.1,
+                 seed=None):
+        self.host = host
+        self.port = port
+        self.ws_port = ws_port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tick_interval = tick_interval
+        self.prices = dict(products or DEFAULT_PRODUCTS)
+        self.instruments = dict(instruments) if isinstance(instruments, dict) else dict.fromkeys(instruments, 1.0)
+        self.buckets = {venue: TokenBucket(rate_limit, burst) for venue in ("coinbase", "oanda")}
+        self.orders = collections.deque(maxlen=10_000)
+        self._base = dict(self.prices)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {venue: collections.Counter() for venue in ("coinbase", "oanda")}
+        self._ws_messages = 0
+        self._ws_clients = 0
+        self._sequence = itertools.count(1)
+        self._transaction = itertools.count(1)
+        self._http = None
+        self._loop = None
+        self._ws_stop = None
+        self._threads = []
+
+    # ✅ Lifecycle
+
+    def start(self):
+        self._http = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._http.daemon_threads = True
+        self._http.exchange = self
+        self.port = self._http.server_address[1]
+        http_thread = threading.Thread(target=self._http.serve_forever, name="mock-exchange-rest", daemon=True)
+        http_thread.start()
+        self._threads.append(http_thread)
+
+        if self.ws_port is not None:
+            ready = threading.Event()
+            ws_thread = threading.Thread(target=self._run_ws, args=(ready,), name="mock-exchange-ws", daemon=True)
+            ws_thread.start()
+            self._threads.append(ws_thread)
+            if not ready.wait(5.0):
+                raise RuntimeError("Mock exchange websocket server did not start.")
+        logger.info(f"Mock exchange listening on {self.rest_url} and {self.ws_url}")
+        return self
+
+    def stop(self):
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        if self._loop is not None and self._ws_stop is not None:
+            self._loop.call_soon_threadsafe(self._ws_stop.set)
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    @property
+    def rest_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.ws_port}" if self.ws_port is not None else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                **{venue: dict(counts) for venue, counts in self._stats.items()},
+                "ws_clients": self._ws_clients,
+                "ws_messages": self._ws_messages,
+            }
+
+    # ✅ Request gate: latency, rate limit, error injection
+
+    def _admit(self, venue):
+        """Returns None to serve the request, or (status, reason) to fail it."""
+        delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if not self.buckets[venue].allow():
+            self._count(venue, "throttled")
+            return 429, "Rate limit exceeded"
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self._count(venue, "errors")
+            return 500, "Internal server error"
+        return None
+
+    def _count(self, venue, outcome):
+        with self._lock:
+            self._stats[venue][outcome] += 1
+
+    def tick(self, product):
+        """Advance and return the mid price of `product` (a small random walk)."""
+        with self._lock:
+            price = self.prices[product] * math.exp(self._rng.gauss(0.0, 0.0005))
+            self.prices[product] = price
+        return price
+
+    # ✅ Coinbase REST
+
+    def candles(self, product, query):
+        if product not in self.prices:
+            return 404, {"message": "NotFound"}
+        rejected = self._admit("coinbase")
+        if rejected:
+            return rejected[0], {"message": rejected[1]}
+        granularity = int(query.get("granularity", 300))
+        end = _parse_time(query.get("end")) or time.time()
+        start = _parse_time(query.get("start")) or end - 300 * granularity
+        first = int(math.ceil(start / granularity)) * granularity
+        last = int(end // granularity) * granularity
+        times = list(range(last, first - 1, -granularity))[:300]  # newest first, at most 300 like the venue
+        base = self._base[product]
+        rows = []
+        for t in times:
+            # Deterministic in t, so repeated or overlapping range requests agree.
+            rng = random.Random(zlib.crc32(f"{product}:{t}".encode()))
+            close = base * (1.0 + 0.03 * math.sin(t / 86400 * 2 * math.pi) + 0.01 * math.sin(t / 3600 * 2 * math.pi)
+                            + rng.gauss(0.0, 0.002))
+            open_ = close * (1.0 + rng.gauss(0.0, 0.001))
+            rows.append([t, min(open_, close) * 0.999, max(open_, close) * 1.001, open_, close,
+                         round(rng.uniform(1, 50), 4)])
+        self._count("coinbase", "accepted")
+        return 200, rows
+
+    def coinbase_order(self, headers, body):
+        if not headers.get("CB-ACCESS-KEY") or not headers.get("CB-ACCESS-SIGN"):
+            self._count("coinbase", "unauthorized")
+            return 401, {"message": "invalid signature"}
+        rejected = self._admit("coinbase")
+        if rejected:
+            return rejected[0], {"message": rejected[1]}
+        if not isinstance(body, dict):
+            self._count("coinbase", "invalid")
+            return 400, {"message": "Invalid JSON"}
+        product, side = body.get("product_id"), body.get("side")
+        if product not in self.prices or side not in ("buy", "sell") or body.get("type", "limit") != "market" \
+                or ("funds" in body) == ("size" in body):
+            self._count("coinbase", "invalid")
+            return 400, {"message": "Invalid order"}
+        now = time.time()
+        order = {
+            "id": str(uuid.uuid4()), "product_id": product, "side": side, "type": "market",
+            "funds": body.get("funds"), "size": body.get("size"), "post_only": False, "stp": "dc",
+            "created_at": _iso(now), "fill_fees": "0", "filled_size": "0", "executed_value": "0",
+            "status": "pending", "settled": False,
+        }
+        order = {k: v for k, v in order.items() if v is not None}
+        self.orders.append(("coinbase", now, order))
+        self._count("coinbase", "accepted")
+        return 200, order
+
+    # ✅ OANDA v20
+
+    def oanda_pricing(self, headers, query):
+        if not (headers.get("Authorization") or "").startswith("Bearer "):
+            self._count("oanda", "unauthorized")
+            return 401, {"errorMessage": "Insufficient authorization to perform request."}
+        rejected = self._admit("oanda")
+        if rejected:
+            return rejected[0], {"errorMessage": rejected[1]}
+        names = [n for n in query.get("instruments", "").split(",") if n]
+        if not names or any(n not in self.instruments for n in names):
+            self._count("oanda", "invalid")
+            return 400, {"errorMessage": "Invalid value specified for 'instruments'"}
+        now = _iso(time.time())
+        prices = []
+        for name in names:
+            mid = self.instruments[name]
+            bid, ask = f"{mid * 0.99995:.5f}", f"{mid * 1.00005:.5f}"
+            prices.append({"type": "PRICE", "instrument": name, "time": now, "tradeable": True,
+                           "bids": [{"price": bid, "liquidity": 1000000}], "asks": [{"price": ask, "liquidity": 1000000}],
+                           "closeoutBid": bid, "closeoutAsk": ask})
+        self._count("oanda", "accepted")
+        return 200, {"prices": prices, "time": now}
+
+    def oanda_order(self, headers, account_id, body):
+        if not (headers.get("Authorization") or "").startswith("Bearer "):
+            self._count("oanda", "unauthorized")
+            return 401, {"errorMessage": "Insufficient authorization to perform request."}
+        rejected = self._admit("oanda")
+        if rejected:
+            return rejected[0], {"errorMessage": rejected[1]}
+        order = (body or {}).get("order") if isinstance(body, dict) else None
+        try:
+            units = int(order["units"])
+            instrument = order["instrument"]
+        except (TypeError, KeyError, ValueError):
+            units, instrument = 0, None
+        if not units or instrument not in self.instruments or order.get("type") != "MARKET":
+            self._count("oanda", "invalid")
+            return 400, {"errorMessage": "Invalid value specified for 'order'", "errorCode": "INVALID_ORDER"}
+        now = _iso(time.time())
+        with self._lock:
+            create_id, fill_id = str(next(self._transaction)), str(next(self._transaction))
+        create = {"id": create_id, "time": now, "type": "MARKET_ORDER", "accountID": account_id,
+                  "instrument": instrument, "units": str(units), "timeInForce": "FOK", "positionFill": "DEFAULT",
+                  "reason": "CLIENT_ORDER"}
+        fill = {"id": fill_id, "time": now, "type": "ORDER_FILL", "accountID": account_id, "orderID": create_id,
+                "instrument": instrument, "units": str(units), "price": f"{self.instruments[instrument]:.5f}",
+                "reason": "MARKET_ORDER"}
+        self.orders.append(("oanda", time.time(), create))
+        self._count("oanda", "accepted")
+        return 201, {"orderCreateTransaction": create, "orderFillTransaction": fill,
+                     "relatedTransactionIDs": [create_id, fill_id], "lastTransactionID": fill_id}
+
+    # ✅ Coinbase websocket feed
+
+    def _run_ws(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        async def serve():
+            self._ws_stop = asyncio.Event()
+            async with websockets.serve(self._ws_client, self.host, self.ws_port) as server:
+                self.ws_port = next(iter(server.sockets)).getsockname()[1]
+                ready.set()
+                await self._ws_stop.wait()
+
+        self._loop.run_until_complete(serve())
+        self._loop.close()
+
+    async def _ws_client(self, ws, path=None):
+        with self._lock:
+            self._ws_clients += 1
+        try:
+            message = json.loads(await ws.recv())
+            if message.get("type") != "subscribe":
+                await ws.send(json.dumps({"type": "error", "message": "Failed to subscribe"}))
+                return
+            channels = {c["name"]: [p for p in c.get("product_ids", []) if p in self.prices]
+                        for c in message.get("channels", [])}
+            await self._ws_send(ws, {"type": "subscriptions",
+                                     "channels": [{"name": n, "product_ids": p} for n, p in channels.items()]})
+            for product in channels.get("level2", []):
+                await self._ws_send(ws, self._snapshot(product))
+            products = sorted(set(channels.get("ticker", [])) | set(channels.get("level2", [])))
+            while products:
+                for product in products:
+                    price = self.tick(product)
+                    if product in channels.get("ticker", []):
+                        await self._ws_send(ws, {
+                            "type": "ticker", "sequence": next(self._sequence), "product_id": product,
+                            "price": f"{price:.8g}", "last_size": f"{self._rng.uniform(0.001, 0.5):.8f}",
+                            "side": self._rng.choice(("buy", "sell")), "time": _iso(time.time()),
+                        })
+                    if product in channels.get("level2", []):
+                        side = self._rng.choice(("buy", "sell"))
+                        level = price * (1 - 0.0005 if side == "buy" else 1 + 0.0005)
+                        await self._ws_send(ws, {
+                            "type": "l2update", "product_id": product, "time": _iso(time.time()),
+                            "changes": [[side, f"{level:.8g}", f"{self._rng.uniform(0.0, 2.0):.8f}"]],
+                        })
+                await asyncio.sleep(self.tick_interval)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            with self._lock:
+                self._ws_clients -= 1
+
+    async def _ws_send(self, ws, payload):
+        await ws.send(json.dumps(payload))
+        with self._lock:
+            self._ws_messages += 1
+
+    def _snapshot(self, product, depth=10):
+        mid = self.prices[product]
+        bids = [[f"{mid * (1 - 0.0005 * (i + 1)):.8g}", f"{self._rng.uniform(0.1, 5):.8f}"] for i in range(depth)]
+        asks = [[f"{mid * (1 + 0.0005 * (i + 1)):.8g}", f"{self._rng.uniform(0.1, 5):.8f}"] for i in range(depth)]
+        return {"type": "snapshot", "product_id": product, "bids": bids, "asks": asks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800, help="REST port (Coinbase and OANDA)")
+    parser.add_argument("--ws-port", type=int, default=8801, help="Coinbase websocket feed port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every REST response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/s per venue before 429s (0 = off)")
+    parser.add_argument("--burst", type=float, default=None, help="Token bucket size (defaults to the rate)")
+    parser.add_argument("--tick-interval", type=float, default=0.1, help="Seconds between websocket updates")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    exchange = MockExchange(args.host, args.port, args.ws_port, args.latency, args.jitter, args.error_rate,
+                            args.rate_limit, args.burst, tick_interval=args.tick_interval, seed=args.seed).start()
+    print(f"COINBASE_API_URL={exchange.rest_url} COINBASE_WS_URL={exchange.ws_url} OANDA_API_URL={exchange.rest_url}")
+    try:
+        while True:
+            time.sleep(10)
+            print(json.dumps(exchange.stats()))
+    except KeyboardInterrupt:
+        exchange.stop()
+
+
+if __name__ == "__main__":
+    main()
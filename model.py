@@ -1,33 +1,190 @@
 import os
+import sys
 import time
 import threading
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout, LayerNormalization
-from tensorflow.keras.callbacks import EarlyStopping
 from config import TRADING_CONFIG, get_logger
-from data_handler import get_historical_data, preprocess_data, SCALER_FILE, data_buffer
-import pickle
+from data_handler import (get_historical_data, preprocess_data, latest_window, latest_row, register_tick_listener,
+                          SCALER_FILE, data_buffer)
+from drift import get_drift_monitor
+from journal import get_journal
+from scaler import load_scaler, model_fingerprint
+from inference import StackedLSTMRuntime, export_numpy_model, load_runtime
+from profiler import profiled
+from shadow import candidate_paths, discard_candidate, get_shadow, live_paths, model_files_lock, promote_candidate
 import random
 
-logger = get_logger()
+logger = get_logger(__name__)
+
+_pending_tf_seed = None
+
+def _tf():
+    """TensorFlow, imported and configured on first use so NumPy-only inference never loads it."""
+    global _pending_tf_seed
+    import tensorflow as tf
+    from tf_runtime import configure_tensorflow
+    configure_tensorflow()  # threading must be fixed before TensorFlow runs its first op
+    if _pending_tf_seed is not None:
+        tf.random.set_seed(_pending_tf_seed)
+        _pending_tf_seed = None
+    return tf
 
 def enable_dropout(model):
     """Enable dropout at inference (MC Dropout)."""
+    Dropout = _tf().keras.layers.Dropout
     for layer in model.layers:
         if isinstance(layer, Dropout):
             layer.trainable = True
     return model
-    def train_or_update_model():
-    """Train or update an LSTM model based on historical data."""
+
+def build_model(lookback, n_features, n_outputs=1):
+    """Builds the two-layer LSTM regressor used for price prediction, one output per horizon."""
+    _tf()
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout, LayerNormalization
+    from tf_runtime import output_dtype
+    return Sequential([
+        LSTM(64, return_sequences=True, input_shape=(lookback, n_features)),
+        LayerNormalization(),
+        Dropout(0.3),
+        LSTM(64),
+        Dense(32, activation="relu"),
+        Dense(n_outputs, dtype=output_dtype())
+    ])
+
+_keras_cache = {}
+_mc_rng = np.random.default_rng()
+
+def seed_mc(seed):
+    """Make MC-dropout sampling reproducible (used by offline replays)."""
+    global _mc_rng, _pending_tf_seed
+    _mc_rng = np.random.default_rng(seed)
+    _pending_tf_seed = seed  # applied when TensorFlow is (or already was) loaded
+    if "tensorflow" in sys.modules:
+        _tf()
+
+def _load_keras_model(path, version):
+    """Loads the Keras model once per saved version."""
+    if _keras_cache.get("version") != version:
+        _keras_cache["model"] = enable_dropout(_tf().keras.models.load_model(path))
+        _keras_cache["version"] = version
+    return _keras_cache["model"]
+
+def _horizons_for(n_outputs, saved=None):
+    """Horizon labels for a model's outputs: as saved with it, else HORIZONS when the width matches."""
+    if saved and len(saved) == n_outputs:
+        return list(saved)
+    configured = TRADING_CONFIG["HORIZONS"]
+    return list(configured) if len(configured) == n_outputs else list(range(1, n_outputs + 1))
+
+def _mc_samples(scaled, mc_runs, version):
+    """MC-dropout samples of the scaled close at every horizon, shape (mc_runs, n_horizons), and the horizons.
+
+    All runs go through the network as one batch, from the NumPy runtime
+    when it matches the model.
+    """
+    inference_file = TRADING_CONFIG["INFERENCE_FILE"]
+    if TRADING_CONFIG["INFERENCE_BACKEND"] == "numpy" and os.path.isfile(inference_file):
+        runtime = load_runtime(inference_file)
+        if runtime.model_version == version:
+            samples = runtime.predict_mc(scaled, mc_runs, rng=_mc_rng)[:, 0, :]
+            return samples, _horizons_for(samples.shape[1], runtime.horizons)
+        logger.warning("NumPy inference weights are stale. Falling back to Keras.")
+
+    model = _load_keras_model(TRADING_CONFIG["MODEL_FILE"], version)
+    samples = model(np.repeat(scaled, mc_runs, axis=0), training=True).numpy()
+    return samples, _horizons_for(samples.shape[1])
+
+# ✅ Shadow evaluation
+
+_stacked = {}
+
+def _shadow_candidate(version):
+    """The live and candidate NumPy runtimes and the candidate's scaler, or None when they can't be scored now."""
+    shadow = get_shadow()
+    paths = candidate_paths()
+    try:
+        live = load_runtime(TRADING_CONFIG["INFERENCE_FILE"])
+        candidate = load_runtime(paths["INFERENCE_FILE"])
+        candidate_scaler = load_scaler(paths["SCALER_FILE"])
+    except (OSError, ValueError) as e:
+        logger.warning(f"Shadow candidate could not be loaded; evaluation stopped: {e}")
+        shadow.stop()
+        return None
+    if live.model_version != version or candidate.model_version != shadow.candidate_version:
+        return None
+    return live, candidate, candidate_scaler
+
+def _shadow_mc_samples(scaled, candidate_scaled, mc_runs, live, candidate):
+    """MC samples from the live and candidate models, in one stacked pass when their architectures match."""
+    key = (live.model_version, candidate.model_version)
+    if _stacked.get("key") != key:
+        try:
+            _stacked["runtime"] = StackedLSTMRuntime([live, candidate])
+        except ValueError as e:
+            logger.warning(f"Candidate cannot share the live model's forward pass ({e}); scoring it separately.")
+            _stacked["runtime"] = None
+        _stacked["key"] = key
+    if _stacked["runtime"] is not None:
+        samples = _stacked["runtime"].predict_mc(np.stack([scaled, candidate_scaled]), mc_runs, rng=_mc_rng)
+        return samples[0, :, 0, :], samples[1, :, 0, :]
+    return (live.predict_mc(scaled, mc_runs, rng=_mc_rng)[:, 0, :],
+            candidate.predict_mc(candidate_scaled, mc_runs, rng=_mc_rng)[:, 0, :])
+
+def _apply_shadow_decision(shadow):
+    decision = shadow.decision()
+    if decision is None:
+        return
+    report = shadow.report()
+    summary = f"MAE {report['candidate']['mae']:.4%} vs live {report['live']['mae']:.4%}"
+    if decision == "promote":
+        promote_candidate()
+        logger.info(f"Candidate model {shadow.candidate_version} promoted ({summary}).")
+    else:
+        discard_candidate()
+        logger.info(f"Candidate model {shadow.candidate_version} rejected ({summary}).")
+    shadow.stop()
+
+def _has_live_model():
+    path = TRADING_CONFIG["MODEL_FILE"]
+    return os.path.isfile(path) and os.path.getsize(path) > 0
+
+# One training at a time, whichever path started it (schedule, GUI button, drift or mismatch).
+_training = threading.Lock()
+
+@profiled("train")
+def train_or_update_model(candidate=None):
+    """Train or update an LSTM model based on historical data.
+
+    With SHADOW_MODE on and a live model present, the new model is saved as
+    a candidate and only replaces the live one after winning in shadow.
+    Returns False without training when another training is in progress.
+    """
+    if not _training.acquire(blocking=False):
+        logger.info("Model training is already in progress. Retraining skipped.")
+        return False
     try:
-        df = get_historical_data("BTC")
+        _train(candidate)
+    finally:
+        _training.release()
+    return True
+
+def _train(candidate):
+    shadow = get_shadow()
+    if candidate is None:
+        candidate = TRADING_CONFIG["SHADOW_MODE"] and _has_live_model()
+    if candidate and shadow.active:
+        logger.info("A candidate model is still in shadow evaluation. Retraining skipped.")
+        return
+    paths = candidate_paths() if candidate else live_paths()
+    try:
+        # Live features are built from candles of the same width (data_handler.BarFeatureEngine).
+        df = get_historical_data("BTC", TRADING_CONFIG["HORIZON_STEP_SECONDS"])
         if df is None or df.empty:
             logger.warning("No valid historical data available. Skipping model training.")
             return
 
-        result = preprocess_data(df)
+        result = preprocess_data(df, save_scaler=False)
         if result is None or len(result) != 3:
             logger.warning("Preprocessed data invalid or incomplete. Training aborted.")
             return
@@ -37,72 +194,154 @@ def enable_dropout(model):
             logger.warning("Not enough training samples. Model training skipped.")
             return
 
-        model = Sequential([
-            LSTM(64, return_sequences=True, input_shape=(X_train.shape[1], X_train.shape[2])),
-            LayerNormalization(),
-            Dropout(0.3),
-            LSTM(64),
-            Dense(32, activation="relu"),
-            Dense(1)
-        ])
+        tf = _tf()
+        from tf_runtime import compile_options, describe, training_data
+        horizons = TRADING_CONFIG["HORIZONS"]
+        model = build_model(X_train.shape[1], X_train.shape[2], n_outputs=y_train.shape[1])
 
-        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=TRADING_CONFIG["LEARNING_RATE"]), loss="mse")
-        early_stop = EarlyStopping(monitor='loss', patience=5, restore_best_weights=True)
+        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=TRADING_CONFIG["LEARNING_RATE"]), loss="mse",
+                      **compile_options())
+        early_stop = tf.keras.callbacks.EarlyStopping(monitor='loss', patience=5, restore_best_weights=True)
 
-        model.fit(X_train, y_train,
+        x_fit, y_fit, fit_kwargs = training_data(X_train, y_train, TRADING_CONFIG["BATCH_SIZE"])
+        logger.info(f"Training on {X_train.shape[0]} windows for horizons {horizons} ({describe()}).")
+        model.fit(x_fit, y_fit,
                   epochs=TRADING_CONFIG["EPOCHS"],
-                  batch_size=TRADING_CONFIG["BATCH_SIZE"],
                   callbacks=[early_stop],
-                  verbose=0)
+                  verbose=0,
+                  **fit_kwargs)
 
-        model.save(TRADING_CONFIG["MODEL_FILE"], include_optimizer=False)
-        with open(SCALER_FILE, "wb") as f:
-            pickle.dump(scaler, f)
+        with model_files_lock:
+            model.save(paths["MODEL_FILE"], include_optimizer=False)
+            version = model_fingerprint(paths["MODEL_FILE"])
+            scaler.save(paths["SCALER_FILE"], model_version=version)
+            export_numpy_model(model, paths["INFERENCE_FILE"], model_version=version, horizons=horizons)
 
-        logger.info("Model training complete and saved.")
+        if candidate:
+            shadow.start(version)
+            logger.info("Model training complete; candidate saved for shadow evaluation.")
+        else:
+            logger.info("Model training complete and saved.")
 
     except Exception as e:
         logger.exception(f"Model training failed: {e}")
 
-def predict_price(auto_retrain_threshold: float = 0.12, mc_runs: int = 20):
-    """Predict price and return mean + confidence. Auto-retrain on high deviation."""
+# ✅ Background retraining (drift, model/scaler mismatch)
+
+_last_drift_retrain = float("-inf")
+
+def _observe_tick(product_id, price):
+    """Tick listener: score due forecasts and fold the newest input row into the drift statistics."""
+    if product_id not in (None, TRADING_CONFIG.get("LIVE_FEED_PRODUCTS", ["BTC-USD"])[0]):
+        return  # the model is trained on the primary product
+    monitor = get_drift_monitor()
+    monitor.on_price(price, time.time())
+    row = latest_row()
+    if row is not None:
+        monitor.observe_input(row)
+
+register_tick_listener(_observe_tick)
+
+def _retrain_in_background(reason, candidate=None):
+    """Start one background retrain, at most once per DRIFT_COOLDOWN seconds.
+
+    Nothing is started while any training is running; `candidate` is passed
+    to train_or_update_model (None follows SHADOW_MODE).
+    """
+    global _last_drift_retrain
+    now = time.monotonic()
+    if now - _last_drift_retrain < TRADING_CONFIG["DRIFT_COOLDOWN"] or _training.locked():
+        return False
+    _last_drift_retrain = now
+    logger.warning(f"{reason}. Retraining in the background.")
+    threading.Thread(target=train_or_update_model, kwargs={"candidate": candidate},
+                     name="model-retrain-drift", daemon=True).start()
+    return True
+
+@profiled("predict")
+def predict_price(retrain_on_drift: bool = True, mc_runs: int = 20):
+    """Predict price and return mean + confidence. Retrains in the background when the drift monitor alerts.
+
+    Returns ``{"price", "std", "horizons": {h: {"price", "std"}}}``; price and
+    std are for the shortest horizon, all in price units.
+    """
     try:
         if len(data_buffer) < TRADING_CONFIG["LOOKBACK"]:
             logger.warning("Insufficient recent data. Prediction skipped.")
             return None
 
-        if not os.path.isfile(TRADING_CONFIG["MODEL_FILE"]):
+        if not _has_live_model():
             logger.info("No model found. Initiating training sequence.")
             train_or_update_model()
 
-        if not (os.path.isfile(TRADING_CONFIG["MODEL_FILE"]) and os.path.isfile(SCALER_FILE)):
+        if not all(os.path.isfile(p) and os.path.getsize(p) > 0 for p in (TRADING_CONFIG["MODEL_FILE"], SCALER_FILE)):
             logger.error("Prediction aborted. Required model or scaler missing.")
             return None
 
-        model = load_model(TRADING_CONFIG["MODEL_FILE"])
-        with open(SCALER_FILE, "rb") as f:
-            scaler = pickle.load(f)
-
-        model = enable_dropout(model)
+        # Promotion and live training swap the files one by one; read a consistent set.
+        with model_files_lock:
+            version = model_fingerprint(TRADING_CONFIG["MODEL_FILE"])
+            scaler = load_scaler(SCALER_FILE)
+            if scaler.model_version and scaler.model_version != version:
+                logger.error("Prediction aborted. Scaler was saved for a different model version.",
+                             extra={"rate_key": "scaler_mismatch"})
+                # A mismatched pair never recovers by itself; retrain straight to the live files to rewrite both.
+                _retrain_in_background("Model and scaler are out of step", candidate=False)
+                return None
 
-        recent = np.array(data_buffer[-TRADING_CONFIG["LOOKBACK"]:]).reshape(-1, 1)
-        scaled = scaler.transform(recent).reshape(1, TRADING_CONFIG["LOOKBACK"], 1)
+            drift = get_drift_monitor()
+            drift.bind(scaler, version)
+            recent = latest_window(TRADING_CONFIG["LOOKBACK"])
+            if len(recent) < TRADING_CONFIG["LOOKBACK"]:
+                logger.warning("Not enough closed candles for the model's features. Prediction skipped.")
+                return None
+            scaled = scaler.transform(recent).reshape(1, TRADING_CONFIG["LOOKBACK"], recent.shape[1])
+            outside = scaler.out_of_range(recent)[0]
+            if outside > 0:
+                logger.warning("%.0f%% of the live window is outside the scaler's training range.", outside * 100,
+                               extra={"rate_key": "scaler_range"})
 
-        predictions = [model(scaled, training=True).numpy()[0][0] for _ in range(mc_runs)]
-        mean_pred = np.mean(predictions)
-        std_pred = np.std(predictions)
-        predicted_price = scaler.inverse_transform([[mean_pred]])[0][0]
+            shadow = get_shadow()
+            scored = _shadow_candidate(version) if shadow.active else None
+            if scored is not None:
+                live, candidate, candidate_scaler = scored
+                candidate_scaled = candidate_scaler.transform(recent).reshape(scaled.shape)
+                samples, candidate_samples = _shadow_mc_samples(scaled, candidate_scaled, mc_runs, live, candidate)
+                horizons = _horizons_for(samples.shape[1], live.horizons)
+            else:
+                samples, horizons = _mc_samples(scaled, mc_runs, version)
+        # The target is the close column, which is always the scaler's first feature.
+        prices = scaler.inverse_transform(samples, column=0)
+        means, stds = prices.mean(axis=0), prices.std(axis=0)
+        forecast = {h: {"price": float(m), "std": float(s)} for h, m, s in zip(horizons, means, stds)}
+        predicted_price, std_pred = float(means[0]), float(stds[0])
 
         last_known_price = float(recent[-1][0])
         delta = abs(predicted_price - last_known_price) / max(last_known_price, 1e-6)
+        now, step = time.time(), TRADING_CONFIG["HORIZON_STEP_SECONDS"]
 
-        logger.info(f"Predicted Price: {predicted_price:.2f} ± {std_pred:.4f}, Δ%: {delta*100:.2f}")
+        logger.info(f"Predicted Price: {predicted_price:.2f} ± {std_pred:.2f}, Δ%: {delta*100:.2f} "
+                    f"(" + ", ".join(f"{h}: {f['price']:.2f}" for h, f in forecast.items()) + ")")
+        get_journal().record_prediction("BTC-USD", last_known_price, predicted_price, std_pred)
 
-        if delta > auto_retrain_threshold:
-            logger.warning(f"Prediction deviation {delta:.2%} exceeds threshold. Retraining model.")
-            train_or_update_model()
+        if scored is not None:
+            # Both models are scored on the same windows so their rolling errors are comparable.
+            shadow.on_price(last_known_price, now)
+            shadow.record("live", predicted_price, now + horizons[0] * step)
+            candidate_horizon = _horizons_for(candidate_samples.shape[1], candidate.horizons)[0]
+            candidate_price = float(candidate_scaler.inverse_transform(candidate_samples[:, 0], column=0).mean())
+            shadow.record("candidate", candidate_price, now + candidate_horizon * step)
+            _apply_shadow_decision(shadow)
+
+        drift.on_price(last_known_price, now)
+        drift.record_prediction(predicted_price, now + horizons[0] * step)
+        reasons = drift.check()
+        if reasons:
+            logger.warning("Model drift: %s", "; ".join(reasons), extra={"rate_key": "model_drift"})
+            if retrain_on_drift:
+                _retrain_in_background(f"Drift detected ({'; '.join(reasons)})")
 
-        return predicted_price
+        return {"price": predicted_price, "std": std_pred, "horizons": forecast}
 
     except Exception as e:
         logger.exception(f"Price prediction failed: {e}")
@@ -115,7 +354,7 @@ def schedule_retrain(interval_minutes=30):
             train_or_update_model()
             time.sleep(interval_minutes * 60)
 
-    t = threading.Thread(target=loop, daemon=True)
+    t = threading.Thread(target=loop, name="model-retrain", daemon=True)
     t.start()
 
 
@@ -131,5 +370,5 @@ def stream_predict_on_update(poll_interval=10):
                 predict_price()
             time.sleep(poll_interval)
 
-    t = threading.Thread(target=loop, daemon=True)
+    t = threading.Thread(target=loop, name="predict-stream", daemon=True)
     t.start()
\ No newline at end of file
@@ -0,0 +1,197 @@
+import math
+import threading
+from bisect import bisect_left, insort
+from config import get_logger
+
+logger = get_logger(__name__)
+
+
+class _BookSide:
+    """Price levels for one side, kept in a sorted key list plus a size dict.
+
+    Keys are prices for asks and negated prices for bids, so index 0 is always
+    the best level. Lookups are a binary search; inserting or removing a level
+    shifts the list tail, which for books of a few thousand levels is a small
+    memmove rather than a Python-level loop.
+    """
+
+    __slots__ = ("sign", "keys", "sizes")
+
+    def __init__(self, sign):
+        self.sign = sign
+        self.keys = []
+        self.sizes = {}
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+
+    def set(self, price, size):
+        key = self.sign * price
+        if size <= 0:
+            if self.sizes.pop(key, None) is not None:
+                del self.keys[bisect_left(self.keys, key)]
+            return
+        if key not in self.sizes:
+            insort(self.keys, key)
+        self.sizes[key] = size
+
+    def best(self):
+        if not self.keys:
+            return None
+        key = self.keys[0]
+        return self.sign * key, self.sizes[key]
+
+    def levels(self, n=None):
+        keys = self.keys if n is None else self.keys[:n]
+        return [(self.sign * k, self.sizes[k]) for k in keys]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class OrderBook:
+    """Local level-2 book for one product.
+
+    The feed thread writes while trading threads read, so every read and
+    write takes the book's lock; a whole l2update message is applied under
+    one acquisition and readers never see half of it.
+    """
+
+    def __init__(self, product_id):
+        self.product_id = product_id
+        self.bids = _BookSide(-1)
+        self.asks = _BookSide(1)
+        self.synced = False
+        self.last_update = None
+        self._lock = threading.Lock()
+
+    def apply_snapshot(self, bids, asks):
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, size in bids:
+                self.bids.set(float(price), float(size))
+            for price, size in asks:
+                self.asks.set(float(price), float(size))
+            self.synced = True
+
+    def apply_change(self, side, price, size):
+        """Apply one Coinbase l2update change; side is "buy" (bid) or "sell" (ask)."""
+        self.apply_changes([(side, price, size)])
+
+    def apply_changes(self, changes, time=None):
+        """Apply the changes of one l2update message atomically."""
+        with self._lock:
+            for side, price, size in changes:
+                (self.bids if side == "buy" else self.asks).set(float(price), float(size))
+            if time is not None:
+                self.last_update = time
+
+    def best_bid(self):
+        with self._lock:
+            return self.bids.best()
+
+    def best_ask(self):
+        with self._lock:
+            return self.asks.best()
+
+    def mid(self):
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2.0
+
+    def spread(self):
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def depth(self, levels=10):
+        """Top `levels` price levels per side, best first."""
+        with self._lock:
+            return {"bids": self.bids.levels(levels), "asks": self.asks.levels(levels)}
+
+    def vwap_for_size(self, side, size=None, funds=None):
+        """Average fill price, filled base size and unfilled remainder for a market order walking the book.
+
+        A buy consumes asks, a sell consumes bids. Give either a base `size` or
+        quote `funds` (Coinbase market orders by funds); the remainder is in
+        the same unit. Returns (None, 0.0, remainder) when the book side is empty.
+        """
+        if (size is None) == (funds is None):
+            raise ValueError("Specify exactly one of size or funds.")
+        with self._lock:
+            return self._walk(side, size, funds)
+
+    def _walk(self, side, size, funds):
+        book_side = self.asks if side == "buy" else self.bids
+        remaining_size, remaining_funds = size, funds
+        filled = cost = 0.0
+        for key in book_side.keys:
+            price = book_side.sign * key
+            available = book_side.sizes[key]
+            if remaining_size is not None:
+                take = min(available, remaining_size)
+                remaining_size -= take
+            else:
+                take = min(available, remaining_funds / price)
+                remaining_funds -= take * price
+            filled += take
+            cost += take * price
+            if (remaining_size is not None and remaining_size <= 1e-12) or (remaining_funds is not None and remaining_funds <= 1e-9):
+                break
+        remaining = remaining_size if remaining_size is not None else remaining_funds
+        unfilled = remaining if remaining > (1e-12 if size is not None else 1e-9) else 0.0
+        if filled == 0:
+            return None, 0.0, unfilled
+        return cost / filled, filled, unfilled
+
+    def slippage_bps(self, side, size=None, funds=None):
+        """Expected slippage versus the touch, in basis points (positive = worse).
+
+        An order larger than the visible depth has no bounded estimate and
+        reads as infinite slippage.
+        """
+        if (size is None) == (funds is None):
+            raise ValueError("Specify exactly one of size or funds.")
+        with self._lock:
+            touch = self.asks.best() if side == "buy" else self.bids.best()
+            vwap, filled, unfilled = self._walk(side, size, funds)
+        if touch is None or vwap is None:
+            return None
+        if unfilled:
+            return math.inf
+        sign = 1 if side == "buy" else -1
+        return sign * (vwap - touch[0]) / touch[0] * 1e4
+
+
+class OrderBookManager:
+    """Routes Coinbase `level2` channel messages to per-product books."""
+
+    def __init__(self):
+        self.books = {}
+
+    def get(self, product_id):
+        return self.books.get(product_id)
+
+    def handle(self, message):
+        """Apply a snapshot/l2update message; returns False for other message types."""
+        kind = message.get("type")
+        if kind == "snapshot":
+            product_id = message["product_id"]
+            book = self.books.setdefault(product_id, OrderBook(product_id))
+            book.apply_snapshot(message.get("bids", []), message.get("asks", []))
+            return True
+        if kind == "l2update":
+            book = self.books.get(message["product_id"])
+            if book is None or not book.synced:
+                logger.warning("l2update for %s before snapshot; ignored.", message.get("product_id"),
+                               extra={"rate_key": "l2_unsynced"})
+                return True
+            book.apply_changes(message.get("changes", []), message.get("time"))
+            return True
+        return False
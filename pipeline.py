@@ -0,0 +1,330 @@
+"""Multi-process topology: feed, inference and execution each in their own process.
+
+    feed ──ticks──▶ TickRing (shared memory) ──▶ inference ──signals──▶ execution
+      │                                 └──────────────────────────▶ (risk ticks)
+      └──level2──────────────────────────────────────────────────▶ (order books)
+    GUI (GA strategy) ──signals──────────────────────────────────▶ execution
+
+Enabled with PIPELINE_MODE=process. Ticks cross process boundaries through a
+single-writer shared-memory ring, so the feed never blocks on a consumer and
+a retrain or GA run in another process cannot delay websocket reads. Signals,
+level-2 book messages and order events use ordinary queues. Every order goes
+through the execution process, so there is one position book.
+"""
+
+import atexit
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from config import TRADING_CONFIG, get_logger
+
+logger = get_logger(__name__)
+
+_HEADER = 2  # [write sequence, capacity]
+_FIELDS = 4  # ts, product index, price, size
+
+
+class TickRing:
+    """Single-writer, multi-reader ring of (ts, product, price, size) float64 records.
+
+    The writer stores a record, then publishes it by bumping the sequence
+    counter; readers track their own cursor. The slot of the oldest record is
+    the next one written, so only the newest `capacity - 1` records are safe
+    to read. A reader that falls further behind skips ahead and reports the
+    gap instead of blocking the writer.
+    """
+
+    def __init__(self, name=None, capacity=None, create=False):
+        if create:
+            capacity = capacity or TRADING_CONFIG["PIPELINE_RING_CAPACITY"]
+            size = 8 * (_HEADER + capacity * _FIELDS)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self._header = np.ndarray((_HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        if create:
+            self._header[:] = (0, capacity)
+        self.capacity = int(self._header[1])
+        self._data = np.ndarray((self.capacity, _FIELDS), dtype=np.float64, buffer=self.shm.buf, offset=8 * _HEADER)
+        self.owner = create
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def head(self):
+        """Sequence number of the next record to be written."""
+        return int(self._header[0])
+
+    def oldest(self):
+        """Cursor of the oldest record that is safe to read."""
+        return max(0, self.head() - self.capacity + 1)
+
+    def write(self, ts, product, price, size=0.0):
+        seq = int(self._header[0])
+        self._data[seq % self.capacity] = (ts, product, price, size)
+        self._header[0] = seq + 1
+
+    def read(self, cursor, max_records=None):
+        """Returns (records, new_cursor, dropped) for everything published since `cursor`."""
+        head = int(self._header[0])
+        dropped = 0
+        if head - cursor >= self.capacity:
+            dropped = head - self.capacity + 1 - cursor
+            cursor = head - self.capacity + 1
+        if max_records is not None:
+            head = min(head, cursor + max_records)
+        if head <= cursor:
+            return np.empty((0, _FIELDS)), cursor, dropped
+        records = self._data[np.arange(cursor, head) % self.capacity]
+        # The writer may have lapped us while copying; drop what it overwrote or
+        # is overwriting (the slot of the unpublished record at the head).
+        overwritten = int(self._header[0]) + 1 - self.capacity - cursor
+        if overwritten > 0:
+            records = records[overwritten:]
+            dropped += overwritten
+        return records, head, dropped
+
+    def close(self):
+        del self._header, self._data
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ✅ Stage entry points (run in child processes)
+
+def feed_process(ring_name, products, stop, book_updates=None):
+    """Decode the Coinbase feed, publish ticker prices to the ring and forward level-2 messages."""
+    from data_handler import start_live_data_listener
+    from orderbook import OrderBookManager
+    ring = TickRing(ring_name)
+    index = {product: i for i, product in enumerate(products)}
+    books, resync = OrderBookManager(), set()
+
+    def publish(message):
+        if book_updates is not None and books.handle(message):
+            forward_book_message(book_updates, books, message, resync)
+            return
+        if "price" not in message:
+            return
+        try:
+            ring.write(time.time(), index.get(message.get("product_id"), 0),
+                       float(message["price"]), float(message.get("last_size") or 0.0))
+        except (TypeError, ValueError):
+            logger.warning("Ignored malformed price data: %s", message, extra={"rate_key": "malformed_tick"})
+
+    start_live_data_listener(handler=publish, warm=False)  # features are warmed where they are used
+    stop.wait()  # only a finished replay returns; don't let the supervisor replay it again
+
+
+def forward_book_message(book_updates, books, message, resync):
+    """Queue one level-2 message for the execution process without blocking the feed.
+
+    `books` is the feed's own copy of the books, already updated with
+    `message`. When a message is dropped the product is marked in `resync`
+    and its next message is replaced by a full snapshot of the feed's book,
+    so the execution book never silently diverges.
+    """
+    product = message.get("product_id")
+    if product in resync:
+        book = books.get(product)
+        if book is None or not book.synced:
+            return
+        depth = book.depth(levels=None)
+        message = {"type": "snapshot", "product_id": product, "bids": depth["bids"], "asks": depth["asks"]}
+    try:
+        book_updates.put_nowait(message)
+        resync.discard(product)
+    except queue.Full:
+        resync.add(product)
+        logger.warning(f"Book update queue full; {product} will be resent as a snapshot.",
+                       extra={"rate_key": "book_queue_full"})
+
+
+def inference_process(ring_name, products, signals, stop, predict_interval):
+    """Rebuild the live buffers from the ring, predict and emit trade signals."""
+    import data_handler
+    import model
+    ring = TickRing(ring_name)
+    if data_handler._uses_features() and not TRADING_CONFIG["FEED_REPLAY_PATH"]:
+        data_handler.warm_live_features([products[0]])
+    cursor = ring.oldest()  # a restarted process catches up from what the ring still holds
+    model.schedule_retrain(interval_minutes=30)
+    last_predict, fresh = 0.0, False
+
+    while not stop.is_set():
+        records, cursor, dropped = ring.read(cursor)
+        if dropped:
+            logger.warning(f"Inference fell behind the tick ring; {dropped} ticks skipped.")
+        for ts, product, price, size in records:
+            if int(product) == 0:  # the model is trained on the primary product
+                data_handler.handle_feed_message({"product_id": products[0], "price": price, "last_size": size,
+                                                  "time": ts})
+                fresh = True
+        if fresh and time.monotonic() - last_predict >= predict_interval:
+            last_predict, fresh = time.monotonic(), False
+            prediction = model.predict_price()
+            if prediction is not None:
+                predicted = prediction["price"] if isinstance(prediction, dict) else prediction
+                last = data_handler.data_buffer[-1]
+                try:
+                    signals.put_nowait({"product_id": products[0], "signal": 1 if predicted > last else 0,
+                                        "price": last, "predicted": predicted, "ts": time.time()})
+                except queue.Full:
+                    logger.warning("Signal queue full; prediction dropped.")
+        if not len(records):
+            stop.wait(0.05)
+
+
+def execution_process(ring_name, products, signals, events, trading, stop, book_updates=None):
+    """Run risk checks on every tick and place orders for signals while trading is on.
+
+    With LIVE_FEED_LEVEL2 the feed forwards book messages here, so orders
+    pass the same slippage guard as in thread mode.
+    """
+    from genetic_trading import APIManager
+    from orderbook import OrderBookManager
+    ring = TickRing(ring_name)
+    cursor = ring.head()
+    books = OrderBookManager() if book_updates is not None else None
+    api_manager = APIManager(order_books=books)
+
+    while not stop.is_set():
+        records, cursor, _ = ring.read(cursor)
+        for _, product, price, _ in records:
+            api_manager.risk_engine.on_tick(products[int(product)], price)
+        while books is not None:
+            try:
+                books.handle(book_updates.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            message = signals.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        _post(events, "signal", message)
+        if trading.is_set():
+            api_manager.execute_trade(message["product_id"], message["signal"], "coinbase")
+            _post(events, "order", message)
+
+
+def _post(events, kind, payload):
+    try:
+        events.put_nowait((kind, payload))
+    except queue.Full:
+        pass  # the GUI is not draining; events are informational only
+
+
+# ✅ Supervisor
+
+class PipelineSupervisor:
+    """Starts the stage processes and restarts any that exit, with exponential backoff.
+
+    `stages` maps a name to ``(target, args)`` and defaults to the feed,
+    inference and execution processes. Processes use the "spawn" start method
+    so TensorFlow and the websocket client are never forked mid-state.
+    """
+
+    def __init__(self, products=None, capacity=None, predict_interval=None, stages=None,
+                 max_backoff=30.0, stable_after=60.0):
+        self.ctx = mp.get_context("spawn")
+        self.products = list(products or TRADING_CONFIG.get("LIVE_FEED_PRODUCTS", ["BTC-USD"]))
+        self.ring = TickRing(capacity=capacity, create=True)
+        self.signals = self.ctx.Queue(maxsize=1000)
+        self.events = self.ctx.Queue(maxsize=1000)
+        self.book_updates = self.ctx.Queue(maxsize=10000) if TRADING_CONFIG["LIVE_FEED_LEVEL2"] else None
+        self.trading = self.ctx.Event()
+        self.stop_event = self.ctx.Event()
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        interval = predict_interval or TRADING_CONFIG["PIPELINE_PREDICT_INTERVAL"]
+        self.stages = stages if stages is not None else {
+            "feed": (feed_process, (self.ring.name, self.products, self.stop_event, self.book_updates)),
+            "inference": (inference_process, (self.ring.name, self.products, self.signals, self.stop_event, interval)),
+            "execution": (execution_process, (self.ring.name, self.products, self.signals, self.events,
+                                              self.trading, self.stop_event, self.book_updates)),
+        }
+        self.processes = {}
+        self.restarts = {name: 0 for name in self.stages}
+        self._started_at = {}
+        self._restart_at = {}
+        self._stopping = threading.Event()
+        self._monitor = None
+
+    def start(self):
+        for name in self.stages:
+            self._spawn(name)
+        self._monitor = threading.Thread(target=self._watch, name="pipeline-supervisor", daemon=True)
+        self._monitor.start()
+        atexit.register(self.stop)
+        logger.info(f"Pipeline started: {', '.join(f'{n}={p.pid}' for n, p in self.processes.items())}")
+
+    def _spawn(self, name):
+        target, args = self.stages[name]
+        process = self.ctx.Process(target=target, args=args, name=f"coinfx-{name}", daemon=True)
+        process.start()
+        self.processes[name] = process
+        self._started_at[name] = time.monotonic()
+
+    def _watch(self):
+        while not self._stopping.wait(0.5):
+            now = time.monotonic()
+            for name, process in list(self.processes.items()):
+                if process.is_alive():
+                    if now - self._started_at[name] > self.stable_after:
+                        self.restarts[name] = 0  # a long healthy run resets the backoff
+                    continue
+                if name not in self._restart_at:
+                    delay = min(self.max_backoff, 2 ** self.restarts[name] - 1)
+                    logger.error(f"Pipeline stage {name} exited with code {process.exitcode}; "
+                                 f"restarting in {delay:.0f}s.")
+                    self._restart_at[name] = now + delay
+                elif now >= self._restart_at[name]:
+                    del self._restart_at[name]
+                    self.restarts[name] += 1
+                    self._spawn(name)
+
+    def set_trading(self, enabled):
+        """Allow or block order placement in the execution process."""
+        if enabled:
+            self.trading.set()
+        else:
+            self.trading.clear()
+
+    def submit_signal(self, product_id, signal, **extra):
+        """Queue a signal from outside the pipeline (e.g. the GA strategy) for the execution process.
+
+        Returns False when the queue is full and the signal was dropped.
+        """
+        try:
+            self.signals.put_nowait({"product_id": product_id, "signal": signal, "ts": time.time(), **extra})
+            return True
+        except queue.Full:
+            logger.warning(f"Signal queue full; {product_id} signal dropped.")
+            return False
+
+    def status(self):
+        return {
+            "stages": {name: {"pid": p.pid, "alive": p.is_alive(), "restarts": self.restarts[name]}
+                       for name, p in self.processes.items()},
+            "ticks": self.ring.head(),
+            "trading": self.trading.is_set(),
+        }
+
+    def stop(self, timeout=5.0):
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()  # the feed stage blocks on the socket and is never cooperative
+                process.join(1.0)
+        self.ring.close()
+        logger.info("Pipeline stopped.")
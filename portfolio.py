@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from config import RISK_MANAGEMENT, TRADING_CONFIG, get_logger
+from data_handler import get_historical_data
+from genetic_trading import RULE_GENES, decode_rule, rule_positions
+from indicators import ema, rsi
+
+logger = get_logger(__name__)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600  # crypto trades around the clock
+_LOAD_WORKERS = 4  # concurrent candle fetches; more only trips the exchange's rate limits
+
+
+def load_close_matrix(assets=None, granularity=300, start=None, end=None):
+    """Closes for every asset on one time axis, as a (time x asset) frame.
+
+    Candles are fetched concurrently through the candle cache. A bar missing
+    for one asset (no trades) carries its last close forward; bars before
+    every asset has traded are dropped. Assets that fail to load are skipped.
+    """
+    assets = assets or TRADING_CONFIG["PORTFOLIO_ASSETS"]
+    if not assets:
+        logger.warning("No portfolio assets configured.")
+        return None
+    with ThreadPoolExecutor(max_workers=min(len(assets), _LOAD_WORKERS), thread_name_prefix="portfolio-load") as pool:
+        frames = list(pool.map(lambda a: get_historical_data(a.split("-")[0], granularity, start=start, end=end),
+                               assets))
+
+    columns = {}
+    for asset, df in zip(assets, frames):
+        if df is None or df.empty:
+            logger.warning(f"No candles for {asset}; leaving it out of the portfolio.")
+            continue
+        df = df.drop_duplicates("time", keep="last")
+        columns[asset] = pd.to_numeric(df.set_index("time")["close"], errors="coerce")
+    if not columns:
+        return None
+    return pd.DataFrame(columns).sort_index().ffill().dropna()
+
+
+def curve_metrics(equity, granularity=300):
+    """Total return, annualized Sharpe and max drawdown of one curve or of each column of a matrix."""
+    equity = np.asarray(equity, dtype=float)
+    returns = equity[1:] / equity[:-1] - 1.0
+    std = returns.std(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=0) / std, 0.0) * np.sqrt(SECONDS_PER_YEAR / granularity)
+    drawdown = 1.0 - equity / np.maximum.accumulate(equity, axis=0)
+    return {
+        "total_return": equity[-1] / equity[0] - 1.0,
+        "sharpe": sharpe,
+        "max_drawdown": drawdown.max(axis=0),
+    }
+
+
+class PortfolioBacktest:
+    """Backtests a rule on every asset at once over a (time x asset) close matrix.
+
+    Indicators, signals, sizing, fees and equity are all array operations
+    over the whole matrix, so five assets cost about as much as one. Each bar
+    the assets the rule is long are ranked by trend strength (fast EMA over
+    slow EMA); at most `max_concurrent_trades` of them are held, each at
+    `max_position_size` of equity (capped at 1 / max_concurrent_trades so the
+    book is never levered). Fees are charged on the equity traded whenever
+    target weights change. Positions taken at a bar's close earn the next
+    bar's return.
+    """
+
+    def __init__(self, closes, capital=None, max_position_size=None, max_concurrent_trades=None, fee_rate=None,
+                 granularity=300):
+        if isinstance(closes, pd.DataFrame):
+            self.assets, self.times = list(closes.columns), closes.index
+        else:
+            closes = np.asarray(closes, dtype=float)
+            closes = closes.reshape(-1, 1) if closes.ndim == 1 else closes
+            self.assets, self.times = [str(i) for i in range(closes.shape[1])], pd.RangeIndex(len(closes))
+        self.close = np.asarray(closes, dtype=float)
+        if len(self.close) < 2:
+            raise ValueError("Portfolio backtest needs at least two bars.")
+        self.capital = capital if capital is not None else RISK_MANAGEMENT["ACCOUNT_CAPITAL"]
+        self.max_position_size = max_position_size if max_position_size is not None else RISK_MANAGEMENT["MAX_POSITION_SIZE"]
+        self.max_concurrent_trades = max_concurrent_trades if max_concurrent_trades is not None else RISK_MANAGEMENT["MAX_CONCURRENT_TRADES"]
+        self.fee_rate = fee_rate if fee_rate is not None else TRADING_CONFIG["GA_FEE_RATE"]
+        self.granularity = granularity
+        self.returns = np.zeros_like(self.close)
+        self.returns[1:] = self.close[1:] / self.close[:-1] - 1.0
+
+    def weights(self, signal, strength):
+        """Target weight per bar and asset for the rule's long signals."""
+        slots = max(int(self.max_concurrent_trades), 1)
+        if slots < signal.shape[1]:
+            score = np.where(signal > 0, strength, -np.inf)
+            strongest = np.argsort(-score, axis=1, kind="stable")[:, :slots]
+            keep = np.zeros(signal.shape, dtype=bool)
+            np.put_along_axis(keep, strongest, True, axis=1)
+            signal = signal * keep
+        return signal * min(self.max_position_size, 1.0 / slots)
+
+    def _gains_and_fees(self, weights):
+        """Per-bar return earned and fee paid, as fractions of equity, by each column of `weights`."""
+        held = np.concatenate((np.zeros_like(weights[:1]), weights[:-1]))
+        traded = np.abs(np.diff(weights, axis=0, prepend=np.zeros_like(weights[:1])))
+        return held * self.returns, traded * self.fee_rate
+
+    def run(self, genes=None):
+        """Simulate the rule `genes` (RULE_GENES encoding; the middle of every range by default).
+
+        Returns a dict of time-indexed curves (portfolio equity, per-asset
+        equity, per-asset P&L contribution, weights) and their metrics.
+        Per-asset equity trades that asset alone with the whole account;
+        contributions split the portfolio's P&L and sum to it exactly.
+        """
+        p = decode_rule(genes if genes is not None else [0.5] * len(RULE_GENES))
+        close = self.close
+        fast, slow = ema(close, p["ema_fast"]), ema(close, p["ema_slow"])
+        signal = rule_positions(close, fast, slow, rsi(close, p["rsi_period"]), p)
+        weights = self.weights(signal, fast / slow - 1.0)
+
+        # Standalone: every asset is its own account, fully in when the rule is long.
+        gain, cost = self._gains_and_fees(signal.astype(float))
+        asset_equity = self.capital * np.cumprod((1.0 + gain) * (1.0 - cost), axis=0)
+
+        # Portfolio: one account across all assets.
+        gain, cost = self._gains_and_fees(weights)
+        gross = 1.0 + gain.sum(axis=1)
+        equity = self.capital * np.cumprod(gross * (1.0 - cost.sum(axis=1)))
+        start = np.concatenate(([self.capital], equity[:-1]))
+        contribution = np.cumsum(start[:, None] * (gain - gross[:, None] * cost), axis=0)
+
+        trades = np.count_nonzero(np.diff(weights, axis=0, prepend=np.zeros_like(weights[:1])), axis=0)
+        asset_metrics = curve_metrics(asset_equity, self.granularity)
+        return {
+            "params": p,
+            "equity": pd.Series(equity, index=self.times, name="portfolio"),
+            "asset_equity": pd.DataFrame(asset_equity, index=self.times, columns=self.assets),
+            "contribution": pd.DataFrame(contribution, index=self.times, columns=self.assets),
+            "weights": pd.DataFrame(weights, index=self.times, columns=self.assets),
+            "metrics": {
+                **{k: float(v) for k, v in curve_metrics(equity, self.granularity).items()},
+                "trades": int(trades.sum()),
+                "exposure": float(weights.sum(axis=1).mean()),
+            },
+            "asset_metrics": {
+                asset: {**{k: float(v[i]) for k, v in asset_metrics.items()},
+                        "pnl": float(contribution[-1, i]), "trades": int(trades[i])}
+                for i, asset in enumerate(self.assets)
+            },
+        }
+
+
+def run_portfolio_backtest(assets=None, granularity=300, genes=None, **kwargs):
+    """Load the aligned candles for `assets` and backtest them as one portfolio; None if nothing loaded."""
+    closes = load_close_matrix(assets, granularity)
+    if closes is None or len(closes) < 2:
+        logger.error("Portfolio backtest has no aligned market data.")
+        return None
+    result = PortfolioBacktest(closes, granularity=granularity, **kwargs).run(genes)
+    m = result["metrics"]
+    logger.info(f"Portfolio backtest over {len(closes)} bars x {closes.shape[1]} assets: "
+                f"return {m['total_return']:.2%}, Sharpe {m['sharpe']:.2f}, max drawdown {m['max_drawdown']:.2%}")
+    return result
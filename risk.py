@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import threading
+import time
+from config import RISK_MANAGEMENT, TRADING_CONFIG, get_logger
+
+logger = get_logger(__name__)
+
+
+class Position:
+    """Net position for one (venue, symbol), in quote-currency notional."""
+
+    __slots__ = ("venue", "symbol", "notional", "entry_price", "opened_at", "stop_price", "take_price", "seq", "closing")
+
+    def __init__(self, venue, symbol, notional, entry_price, opened_at, seq):
+        self.venue = venue
+        self.symbol = symbol
+        self.notional = notional
+        self.entry_price = entry_price
+        self.opened_at = opened_at
+        self.stop_price = None
+        self.take_price = None
+        self.seq = seq
+        self.closing = False
+
+    @property
+    def side(self):
+        return "long" if self.notional > 0 else "short"
+
+
+class RiskEngine:
+    """In-memory position book with constant-time pre-trade checks.
+
+    Stop-loss and take-profit levels live in per-symbol heaps ordered by the
+    price at which they fire, so a tick only inspects the heap tops: O(1)
+    when nothing triggers and O(log n) per triggered level. Entries for
+    positions that have since changed are discarded lazily on pop.
+    """
+
+    def __init__(self, capital=None, max_position_size=None, max_concurrent_trades=None, cooldown=None,
+                 stop_loss_percent=None, take_profit_percent=None, clock=time.time):
+        self.capital = capital if capital is not None else RISK_MANAGEMENT["ACCOUNT_CAPITAL"]
+        self.max_position_size = max_position_size if max_position_size is not None else RISK_MANAGEMENT["MAX_POSITION_SIZE"]
+        self.max_concurrent_trades = max_concurrent_trades if max_concurrent_trades is not None else RISK_MANAGEMENT["MAX_CONCURRENT_TRADES"]
+        self.cooldown = cooldown if cooldown is not None else RISK_MANAGEMENT["POSITION_COOLDOWN"]
+        self.stop_loss_percent = stop_loss_percent if stop_loss_percent is not None else TRADING_CONFIG["STOP_LOSS_PERCENT"]
+        self.take_profit_percent = take_profit_percent if take_profit_percent is not None else TRADING_CONFIG["TAKE_PROFIT_PERCENT"]
+        self.clock = clock
+
+        self.positions = {}
+        self.last_prices = {}
+        self._last_trade = {}
+        self._seq = itertools.count()
+        # Per symbol: heaps keyed so the next level to fire is always on top.
+        #   "long_stop":  fires when price <= level  -> max-heap (negated)
+        #   "long_take":  fires when price >= level  -> min-heap
+        #   "short_stop": fires when price >= level  -> min-heap
+        #   "short_take": fires when price <= level  -> max-heap (negated)
+        self._triggers = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def max_notional(self):
+        return self.max_position_size * self.capital
+
+    def on_trigger(self, callback):
+        """Register `callback(position, reason, price)` for stop-loss/take-profit hits."""
+        self._callbacks.append(callback)
+
+    # ✅ Pre-trade checks
+
+    def check_order(self, venue, symbol, side, notional):
+        """Returns (allowed, reason) for a prospective order; O(1)."""
+        key = (venue, symbol)
+        signed = notional if side == "buy" else -notional
+        now = self.clock()
+        with self._lock:
+            position = self.positions.get(key)
+            if position is not None and position.notional * signed < 0 and abs(signed) <= abs(position.notional) + 1e-9:
+                return True, "reduces position"
+
+            last = self._last_trade.get(key)
+            if last is not None and now - last < self.cooldown:
+                return False, f"cooldown active for {symbol} ({self.cooldown - (now - last):.0f}s left)"
+
+            if position is None and len(self.positions) >= self.max_concurrent_trades:
+                return False, f"max concurrent trades reached ({self.max_concurrent_trades})"
+
+            resulting = abs((position.notional if position else 0.0) + signed)
+            if resulting > self.max_notional + 1e-9:
+                return False, f"position {resulting:.2f} would exceed max size {self.max_notional:.2f}"
+
+        return True, "ok"
+
+    # ✅ Position book updates
+
+    def on_fill(self, venue, symbol, side, notional, price=None):
+        """Apply a fill to the book and re-arm stop/take levels."""
+        key = (venue, symbol)
+        signed = notional if side == "buy" else -notional
+        now = self.clock()
+        with self._lock:
+            self._last_trade[key] = now
+            position = self.positions.get(key)
+            if position is None:
+                position = Position(venue, symbol, signed, price, now, next(self._seq))
+                self.positions[key] = position
+            else:
+                new_notional = position.notional + signed
+                if abs(new_notional) < 1e-9:
+                    del self.positions[key]
+                    return None
+                if position.notional * new_notional < 0:
+                    # Flipped through zero: the remainder is a fresh position.
+                    position = Position(venue, symbol, new_notional, price, now, next(self._seq))
+                    self.positions[key] = position
+                else:
+                    if signed * position.notional > 0 and price and position.entry_price:
+                        position.entry_price = (position.entry_price * abs(position.notional) + price * abs(signed)) / abs(new_notional)
+                    position.notional = new_notional
+                    position.seq = next(self._seq)
+            position.closing = False
+            self._arm(position)
+            return position
+
+    def _arm(self, position):
+        if not position.entry_price:
+            position.stop_price = position.take_price = None
+            return
+        heaps = self._triggers.setdefault(position.symbol, {
+            "long_stop": [], "long_take": [], "short_stop": [], "short_take": [],
+        })
+        entry = (position.venue, position.symbol)
+        for name, heap in heaps.items():
+            if len(heap) > 64 and len(heap) > 4 * len(self.positions):
+                heaps[name] = heap = [item for item in heap if self._is_live(item)]
+                heapq.heapify(heap)
+        if position.side == "long":
+            position.stop_price = position.entry_price * (1 - self.stop_loss_percent)
+            position.take_price = position.entry_price * (1 + self.take_profit_percent)
+            heapq.heappush(heaps["long_stop"], (-position.stop_price, position.seq, entry))
+            heapq.heappush(heaps["long_take"], (position.take_price, position.seq, entry))
+        else:
+            position.stop_price = position.entry_price * (1 + self.stop_loss_percent)
+            position.take_price = position.entry_price * (1 - self.take_profit_percent)
+            heapq.heappush(heaps["short_stop"], (position.stop_price, position.seq, entry))
+            heapq.heappush(heaps["short_take"], (-position.take_price, position.seq, entry))
+
+    def _is_live(self, item):
+        position = self.positions.get(item[2])
+        return position is not None and position.seq == item[1]
+
+    def rearm(self, venue, symbol):
+        """Re-register levels for a position whose triggered exit did not go through."""
+        with self._lock:
+            position = self.positions.get((venue, symbol))
+            if position is not None:
+                position.closing = False
+                position.seq = next(self._seq)
+                self._arm(position)
+
+    # ✅ Tick-driven triggers
+
+    def on_tick(self, symbol, price):
+        """Record the latest price and fire any stop-loss/take-profit levels it crosses."""
+        fired = []
+        with self._lock:
+            # on_fill/rearm reshape the heaps under this lock, so they are only read here too.
+            self.last_prices[symbol] = price
+            heaps = self._triggers.get(symbol)
+            if heaps is None:
+                return []
+            for name, fires in (
+                ("long_stop", lambda top: -top >= price),
+                ("long_take", lambda top: top <= price),
+                ("short_stop", lambda top: top <= price),
+                ("short_take", lambda top: -top >= price),
+            ):
+                heap = heaps[name]
+                while heap and fires(heap[0][0]):
+                    _, seq, key = heapq.heappop(heap)
+                    position = self.positions.get(key)
+                    if position is None or position.seq != seq or position.closing:
+                        continue  # stale level from an older version of the position
+                    position.closing = True
+                    fired.append((position, "stop_loss" if name.endswith("stop") else "take_profit"))
+
+        for position, reason in fired:
+            logger.warning(f"{reason} triggered for {position.venue}:{position.symbol} at {price} "
+                           f"(entry {position.entry_price}, notional {position.notional:.2f})")
+            for callback in self._callbacks:
+                try:
+                    callback(position, reason, price)
+                except Exception as e:
+                    logger.error(f"Risk trigger callback failed: {e}")
+        return fired
+
+    def last_price(self, symbol):
+        return self.last_prices.get(symbol)
+
+    def exposure(self):
+        """Total absolute notional across open positions."""
+        with self._lock:
+            return sum(abs(p.notional) for p in self.positions.values())
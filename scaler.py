@@ -0,0 +1,178 @@
+import hashlib
+import os
+import threading
+import numpy as np
+
+SCALER_FORMAT_VERSION = 1
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_cached(path, loader):
+    """Returns `loader(path)`, calling it again only when the file's mtime or size changes."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        cached = _cache.get((loader, path))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    value = loader(path)
+    with _cache_lock:
+        _cache[(loader, path)] = (key, value)
+    return value
+
+
+def _content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def model_fingerprint(path):
+    """Identity of a saved model file by content, used to pair it with its scaler.
+
+    Copies, restores and `touch` keep the pairing; the hash is only
+    recomputed when the file's mtime or size changes.
+    """
+    return load_cached(path, _content_hash)
+
+
+class OnlineScaler:
+    """Per-feature scaler with streaming min/max and running mean/variance.
+
+    `mode="minmax"` maps the observed range to [0, 1] like sklearn's
+    MinMaxScaler; `mode="standard"` centres on the running mean. Statistics are
+    updated with `partial_fit`, so the scaler can be fitted chunk by chunk or
+    extended from the live feed.
+    """
+
+    def __init__(self, mode="minmax"):
+        if mode not in ("minmax", "standard"):
+            raise ValueError(f"Unknown scaler mode: {mode}")
+        self.mode = mode
+        self.model_version = None
+        self.n_samples_seen_ = 0
+        self.data_min_ = None
+        self.data_max_ = None
+        self.mean_ = None
+        self._m2 = None
+
+    @staticmethod
+    def _as_2d(X):
+        X = np.asarray(X, dtype=float)
+        return X.reshape(-1, 1) if X.ndim < 2 else X
+
+    def partial_fit(self, X):
+        """Fold a batch of rows into the running statistics."""
+        X = self._as_2d(X)
+        if X.shape[0] == 0:
+            return self
+        batch_min, batch_max = X.min(axis=0), X.max(axis=0)
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        n_b = X.shape[0]
+
+        if self.n_samples_seen_ == 0:
+            self.data_min_, self.data_max_ = batch_min, batch_max
+            self.mean_, self._m2 = batch_mean, batch_m2
+        else:
+            # Chan et al. parallel update of mean and sum of squared deviations.
+            n_a = self.n_samples_seen_
+            total = n_a + n_b
+            delta = batch_mean - self.mean_
+            self.mean_ = self.mean_ + delta * n_b / total
+            self._m2 = self._m2 + batch_m2 + delta ** 2 * n_a * n_b / total
+            self.data_min_ = np.minimum(self.data_min_, batch_min)
+            self.data_max_ = np.maximum(self.data_max_, batch_max)
+        self.n_samples_seen_ += n_b
+        return self
+
+    def fit(self, X):
+        """Reset and fit on X."""
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    @property
+    def data_range_(self):
+        return self.data_max_ - self.data_min_
+
+    @property
+    def var_(self):
+        return self._m2 / max(self.n_samples_seen_, 1)
+
+    def _offset_scale(self, column=None):
+        if self.n_samples_seen_ == 0:
+            raise ValueError("OnlineScaler is not fitted yet.")
+        if self.mode == "minmax":
+            offset, scale = self.data_min_, self.data_range_
+        else:
+            offset, scale = self.mean_, np.sqrt(self.var_)
+        scale = np.where(scale == 0, 1.0, scale)
+        if column is not None:
+            return offset[column], scale[column]
+        return offset, scale
+
+    def transform(self, X, clip=False):
+        """Scale rows; `clip` bounds min/max output to [0, 1] for out-of-range live values."""
+        offset, scale = self._offset_scale()
+        out = (self._as_2d(X) - offset) / scale
+        if clip and self.mode == "minmax":
+            np.clip(out, 0.0, 1.0, out=out)
+        return out
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, X, column=None):
+        """Undo scaling for full rows, or for values of a single feature `column`."""
+        offset, scale = self._offset_scale(column)
+        X = np.asarray(X, dtype=float)
+        return X * scale + offset if column is not None else self._as_2d(X) * scale + offset
+
+    def out_of_range(self, X):
+        """Fraction of values per feature outside the fitted [min, max]."""
+        X = self._as_2d(X)
+        return ((X < self.data_min_) | (X > self.data_max_)).mean(axis=0)
+
+    def save(self, path, model_version=None):
+        """Atomically write the scaler to a versioned .npz file."""
+        if model_version is not None:
+            self.model_version = model_version
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.int64(SCALER_FORMAT_VERSION),
+                mode=np.str_(self.mode),
+                model_version=np.str_(self.model_version or ""),
+                n_samples_seen=np.int64(self.n_samples_seen_),
+                data_min=self.data_min_,
+                data_max=self.data_max_,
+                mean=self.mean_,
+                m2=self._m2,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a scaler written by `save` (no pickle, no sklearn)."""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != SCALER_FORMAT_VERSION:
+                raise ValueError(f"Unsupported scaler format version {version} in {path}")
+            scaler = cls(str(data["mode"]))
+            scaler.model_version = str(data["model_version"]) or None
+            scaler.n_samples_seen_ = int(data["n_samples_seen"])
+            scaler.data_min_ = data["data_min"]
+            scaler.data_max_ = data["data_max"]
+            scaler.mean_ = data["mean"]
+            scaler._m2 = data["m2"]
+        return scaler
+
+
+def load_scaler(path):
+    """Returns the scaler at `path`, re-reading the file only when it changes on disk."""
+    return load_cached(path, OnlineScaler.load)
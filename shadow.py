@@ -0,0 +1,157 @@
+import collections
+import os
+import threading
+from config import TRADING_CONFIG, get_logger
+
+logger = get_logger(__name__)
+
+_MODEL_KEYS = ("MODEL_FILE", "SCALER_FILE", "INFERENCE_FILE")
+
+
+def live_paths():
+    return {key: TRADING_CONFIG[key] for key in _MODEL_KEYS}
+
+
+def candidate_paths():
+    """Where a retrained model waits while it is scored in shadow: `<name>.candidate<ext>` next to the live files."""
+    paths = {}
+    for key in _MODEL_KEYS:
+        root, ext = os.path.splitext(TRADING_CONFIG[key])
+        paths[key] = f"{root}.candidate{ext}"
+    return paths
+
+
+# Held while a set of model files is written, swapped or read, so readers never pair files from two models.
+model_files_lock = threading.RLock()
+
+
+def promote_candidate():
+    """Move the candidate files over the live ones; the scaler keeps its model pairing across the rename."""
+    live = live_paths()
+    with model_files_lock:
+        for key, path in candidate_paths().items():
+            os.replace(path, live[key])
+
+
+def discard_candidate():
+    for path in candidate_paths().values():
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class RollingError:
+    """MAE / RMSE over the last `window` resolved predictions, updated in O(1)."""
+
+    def __init__(self, window):
+        self.errors = collections.deque(maxlen=window)
+        self.resolved = 0
+        self._abs = 0.0
+        self._sq = 0.0
+
+    def update(self, error):
+        if len(self.errors) == self.errors.maxlen:
+            old = self.errors[0]
+            self._abs -= abs(old)
+            self._sq -= old * old
+        self.errors.append(error)
+        self._abs += abs(error)
+        self._sq += error * error
+        self.resolved += 1
+
+    @property
+    def count(self):
+        return len(self.errors)
+
+    @property
+    def mae(self):
+        return self._abs / len(self.errors) if self.errors else None
+
+    @property
+    def rmse(self):
+        return (max(self._sq, 0.0) / len(self.errors)) ** 0.5 if self.errors else None
+
+
+class ShadowEvaluator:
+    """Scores the live model and a retrained candidate on the same live windows.
+
+    Each forecast is kept until its horizon elapses and is then scored
+    against the first price seen after that time, as a relative error. Once
+    both models have `min_samples` scores, the candidate is promoted if its
+    rolling MAE beats the live model's by `margin`; after `max_samples`
+    without a win it is rejected.
+    """
+
+    def __init__(self, window=None, min_samples=None, max_samples=None, margin=None):
+        self.window = window or TRADING_CONFIG["SHADOW_WINDOW"]
+        self.min_samples = min_samples or TRADING_CONFIG["SHADOW_MIN_SAMPLES"]
+        self.max_samples = max_samples or TRADING_CONFIG["SHADOW_MAX_SAMPLES"]
+        self.margin = TRADING_CONFIG["SHADOW_MARGIN"] if margin is None else margin
+        self.candidate_version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.errors = {"live": RollingError(self.window), "candidate": RollingError(self.window)}
+        self._pending = {"live": collections.deque(), "candidate": collections.deque()}
+
+    @property
+    def active(self):
+        return self.candidate_version is not None
+
+    def start(self, candidate_version):
+        """Begin scoring a newly trained candidate; scores from any earlier candidate are dropped."""
+        with self._lock:
+            self.candidate_version = candidate_version
+            self._reset()
+        logger.info(f"Shadow evaluation started for candidate model {candidate_version}.")
+
+    def stop(self):
+        with self._lock:
+            self.candidate_version = None
+            self._reset()
+
+    def record(self, name, predicted, due):
+        """Queue a forecast from model `name` ("live" or "candidate") that resolves at time `due`."""
+        with self._lock:
+            self._pending[name].append((due, predicted))
+
+    def on_price(self, price, ts):
+        """Score every forecast whose horizon has elapsed by `ts`."""
+        with self._lock:
+            for name, pending in self._pending.items():
+                while pending and pending[0][0] <= ts:
+                    _, predicted = pending.popleft()
+                    self.errors[name].update((predicted - price) / max(abs(price), 1e-9))
+
+    def decision(self):
+        """Returns "promote", "reject", or None while the comparison is still undecided."""
+        live, candidate = self.errors["live"], self.errors["candidate"]
+        if not self.active or min(live.count, candidate.count) < self.min_samples:
+            return None
+        if candidate.mae < live.mae * (1.0 - self.margin):
+            return "promote"
+        if candidate.resolved >= self.max_samples:
+            return "reject"
+        return None
+
+    def report(self):
+        return {
+            "candidate_version": self.candidate_version,
+            **{name: {"mae": e.mae, "rmse": e.rmse, "scored": e.resolved, "pending": len(self._pending[name])}
+               for name, e in self.errors.items()},
+        }
+
+
+_shadow = None
+_shadow_lock = threading.Lock()
+
+
+def get_shadow():
+    """Returns the process-wide shadow evaluator."""
+    global _shadow
+    with _shadow_lock:
+        if _shadow is None:
+            _shadow = ShadowEvaluator()
+        return _shadow
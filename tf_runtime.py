@@ -0,0 +1,98 @@
+import os
+import tensorflow as tf
+from config import TRADING_CONFIG, get_logger
+
+logger = get_logger(__name__)
+
+_applied = None
+
+
+def tf_profile():
+    """The TensorFlow execution profile from TRADING_CONFIG."""
+    return {
+        "intra_op_threads": TRADING_CONFIG["TF_INTRA_OP_THREADS"],
+        "inter_op_threads": TRADING_CONFIG["TF_INTER_OP_THREADS"],
+        "jit_compile": TRADING_CONFIG["TF_JIT_COMPILE"],
+        "data_cache": TRADING_CONFIG["TF_DATA_CACHE"],
+        "data_prefetch": TRADING_CONFIG["TF_DATA_PREFETCH"],
+        "mixed_precision": TRADING_CONFIG["TF_MIXED_PRECISION"],
+    }
+
+
+def mixed_precision_policy():
+    """The mixed-precision policy this host can run fast, or None.
+
+    GPUs use float16; CPUs only benefit from bfloat16 when they have native
+    bf16 instructions (AVX512_BF16 / AMX), otherwise it is slower than float32.
+    """
+    if tf.config.list_physical_devices("GPU"):
+        return "mixed_float16"
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return None
+    return "mixed_bfloat16" if "avx512_bf16" in flags or "amx_bf16" in flags else None
+
+
+def configure_tensorflow(profile=None):
+    """Apply threading and precision settings; must run before TensorFlow executes any op.
+
+    Thread counts of 0 keep TensorFlow's defaults (all cores). Capping them
+    leaves cores for the feed and GUI threads while a retrain runs.
+    """
+    global _applied
+    profile = profile or tf_profile()
+    if _applied == profile:
+        return profile
+    try:
+        if profile["intra_op_threads"]:
+            tf.config.threading.set_intra_op_parallelism_threads(profile["intra_op_threads"])
+        if profile["inter_op_threads"]:
+            tf.config.threading.set_inter_op_parallelism_threads(profile["inter_op_threads"])
+    except RuntimeError as e:
+        logger.warning(f"TensorFlow threading not applied, runtime already initialized: {e}")
+
+    if profile["mixed_precision"]:
+        policy = mixed_precision_policy()
+        if policy:
+            tf.keras.mixed_precision.set_global_policy(policy)
+            logger.info(f"Mixed precision enabled ({policy}).")
+        else:
+            logger.warning("Mixed precision requested but this host has no fast float16/bfloat16 path; using float32.")
+    _applied = profile
+    return profile
+
+
+def compile_options(profile=None):
+    """Extra `model.compile` arguments for the profile."""
+    profile = profile or tf_profile()
+    return {"jit_compile": True} if profile["jit_compile"] else {}
+
+
+def training_data(X, y, batch_size, profile=None):
+    """Fit inputs for the profile: a cached, prefetching tf.data pipeline or the raw arrays.
+
+    Returns (x, y, fit_kwargs) so callers can pass them straight to `model.fit`.
+    """
+    profile = profile or tf_profile()
+    if not (profile["data_cache"] or profile["data_prefetch"]):
+        return X, y, {"batch_size": batch_size}
+    dataset = tf.data.Dataset.from_tensor_slices((X.astype("float32"), y.astype("float32")))
+    if profile["data_cache"]:
+        dataset = dataset.cache()
+    # model.fit shuffles NumPy inputs every epoch; the dataset does it instead.
+    dataset = dataset.shuffle(len(X), reshuffle_each_iteration=True).batch(batch_size)
+    if profile["data_prefetch"]:
+        dataset = dataset.prefetch(tf.data.AUTOTUNE)
+    return dataset, None, {"shuffle": False}
+
+
+def output_dtype():
+    """Keep the regression head in float32 under mixed precision for numeric stability."""
+    return "float32" if tf.keras.mixed_precision.global_policy().name.startswith("mixed") else None
+
+
+def describe(profile=None):
+    profile = profile or tf_profile()
+    return ", ".join(f"{k}={v}" for k, v in profile.items()) + f", cpus={os.cpu_count()}"
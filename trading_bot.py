@@ -6,7 +6,7 @@ from model import predict_price
 from config import get_logger
 from data_handler import start_live_data_listener
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 class TradingBotGUI:
     def __init__(self, root):
@@ -29,12 +29,12 @@ class TradingBotGUI:
         self.prediction_label = tk.Label(root, text="Predicted Price: -- ± --", font=("Arial", 12))
         self.prediction_label.pack(pady=10)
 
-        threading.Thread(target=start_live_data_listener, daemon=True).start()
+        threading.Thread(target=start_live_data_listener, name="market-data", daemon=True).start()
 
     def start_trading(self):
         if not self.trading_active:
             self.trading_active = True
-            self.trade_thread = threading.Thread(target=self.execute_trades, daemon=True)
+            self.trade_thread = threading.Thread(target=self.execute_trades, name="trade-loop", daemon=True)
             self.trade_thread.start()
             self.root.after(0, self.update_status, "Trading Active")
             self.start_button.config(state=tk.DISABLED)
@@ -1,8 +1,27 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from genetic_trading import APIManager
+from journal import TradeJournal
+from orderbook import OrderBookManager
+from risk import RiskEngine
 
-class TestAPIManagerCoinbase(unittest.TestCase):
+class JournalIsolation:
+    """Journal executed trades to a temporary database instead of the configured trades.db."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal = TradeJournal(db_file=os.path.join(self.tmpdir.name, "trades.db"), flush_interval=0.05)
+        self.journal_patch = patch("journal._journal", self.journal)
+        self.journal_patch.start()
+
+    def tearDown(self):
+        self.journal_patch.stop()
+        self.journal.close()
+        self.tmpdir.cleanup()
+
+class TestAPIManagerCoinbase(JournalIsolation, unittest.TestCase):
     """Test Suite for Coinbase Execution via APIManager"""
 
     @patch("genetic_trading.cbpro.AuthenticatedClient")
@@ -30,7 +49,48 @@ class TestAPIManagerCoinbase(unittest.TestCase):
             manager.execute_trade("ETH-USD", 0, "coinbase", amount="25")
             mock_cbpro_client.return_value.place_market_order.assert_called_once()
 
-class TestAPIManagerOanda(unittest.TestCase):
+    @patch("genetic_trading.cbpro.AuthenticatedClient")
+    def test_execute_trade_rejected_by_risk(self, mock_cbpro_client):
+        with patch.dict("os.environ", {
+            "COINBASE_API_KEY": "dummy",
+            "COINBASE_API_SECRET": "dummy",
+            "COINBASE_API_PASSPHRASE": "dummy"
+        }):
+            manager = APIManager()
+            manager.execute_trade("BTC-USD", 1, "coinbase", amount="1000000")
+            mock_cbpro_client.return_value.place_market_order.assert_not_called()
+
+    @patch("genetic_trading.cbpro.AuthenticatedClient")
+    def test_execute_trade_rejected_on_slippage(self, mock_cbpro_client):
+        books = OrderBookManager()
+        books.handle({"type": "snapshot", "product_id": "BTC-USD",
+                      "bids": [["100.0", "1"]], "asks": [["100.0", "0.1"], ["110.0", "10"]]})
+        with patch.dict("os.environ", {
+            "COINBASE_API_KEY": "dummy",
+            "COINBASE_API_SECRET": "dummy",
+            "COINBASE_API_PASSPHRASE": "dummy"
+        }):
+            manager = APIManager(order_books=books)
+            manager.execute_trade("BTC-USD", 1, "coinbase", amount="50")
+            mock_cbpro_client.return_value.place_market_order.assert_not_called()
+
+    @patch("genetic_trading.cbpro.AuthenticatedClient")
+    def test_execute_trade_rejected_beyond_depth(self, mock_cbpro_client):
+        """An order the visible book cannot fill is rejected rather than estimated on the filled part."""
+        books = OrderBookManager()
+        books.handle({"type": "snapshot", "product_id": "BTC-USD",
+                      "bids": [["100.0", "1"]], "asks": [["100.0", "0.2"]]})
+        with patch.dict("os.environ", {
+            "COINBASE_API_KEY": "dummy",
+            "COINBASE_API_SECRET": "dummy",
+            "COINBASE_API_PASSPHRASE": "dummy"
+        }):
+            manager = APIManager(order_books=books)
+            manager.execute_trade("BTC-USD", 1, "coinbase", amount="50")
+            mock_cbpro_client.return_value.place_market_order.assert_not_called()
+            self.assertNotIn(("coinbase", "BTC-USD"), manager.risk_engine.positions)
+
+class TestAPIManagerOanda(JournalIsolation, unittest.TestCase):
     """Test Suite for OANDA Execution via APIManager"""
 
     @patch("genetic_trading.oandapyV20.API")
@@ -42,8 +102,29 @@ class TestAPIManagerOanda(unittest.TestCase):
             "OANDA_ACCOUNT_ID": "acct_123"
         }):
             manager = APIManager()
-            manager.execute_trade("EUR_USD", 1, "oanda", amount="100")
+            manager.risk_engine.on_tick("EUR_USD", 1.08)
+            manager.execute_trade("EUR_USD", 1, "oanda", amount="50")
             mock_oanda_api.return_value.request.assert_called_once()
 
+    @patch("genetic_trading.oandapyV20.API")
+    @patch("genetic_trading.orders.OrderCreate")
+    def test_units_are_sized_in_dollars(self, mock_order_create, mock_oanda_api):
+        """OANDA units are checked and booked at their USD value, not as dollars."""
+        mock_oanda_api.return_value.request.return_value = {
+            "orderCreateTransaction": {"id": "1"}, "orderFillTransaction": {"id": "2", "price": "1.10000"}}
+        with patch.dict("os.environ", {"OANDA_ACCESS_TOKEN": "dummy", "OANDA_ACCOUNT_ID": "acct_123"}):
+            manager = APIManager(risk_engine=RiskEngine(capital=1000, max_position_size=0.1, cooldown=0))
+            manager.risk_engine.on_tick("EUR_USD", 1.10)
+            manager.execute_trade("EUR_USD", 1, "oanda", amount="95")  # $104.50 > the $100 limit
+            mock_oanda_api.return_value.request.assert_not_called()
+            manager.execute_trade("EUR_USD", 1, "oanda", amount="90")
+            manager.execute_trade("USD_JPY", 0, "oanda", amount="80")  # USD base: units are dollars
+            book = manager.risk_engine.positions
+            self.assertAlmostEqual(book[("oanda", "EUR_USD")].notional, 99.0)
+            self.assertAlmostEqual(book[("oanda", "USD_JPY")].notional, -80.0)
+            manager._close_position(book[("oanda", "EUR_USD")], "take_profit")
+            self.assertEqual(mock_order_create.call_args.kwargs["data"]["order"]["units"], -90)
+            self.assertNotIn(("oanda", "EUR_USD"), manager.risk_engine.positions)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
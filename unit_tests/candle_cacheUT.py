@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+from candle_cache import CandleCache
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestCandleCache(unittest.TestCase):
+    """Test Suite for the Shared Candle Cache"""
+
+    def setUp(self):
+        self.clock = FakeClock(1_000_010.0)  # 10s into a 300s candle (boundary at 999_900)
+        self.cache = CandleCache(max_entries=2, grace=2.0, clock=self.clock)
+        self.calls = 0
+
+    def fetch(self, value="df"):
+        def fn():
+            self.calls += 1
+            return value
+        return fn
+
+    def test_open_range_expires_at_next_candle(self):
+        """Latest-candle data is reused until the current candle closes."""
+        key = ("BTC", 300, None, None)
+        self.cache.get_or_fetch(key, self.fetch())
+        self.clock.now = 1_000_201.0  # boundary at 1_000_200 + 2s grace
+        self.cache.get_or_fetch(key, self.fetch())
+        self.assertEqual(self.calls, 1)
+        self.clock.now = 1_000_202.5
+        self.cache.get_or_fetch(key, self.fetch())
+        self.assertEqual(self.calls, 2)
+
+    def test_closed_range_is_long_lived(self):
+        """A range ending before the current candle does not expire at the boundary."""
+        key = ("BTC", 300, 900_000, 990_000)
+        self.cache.get_or_fetch(key, self.fetch())
+        self.clock.now += 3600
+        self.cache.get_or_fetch(key, self.fetch())
+        self.assertEqual(self.calls, 1)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted past max_entries."""
+        a, b, c = (("A", 300, None, None), ("B", 300, None, None), ("C", 300, None, None))
+        self.cache.get_or_fetch(a, self.fetch())
+        self.cache.get_or_fetch(b, self.fetch())
+        self.cache.get_or_fetch(a, self.fetch())  # a is now most recent
+        self.cache.get_or_fetch(c, self.fetch())
+        self.assertEqual(len(self.cache), 2)
+        self.cache.get_or_fetch(a, self.fetch())
+        self.assertEqual(self.calls, 3)
+        self.cache.get_or_fetch(b, self.fetch())
+        self.assertEqual(self.calls, 4)
+
+    def test_failures_are_not_cached(self):
+        """A None result is returned but the next call fetches again."""
+        key = ("BTC", 300, None, None)
+        self.assertIsNone(self.cache.get_or_fetch(key, self.fetch(None)))
+        self.assertEqual(self.cache.get_or_fetch(key, self.fetch("df")), "df")
+        self.assertEqual(self.calls, 2)
+
+    def test_concurrent_requests_coalesce(self):
+        """Simultaneous misses for one key share a single fetch."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch():
+            self.calls += 1
+            started.set()
+            release.wait()
+            return "df"
+
+        results = []
+        key = ("BTC", 300, None, None)
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get_or_fetch(key, slow_fetch)))
+                   for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for t in threads[1:]:
+            t.start()
+        while self.cache.coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["df"] * 5)
+
+if __name__ == "__main__":
+    unittest.main()
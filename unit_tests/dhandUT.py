@@ -2,11 +2,18 @@ import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import asyncio
-from data_handler import get_historical_data, preprocess_data, start_live_data_listener, data_buffer
+import numpy as np
+from config import TRADING_CONFIG
+import data_handler
+from data_handler import get_historical_data, preprocess_data, start_live_data_listener, data_buffer, candle_cache
 
 class TestDataHandler(unittest.TestCase):
     """Test Suite for Market Data Retrieval & Processing"""
 
+    def setUp(self):
+        """Start every test with an empty shared candle cache."""
+        candle_cache.clear()
+
     @patch("data_handler.requests.get")
     def test_get_historical_data_success(self, mock_get):
         """Test successful API response with valid data."""
@@ -20,6 +27,20 @@ class TestDataHandler(unittest.TestCase):
         self.assertIn("close", df.columns)
         self.assertGreater(len(df), 0)
 
+    @patch("data_handler.requests.get")
+    def test_get_historical_data_cached(self, mock_get):
+        """Test repeated requests are served from the shared cache as copies."""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = [
+            [1700000000, 40000, 40500, 39800, 40300, 1500]
+        ]
+
+        first = get_historical_data("BTC")
+        first["close"] = 0
+        second = get_historical_data("BTC")
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(second["close"].iloc[0], 40300)
+
     @patch("data_handler.requests.get")
     def test_get_historical_data_failure(self, mock_get):
         """Test failed API response handling."""
@@ -32,12 +53,32 @@ class TestDataHandler(unittest.TestCase):
     def test_preprocess_data_valid(self):
         """Test preprocessing with valid data."""
         df_valid = pd.DataFrame({"close": list(range(50, 100))})
-        X, y, scaler = preprocess_data(df_valid, save_scaler=False)
+        X, y, scaler = preprocess_data(df_valid, save_scaler=False, horizons=[1])
         lookback =  TRADING_CONFIG["LOOKBACK"]
         self.assertEqual(X.shape, (len(df_valid) - lookback, lookback, 1))
         self.assertEqual(y.shape[0], len(df_valid) - lookback)
         self.assertIsNotNone(scaler)
 
+    def test_preprocess_data_multi_feature(self):
+        """Test preprocessing with indicator features stacked on close."""
+        df = pd.DataFrame({"close": np.linspace(50, 150, 120)})
+        X, y, _ = preprocess_data(df, save_scaler=False, features=["rsi", "close", "ema_fast"],
+                                   horizons=[1])
+        lookback = TRADING_CONFIG["LOOKBACK"]
+        self.assertEqual(X.shape, (len(df) - lookback, lookback, 3))
+        np.testing.assert_allclose(X[1, -1, 0], y[0, 0])
+
+    def test_preprocess_data_multi_horizon(self):
+        """Test one target column per horizon, each the close that many steps ahead."""
+        df = pd.DataFrame({"close": np.linspace(50, 150, 120)})
+        X, y, _ = preprocess_data(df, save_scaler=False, horizons=[1, 5, 15])
+        lookback = TRADING_CONFIG["LOOKBACK"]
+        self.assertEqual(X.shape, (len(df) - lookback - 14, lookback, 1))
+        self.assertEqual(y.shape, (len(X), 3))
+        np.testing.assert_allclose(y[:-1, 0], X[1:, -1, 0])
+        np.testing.assert_allclose(y[:-4, 1], y[4:, 0])
+        np.testing.assert_allclose(y[:-10, 2], y[10:, 1])
+
     def test_preprocess_data_invalid(self):
         """Test preprocessing with invalid numeric data."""
         df_invalid = pd.DataFrame({"close": ["invalid", None, "NaN"]})
@@ -59,5 +100,45 @@ class TestDataHandler(unittest.TestCase):
         self.assertEqual(len(data_buffer), 1)
         self.assertIsInstance(data_buffer[-1], float)
 
+    def test_live_features_are_per_product_candles(self):
+        """Feature rows advance once per closed candle and per product, after a warm start from history."""
+        history = pd.DataFrame({"time": pd.to_datetime([0, 300, 600], unit="s"), "low": [9.0, 10.0, 11.0],
+                                "high": [11.0, 12.0, 13.0], "open": [10.0, 11.0, 12.0],
+                                "close": [10.0, 11.0, 12.0], "volume": [1.0, 1.0, 1.0]})
+        data_handler.reset_live_state()
+        with patch.dict(TRADING_CONFIG, {"MODEL_FEATURES": ["close", "rsi"], "LIVE_FEED_PRODUCTS": ["BTC-USD"]}), \
+                patch("data_handler.get_historical_data", return_value=history), \
+                patch("indicators.time.time", return_value=850.0):
+            data_handler.warm_live_features(["BTC-USD"])
+            # The candle at 600 is still forming at t=850, so only two rows are warm.
+            self.assertEqual(len(data_handler.feature_buffers["BTC-USD"]), 2)
+            for ts, price in (("1970-01-01T00:10:00Z", 12.0), ("1970-01-01T00:12:00Z", 14.0),
+                              ("1970-01-01T00:15:00Z", 13.0)):
+                data_handler.handle_feed_message({"product_id": "BTC-USD", "price": price, "time": ts})
+            data_handler.handle_feed_message({"product_id": "ETH-USD", "price": 2000.0, "time": "1970-01-01T00:15:00Z"})
+            self.assertEqual(len(data_handler.feature_buffers["BTC-USD"]), 3)  # the 600 candle closed at 900
+            self.assertEqual(len(data_handler.feature_buffers["ETH-USD"]), 0)
+            window = data_handler.latest_window(3)
+        self.assertEqual(window.shape, (3, 2))
+        self.assertEqual(window[-1, 0], 14.0)  # the live candle's close, not the tick that opened the next one
+        data_handler.reset_live_state()
+
+    def test_ring_ticks_after_warm_start(self):
+        """Epoch-timestamped ticks replayed from the tick ring keep their own candles and skip warmed ones."""
+        history = pd.DataFrame({"time": pd.to_datetime([0, 300, 600], unit="s"), "low": [9.0, 10.0, 11.0],
+                                "high": [11.0, 12.0, 13.0], "open": [10.0, 11.0, 12.0],
+                                "close": [10.0, 11.0, 12.0], "volume": [1.0, 1.0, 1.0]})
+        data_handler.reset_live_state()
+        with patch.dict(TRADING_CONFIG, {"MODEL_FEATURES": ["close", "rsi"], "LIVE_FEED_PRODUCTS": ["BTC-USD"]}), \
+                patch("data_handler.get_historical_data", return_value=history), \
+                patch("indicators.time.time", return_value=850.0):
+            data_handler.warm_live_features(["BTC-USD"])
+            # Older ring ticks fall in warmed candles; the rest rebuild the 600 and 900 candles by their own time.
+            for ts, price in ((100.0, 50.0), (450.0, 50.0), (650.0, 12.5), (840.0, 13.0), (910.0, 14.0)):
+                data_handler.handle_feed_message({"product_id": "BTC-USD", "price": price, "time": ts})
+            rows = list(data_handler.feature_buffers["BTC-USD"])
+        self.assertEqual([row[0] for row in rows], [10.0, 11.0, 13.0])
+        data_handler.reset_live_state()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from drift import DriftMonitor
+from scaler import OnlineScaler
+
+class TestDriftMonitor(unittest.TestCase):
+    """Test Suite for Streaming Drift Detection"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.scaler = OnlineScaler()
+        self.scaler.fit(self.rng.normal(100.0, 2.0, (1000, 1)))
+        self.monitor = DriftMonitor(residual_alpha=0.05, residual_z=4.0, warmup=30, input_alpha=0.02, input_z=3.0,
+                                    range_limit=0.25, min_ticks=50)
+        self.monitor.bind(self.scaler, "v1")
+        self.t = 0
+
+    def score(self, errors):
+        """Resolve one forecast per relative error against a price of 100."""
+        for error in errors:
+            self.t += 1
+            self.monitor.record_prediction(100.0 * (1 + error), due=self.t)
+            self.monitor.on_price(100.0, self.t)
+
+    def test_forecasts_resolve_at_due_time(self):
+        """Residuals are only scored once the forecast horizon has elapsed."""
+        self.monitor.record_prediction(101.0, due=10)
+        self.monitor.on_price(100.0, 9)
+        self.assertEqual(self.monitor.residuals, 0)
+        self.monitor.on_price(100.0, 10)
+        self.assertEqual(self.monitor.residuals, 1)
+
+    def test_single_outlier_does_not_alert(self):
+        """One wild forecast after warm-up is not treated as drift."""
+        self.score(np.abs(self.rng.normal(0.01, 0.002, 100)))
+        self.score([0.15])
+        self.assertEqual(self.monitor.check(), [])
+
+    def test_sustained_error_increase_alerts(self):
+        """A persistent rise in forecast error breaches the control limit."""
+        self.score(np.abs(self.rng.normal(0.01, 0.002, 100)))
+        self.assertEqual(self.monitor.check(), [])
+        self.score(np.abs(self.rng.normal(0.02, 0.002, 60)))
+        self.assertTrue(any("forecast error" in r for r in self.monitor.check()))
+
+    def test_input_range_violations_alert(self):
+        """Inputs that stay outside the training range raise both input alerts; a lone spike does not."""
+        for x in self.rng.normal(100.0, 2.0, 100):
+            self.monitor.observe_input([x])
+        self.monitor.observe_input([200.0])
+        self.assertEqual(self.monitor.check(), [])
+        for x in self.rng.normal(130.0, 2.0, 100):
+            self.monitor.observe_input([x])
+        reasons = self.monitor.check()
+        self.assertTrue(any("outside the training range" in r for r in reasons))
+        self.assertTrue(any("shifted" in r for r in reasons))
+
+    def test_rebind_resets_only_on_new_version(self):
+        """Statistics restart when a new model version is bound."""
+        self.score([0.01] * 5)
+        self.monitor.bind(self.scaler, "v1")
+        self.assertEqual(self.monitor.residuals, 5)
+        self.monitor.bind(self.scaler, "v2")
+        self.assertEqual(self.monitor.state()["residuals"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
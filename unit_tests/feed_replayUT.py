@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from feed_replay import FeedRecorder, ReplayHarness, iter_frames, replay_feed
+
+def ticker(price, product_id="BTC-USD"):
+    return json.dumps({"type": "ticker", "product_id": product_id, "price": str(price), "last_size": "0.01"})
+
+class TestFeedReplay(unittest.TestCase):
+    """Test Suite for the Feed Recorder & Replay Harness"""
+
+    def setUp(self):
+        """Record a short synthetic session, 100ms between frames."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        recorder = FeedRecorder(self.tmpdir.name, chunk_frames=40)
+        self.frames = [ticker(100 + i * 0.1) for i in range(100)]
+        for i, raw in enumerate(self.frames):
+            recorder.record(raw, recv_ns=1_700_000_000_000_000_000 + i * 100_000_000)
+        recorder.close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_chunks_round_trip(self):
+        """Frames are split into compressed chunks and read back in order."""
+        chunks = [f for f in os.listdir(self.tmpdir.name) if f.endswith(".jsonl.gz")]
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual([raw for _, raw in iter_frames(self.tmpdir.name)], self.frames)
+
+    def test_paced_replay(self):
+        """At 10x, 9.9s of recorded time is paced as ~0.99s of sleeps."""
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        seen = []
+        replay_feed(self.tmpdir.name, speed=10.0, handler=seen.append, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual(len(seen), 100)
+        self.assertAlmostEqual(sum(slept), 0.99, places=6)
+
+    def test_max_speed_replay_does_not_sleep(self):
+        """Speed 0 replays without pacing."""
+        count = replay_feed(self.tmpdir.name, speed=0, handler=lambda m: None,
+                            sleep=lambda s: self.fail("should not sleep"))
+        self.assertEqual(count, 100)
+
+    def test_harness_runs_pipeline_deterministically(self):
+        """Harness drives buffer, prediction and order stages and reports timings."""
+        import data_handler
+        predictor = lambda: {"price": data_handler.data_buffer[-1] + 1.0}
+        reports = []
+        orders = []
+        for _ in range(2):
+            harness = ReplayHarness(self.tmpdir.name, speed=0, predict_every=10, predictor=predictor)
+            reports.append(harness.run())
+            orders.append(harness.orders)
+        self.assertEqual(orders[0], orders[1])
+        self.assertEqual(reports[0]["ticks"], 100)
+        self.assertEqual(reports[0]["orders"], 10)
+        self.assertEqual(orders[0][0], ("BTC-USD", 1))
+        self.assertIsNotNone(reports[0]["end_to_end"]["p99_ms"])
+
+    def test_harness_isolates_drift_and_shadow_state(self):
+        """The default predictor never retrains, and replay ticks do not reach the process-wide monitors."""
+        import drift
+        import model
+        import shadow
+        monitor, evaluator = drift.get_drift_monitor(), shadow.get_shadow()
+        ticks_before = monitor.ticks
+        seen = []
+
+        def fake_predict(retrain_on_drift=True):
+            seen.append((retrain_on_drift, drift.get_drift_monitor(), shadow.get_shadow()))
+            return None
+
+        with patch.object(model, "predict_price", side_effect=fake_predict):
+            ReplayHarness(self.tmpdir.name, speed=0, predict_every=50).run()
+        self.assertEqual(len(seen), 2)
+        for retrain, run_monitor, run_shadow in seen:
+            self.assertFalse(retrain)
+            self.assertIsNot(run_monitor, monitor)
+            self.assertIsNot(run_shadow, evaluator)
+        self.assertIs(drift.get_drift_monitor(), monitor)
+        self.assertIs(shadow.get_shadow(), evaluator)
+        self.assertEqual(monitor.ticks, ticks_before)
+
+if __name__ == "__main__":
+    unittest.main()
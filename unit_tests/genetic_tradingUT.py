@@ -1,6 +1,13 @@
+import os
+import tempfile
+import threading
 import unittest
+from unittest.mock import patch
 import numpy as np
-from genetic_trading import GeneticTradingStrategy
+import pandas as pd
+import genetic_trading
+from genetic_trading import (GeneticTradingStrategy, PopulationStore, RuleBasedStrategy, RuleSignal, RULE_GENES,
+                             create_strategy, decode_rule, realign_chromosomes)
 
 class TestGeneticTradingStrategy(unittest.TestCase):
     """Test Suite for Genetic Algorithm Strategy Optimization"""
@@ -37,5 +44,182 @@ class TestGeneticTradingStrategy(unittest.TestCase):
         fitness = self.strategy._evaluate_fitness(chromo)
         self.assertGreater(fitness, 1000)  # Started capital baseline
 
+    def test_patience_stops_early(self):
+        """Evolution stops once the best fitness stalls for `patience` generations."""
+        strategy = GeneticTradingStrategy(self.data, pop_size=10, generations=200, patience=3)
+        strategy.evolve()
+        self.assertLess(strategy.stats["generations"], 200)
+        self.assertEqual(strategy.stats["generations"], strategy.stats["converged_at"] + 3)
+        self.assertEqual(strategy.history, sorted(strategy.history))
+
+    def test_seed_population(self):
+        """Seeds fill up to half the population; the rest stays random."""
+        seed = [1] * self.strategy.strategy_size
+        self.assertTrue(self.strategy.seed_population([seed]))
+        self.assertEqual(self.strategy.population[0], seed)
+        self.assertEqual(len(self.strategy.population), 10)
+        self.assertTrue(self.strategy.warm_started)
+        self.assertFalse(self.strategy.seed_population([[1, 0]]))  # wrong length is ignored
+
+class TestRuleBasedStrategy(unittest.TestCase):
+    """Test Suite for the Fixed-Length Rule Encoding"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2000)))
+        self.strategy = RuleBasedStrategy(self.prices, pop_size=10, generations=3)
+
+    def test_chromosome_size_is_independent_of_history(self):
+        """Rule genomes have one gene per parameter for any data length."""
+        self.assertEqual(self.strategy.strategy_size, len(RULE_GENES))
+        short = RuleBasedStrategy(self.prices[:100], pop_size=4, generations=1)
+        self.assertEqual(len(short.population[0]), len(self.strategy.population[0]))
+
+    def test_decode_rule_bounds(self):
+        """Genes decode into their ranges and the slow EMA is always slower."""
+        low, high = decode_rule([0.0] * len(RULE_GENES)), decode_rule([1.0] * len(RULE_GENES))
+        self.assertEqual((low["ema_fast"], low["ema_slow"]), (3, 8))
+        self.assertEqual((high["ema_fast"], high["ema_slow"]), (50, 200))
+        self.assertAlmostEqual(high["take_profit"], 0.20)
+
+    def test_live_signal_matches_vectorized_positions(self):
+        """The O(1) live evaluator reproduces the vectorized backtest positions bar for bar."""
+        rng = np.random.default_rng(11)
+        for _ in range(20):
+            genes = rng.random(len(RULE_GENES)).tolist()
+            signal = RuleSignal(genes)
+            live = [signal.update(price) for price in self.prices]
+            np.testing.assert_array_equal(live, self.strategy.positions(genes))
+
+    def test_evolve_and_latest_signal(self):
+        """Evolution returns a rule whose current signal is a 0/1 position."""
+        best = self.strategy.evolve()
+        self.assertEqual(len(best), len(RULE_GENES))
+        self.assertIn(self.strategy.latest_signal(best), (0, 1))
+        self.assertGreater(self.strategy._evaluate_fitness(best), 0)
+
+    def test_latest_signal_reuses_warmed_evaluator(self):
+        """Later cycles feed only new bars, match a full replay, and rebuild for a new rule."""
+        genetic_trading._live_rule_signals.clear()
+        times = pd.to_datetime(1_700_000_000 + 300 * np.arange(len(self.prices)), unit="s")
+        frame = pd.DataFrame({"time": times, "close": self.prices})
+        genes = np.random.default_rng(3).random(len(RULE_GENES)).tolist()
+        expected = self.strategy.positions(genes)
+
+        RuleBasedStrategy(frame.iloc[:1500], pop_size=2).latest_signal(genes, key="BTC-USD")
+        previous = 1500
+        for end in (1500, 1501, 1510, 1600, 2000):
+            window = RuleBasedStrategy(frame.iloc[end - 1000:end].reset_index(drop=True), pop_size=2)
+            with patch.object(RuleSignal, "update", autospec=True, side_effect=RuleSignal.update) as update:
+                self.assertEqual(window.latest_signal(genes, key="BTC-USD"), expected[end - 1])
+            # The newly closed bars, plus the forming bar on a copy; never the whole 1000-bar window.
+            self.assertEqual(update.call_count, end - previous + 1)
+            previous = end
+
+        other = np.random.default_rng(4).random(len(RULE_GENES)).tolist()
+        self.assertEqual(RuleBasedStrategy(frame, pop_size=2).latest_signal(other, key="BTC-USD"),
+                         self.strategy.positions(other)[-1])
+        self.assertEqual(len(genetic_trading._live_rule_signals), 2)
+
+    def test_latest_signal_concurrent_callers(self):
+        """Concurrent cycles for one asset feed each new bar into the shared evaluator once."""
+        genetic_trading._live_rule_signals.clear()
+        times = pd.to_datetime(1_700_000_000 + 300 * np.arange(len(self.prices)), unit="s")
+        frame = pd.DataFrame({"time": times, "close": self.prices})
+        genes = np.random.default_rng(5).random(len(RULE_GENES)).tolist()
+        RuleBasedStrategy(frame.iloc[:1000], pop_size=2).latest_signal(genes, key="BTC-USD")
+
+        window = RuleBasedStrategy(frame.iloc[:2000], pop_size=2)
+        barrier, results = threading.Barrier(8), []
+
+        def cycle():
+            barrier.wait()
+            results.append(window.latest_signal(genes, key="BTC-USD"))
+
+        workers = [threading.Thread(target=cycle) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(results, [self.strategy.positions(genes)[-1]] * 8)
+        cached, _ = genetic_trading._live_rule_signals[("BTC-USD", tuple(genes))]
+        replayed = RuleSignal(genes)
+        replayed.warm(self.prices[:-1])
+        self.assertEqual((cached._fast.value, cached._rsi.value), (replayed._fast.value, replayed._rsi.value))
+
+    def test_create_strategy(self):
+        """The factory picks the encoding and rejects unknown ones."""
+        self.assertIsInstance(create_strategy(self.prices, encoding="rules", pop_size=4), RuleBasedStrategy)
+        self.assertNotIsInstance(create_strategy(self.prices[:50], encoding="bits", pop_size=4), RuleBasedStrategy)
+        with self.assertRaises(ValueError):
+            create_strategy(self.prices, encoding="trees")
+
+class TestPopulationStore(unittest.TestCase):
+    """Test Suite for Warm-Started GA Populations"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = PopulationStore(self.tmpdir.name, elite_fraction=0.5)
+        times = pd.to_datetime(1_700_000_000 + 300 * np.arange(60), unit="s")
+        self.frame = pd.DataFrame({"time": times, "close": np.linspace(100, 130, 60)})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_realign_shifts_by_candle_time(self):
+        """Genes follow their candles; new candles repeat the last known gene."""
+        chromosomes = np.array([[0, 1, 0, 1, 1]])
+        old_times = np.array([10, 20, 30, 40, 50])
+        realigned = realign_chromosomes(chromosomes, old_times, np.array([30, 40, 50, 60, 70]))
+        np.testing.assert_array_equal(realigned, [[0, 1, 1, 1, 1]])
+        self.assertIsNone(realign_chromosomes(chromosomes, old_times, np.array([60, 70, 80, 90, 100])))
+
+    def test_warm_start_round_trip(self):
+        """A saved elite seeds the next run on a shifted window."""
+        first = GeneticTradingStrategy(self.frame.iloc[:50].reset_index(drop=True), pop_size=10, generations=3)
+        self.assertFalse(self.store.seed(first, "BTC"))
+        first.evolve()
+        self.assertTrue(self.store.save(first, "BTC"))
+        self.store.record_run("BTC", 300, first.stats)
+
+        second = GeneticTradingStrategy(self.frame.iloc[5:55].reset_index(drop=True), pop_size=10, generations=3)
+        self.assertTrue(self.store.seed(second, "BTC"))
+        best = first.elite(0.5)[0]
+        self.assertEqual(second.population[0][:44], best[5:])
+        second.evolve()
+        self.store.record_run("BTC", 300, second.stats)
+
+        summary = self.store.convergence_summary()
+        self.assertEqual((summary["warm"]["runs"], summary["cold"]["runs"]), (1, 1))
+
+    def test_rule_population_round_trip(self):
+        """Rule elites are reused as-is, and an encoding change means a cold start."""
+        first = RuleBasedStrategy(self.frame, pop_size=10, generations=2)
+        first.evolve()
+        self.assertTrue(self.store.save(first, "BTC"))
+        second = RuleBasedStrategy(self.frame.iloc[5:].reset_index(drop=True), pop_size=10, generations=2)
+        self.assertTrue(self.store.seed(second, "BTC"))
+        self.assertEqual(second.population[0], first.elite(0.5)[0])
+        bits = GeneticTradingStrategy(self.frame, pop_size=10, generations=2)
+        self.assertFalse(self.store.seed(bits, "BTC"))
+
+    def test_elite_keeps_best_seen(self):
+        """The best chromosome is saved even when the final generation lost it."""
+        strategy = GeneticTradingStrategy(self.frame, pop_size=4, generations=1)
+        winner = [1] * strategy.strategy_size  # buy and hold on rising prices
+        strategy.population = [winner] + [[0] * strategy.strategy_size] * 3
+        with patch.object(strategy, "_mutate", side_effect=lambda c: [0] * len(c)):
+            best = strategy.evolve()
+        self.assertEqual(best, winner)
+        self.assertNotIn(winner, strategy.population)
+        self.assertEqual(strategy.elite(0.5), [winner, [0] * strategy.strategy_size])
+
+    def test_no_time_column_means_cold_start(self):
+        """Plain price arrays cannot be realigned and are not saved."""
+        strategy = GeneticTradingStrategy(np.linspace(1, 2, 20), pop_size=4, generations=1)
+        strategy.evolve()
+        self.assertFalse(self.store.save(strategy, "BTC"))
+        self.assertFalse(os.listdir(self.tmpdir.name))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+import pandas as pd
+from indicators import FEATURE_COLUMNS, BarFeatureEngine, FeatureEngine, compute_features, ema, rsi
+
+class TestIndicators(unittest.TestCase):
+    """Test Suite for the Vectorized & Incremental Indicator Engine"""
+
+    def setUp(self):
+        """Generate a random-walk candle set."""
+        rng = np.random.default_rng(7)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+        spread = np.abs(rng.normal(0, 0.5, 500))
+        self.df = pd.DataFrame({
+            "low": close - spread,
+            "high": close + spread,
+            "open": close,
+            "close": close,
+            "volume": rng.uniform(1, 10, 500),
+        })
+
+    def test_incremental_matches_vectorized(self):
+        """Per-bar updates reproduce the vectorized feature frame."""
+        vectorized = compute_features(self.df)
+        engine = FeatureEngine()
+        rows = np.array([
+            engine.update(row.close, row.high, row.low, row.volume)
+            for row in self.df.itertuples()
+        ])
+        self.assertEqual(list(vectorized.columns), FEATURE_COLUMNS)
+        np.testing.assert_allclose(rows, vectorized.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    def test_warm_start_continues_from_history(self):
+        """Live updates after a warm start match a full recomputation."""
+        engine = FeatureEngine()
+        engine.warm_start(self.df.iloc[:-1])
+        last = self.df.iloc[-1]
+        row = engine.update(last.close, last.high, last.low, last.volume)
+        np.testing.assert_allclose(row, compute_features(self.df).iloc[-1].to_numpy(), rtol=1e-9, atol=1e-9)
+
+    def test_vwap_independent_of_prior_history(self):
+        """Once the window has rolled, a long-running engine's VWAP equals a batch over a recent candle window."""
+        engine = FeatureEngine(vwap_window=48)
+        live = [engine.update(row.close, row.high, row.low, row.volume)[FEATURE_COLUMNS.index("vwap")]
+                for row in self.df.itertuples()]
+        recent = compute_features(self.df.iloc[-100:], vwap_window=48)["vwap"].to_numpy()
+        np.testing.assert_allclose(live[-52:], recent[-52:], rtol=1e-9)
+        self.assertFalse(np.allclose(live[-100:-52], recent[:48]))  # not yet a full window in the batch
+
+    def test_ema_of_constant_series(self):
+        """EMA of a flat series equals the series."""
+        np.testing.assert_allclose(ema(np.full(50, 3.0), 10), 3.0)
+
+    def test_rsi_bounds(self):
+        """RSI stays within [0, 100] and saturates on a monotonic rise."""
+        values = rsi(self.df["close"].to_numpy(), 14)
+        self.assertTrue(((values >= 0) & (values <= 100)).all())
+        self.assertEqual(rsi(np.arange(1.0, 30.0), 14)[-1], 100.0)
+
+    def test_bar_engine_matches_candle_features(self):
+        """Ticks folded into candles give the candle features, not tick-scale ones."""
+        candles = self.df.iloc[:50]
+        engine = BarFeatureEngine(granularity=60)
+        rows = []
+        for i, c in enumerate(candles.itertuples()):
+            # Open, low, high and close ticks inside candle i; volume arrives with the last tick.
+            for offset, price, volume in ((0, c.open, 0.0), (10, c.low, 0.0), (20, c.high, 0.0), (59, c.close, c.volume)):
+                row = engine.update(price, 60 * i + offset, volume)
+                if row is not None:
+                    rows.append(row)
+        expected = compute_features(candles).to_numpy()[:-1]  # the last candle is still open
+        np.testing.assert_allclose(np.array(rows), expected, rtol=1e-9, atol=1e-9)
+
+    def test_matrix_input_is_per_column(self):
+        """A time x asset matrix gives the same EMA and RSI as each column on its own."""
+        matrix = np.column_stack([self.df["close"].to_numpy(), self.df["high"].to_numpy()])
+        for fn in (lambda x: ema(x, 12), lambda x: rsi(x, 14)):
+            out = fn(matrix)
+            self.assertEqual(out.shape, matrix.shape)
+            for i in range(matrix.shape[1]):
+                np.testing.assert_allclose(out[:, i], fn(matrix[:, i]))
+
+    def test_close_only_input(self):
+        """Features can be computed from close prices alone."""
+        features = compute_features(pd.DataFrame({"close": self.df["close"]}))
+        self.assertFalse(features.isnull().any().any())
+        self.assertEqual(features["atr"].iloc[0], 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from inference import NumpyLSTMRuntime, StackedLSTMRuntime, export_numpy_model
+
+try:
+    import tensorflow as tf
+except ImportError:
+    tf = None
+
+@unittest.skipIf(tf is None, "TensorFlow is required to export a model")
+class TestNumpyLSTMRuntime(unittest.TestCase):
+    """Test Suite for the NumPy LSTM Inference Runtime"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Export a random-weight model with the production architecture."""
+        from model import build_model
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, "model.npz")
+        cls.model = build_model(20, 3)
+        export_numpy_model(cls.model, cls.path, model_version="v1")
+        cls.runtime = NumpyLSTMRuntime.load(cls.path)
+        cls.X = np.random.default_rng(1).random((8, 20, 3), dtype=np.float32)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_matches_keras_forward(self):
+        """Deterministic NumPy output matches Keras inference."""
+        expected = self.model(self.X, training=False).numpy()
+        np.testing.assert_allclose(self.runtime.predict(self.X), expected, rtol=1e-4, atol=1e-5)
+
+    def test_metadata(self):
+        """Export records input shape and model version."""
+        self.assertEqual(self.runtime.input_shape, (20, 3))
+        self.assertEqual(self.runtime.model_version, "v1")
+
+    def test_mc_dropout_batched(self):
+        """MC-dropout returns one sample per run per window, with spread."""
+        samples = self.runtime.predict_mc(self.X, runs=16, rng=np.random.default_rng(0))
+        self.assertEqual(samples.shape, (16, 8, 1))
+        self.assertGreater(samples.std(axis=0).mean(), 0.0)
+
+    def test_mc_dropout_reproducible(self):
+        """Seeded MC-dropout runs are deterministic."""
+        a = self.runtime.predict_mc(self.X[:1], runs=4, rng=np.random.default_rng(5))
+        b = self.runtime.predict_mc(self.X[:1], runs=4, rng=np.random.default_rng(5))
+        np.testing.assert_array_equal(a, b)
+
+    def test_multi_horizon_head(self):
+        """A multi-output head runs in the same pass and its horizons round-trip."""
+        from model import build_model
+        model = build_model(20, 3, n_outputs=3)
+        path = os.path.join(self.tmpdir.name, "horizons.npz")
+        export_numpy_model(model, path, model_version="v2", horizons=[1, 5, 15])
+        runtime = NumpyLSTMRuntime.load(path)
+        self.assertEqual(runtime.horizons, [1, 5, 15])
+        self.assertIsNone(self.runtime.horizons)
+        np.testing.assert_allclose(runtime.predict(self.X), model(self.X, training=False).numpy(),
+                                   rtol=1e-4, atol=1e-5)
+        self.assertEqual(runtime.predict_mc(self.X, runs=4).shape, (4, 8, 3))
+
+    def test_stacked_matches_separate_runtimes(self):
+        """Two models stacked in one pass give the same outputs as running each alone."""
+        from model import build_model
+        path = os.path.join(self.tmpdir.name, "other.npz")
+        export_numpy_model(build_model(20, 3), path, model_version="v3")
+        other = NumpyLSTMRuntime.load(path)
+        stacked = StackedLSTMRuntime([self.runtime, other])
+        X2 = self.X[::-1]
+        out = stacked.predict(np.stack([self.X, X2]))
+        np.testing.assert_allclose(out[0], self.runtime.predict(self.X), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(out[1], other.predict(X2), rtol=1e-5, atol=1e-6)
+        self.assertEqual(stacked.predict_mc(np.stack([self.X, X2]), runs=4).shape, (2, 4, 8, 1))
+
+    def test_stacking_rejects_different_architectures(self):
+        """Runtimes whose layer shapes differ cannot share a pass."""
+        from model import build_model
+        path = os.path.join(self.tmpdir.name, "wide.npz")
+        export_numpy_model(build_model(20, 3, n_outputs=3), path)
+        with self.assertRaises(ValueError):
+            StackedLSTMRuntime([self.runtime, NumpyLSTMRuntime.load(path)])
+
+if __name__ == "__main__":
+    unittest.main()
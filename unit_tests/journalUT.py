@@ -0,0 +1,61 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from journal import TradeJournal
+
+class TestTradeJournal(unittest.TestCase):
+    """Test Suite for the Write-Behind Trade Journal"""
+
+    def setUp(self):
+        """Create a journal backed by a temporary database."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmpdir.name, "trades.db")
+        self.journal = TradeJournal(db_file=self.db_file, batch_size=8, flush_interval=0.05)
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmpdir.cleanup()
+
+    def test_records_are_committed_after_flush(self):
+        """Queued trades and predictions reach SQLite once flushed."""
+        for i in range(20):
+            self.journal.record_trade("coinbase", "BTC-USD", "buy", 100.0, price=40000.0 + i, ts=1000.0 + i)
+        self.journal.record_prediction("BTC-USD", 40000.0, 40100.0, 12.5, ts=2000.0)
+        self.assertTrue(self.journal.flush())
+
+        trades = self.journal.query("trades", asset="BTC-USD")
+        self.assertEqual(len(trades), 20)
+        self.assertEqual(trades[0][1], 1000.0)
+        self.assertEqual(len(self.journal.query("predictions")), 1)
+
+    def test_database_uses_wal_and_asset_time_index(self):
+        """Journal database runs in WAL mode with (asset, time) indexes."""
+        self.journal.flush()
+        with sqlite3.connect(self.db_file) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            indexes = {row[1] for row in conn.execute("SELECT * FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_trades_asset_time", indexes)
+        self.assertIn("idx_predictions_asset_time", indexes)
+
+    def test_export_csv(self):
+        """Trades can be exported to a CSV trade log."""
+        self.journal.record_trade("oanda", "EUR_USD", "sell", 100.0, ts=1.0)
+        self.journal.flush()
+        path = self.journal.export_csv(os.path.join(self.tmpdir.name, "trade_log.csv"))
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0].split(",")[:4], ["id", "time", "venue", "asset"])
+        self.assertEqual(len(lines), 2)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Hot-path enqueue never blocks when the queue is saturated."""
+        journal = TradeJournal(db_file=self.db_file, max_queue=1, flush_interval=0.05)
+        journal._stop.set()
+        journal._thread.join()
+        journal.record_prediction("BTC-USD", 1.0, 1.0, 0.0)
+        journal.record_prediction("BTC-USD", 1.0, 1.0, 0.0)
+        self.assertEqual(journal.dropped, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import logging
+import unittest
+from unittest.mock import patch
+from log_pipeline import ThrottleFilter, JsonFormatter, DeferredQueueHandler, parse_throttle_spec
+
+def make_record(msg="tick", name="data_handler", **extra):
+    record = logging.LogRecord(name, logging.WARNING, __file__, 1, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+class TestLogPipeline(unittest.TestCase):
+    """Test Suite for the Queued Logging Pipeline"""
+
+    def test_parse_throttle_spec(self):
+        """Rate-limit and sampling specs are parsed from the env format."""
+        limits, samples = parse_throttle_spec("malformed_tick=10/60, model=1:100")
+        self.assertEqual(limits, {"malformed_tick": (10, 60.0)})
+        self.assertEqual(samples, {"model": 100})
+        with self.assertRaises(ValueError):
+            parse_throttle_spec("broken")
+
+    def test_rate_limit_by_key(self):
+        """Only N records per window pass for a rate-limited key."""
+        throttle = ThrottleFilter(rate_limits={"malformed_tick": (2, 60)})
+        with patch("log_pipeline.time.monotonic", return_value=100.0):
+            passed = [throttle.filter(make_record(rate_key="malformed_tick")) for _ in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+
+        with patch("log_pipeline.time.monotonic", return_value=200.0):
+            record = make_record(rate_key="malformed_tick")
+            self.assertTrue(throttle.filter(record))
+        self.assertIn("+3 similar suppressed", record.msg)
+
+    def test_sampling_by_logger_name(self):
+        """Sampling keeps one record in N for a module logger."""
+        throttle = ThrottleFilter(sample_rates={"model": 3})
+        passed = [throttle.filter(make_record(name="model")) for _ in range(6)]
+        self.assertEqual(passed, [True, False, False, True, False, False])
+        self.assertTrue(throttle.filter(make_record(name="genetic_trading")))
+
+    def test_json_formatter_includes_extras(self):
+        """JSON-lines output carries the message and structured extras."""
+        payload = json.loads(JsonFormatter().format(make_record("price %s", rate_key="malformed_tick")))
+        self.assertEqual(payload["level"], "WARNING")
+        self.assertEqual(payload["rate_key"], "malformed_tick")
+        self.assertEqual(payload["msg"], "price %s")
+
+    def test_queue_handler_defers_formatting(self):
+        """The caller-side handler leaves message args unformatted."""
+        handler = DeferredQueueHandler(None)
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "value %d", (5,), None)
+        self.assertIs(handler.prepare(record), record)
+        self.assertEqual(record.args, (5,))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import websockets
+from config import TRADING_CONFIG
+from data_handler import _fetch_candles
+from genetic_trading import APIManager
+from journal import TradeJournal
+from mock_exchange import MockExchange, TokenBucket
+from risk import RiskEngine
+
+CREDENTIALS = {
+    "COINBASE_API_KEY": "key",
+    "COINBASE_API_SECRET": "c2VjcmV0",
+    "COINBASE_API_PASSPHRASE": "pass",
+    "OANDA_ACCESS_TOKEN": "token",
+    "OANDA_ACCOUNT_ID": "101-001-1-001",
+}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestMockExchange(unittest.TestCase):
+    """Test Suite for the Local Mock Exchange"""
+
+    def setUp(self):
+        self.exchange = MockExchange(seed=1, tick_interval=0.01).start()
+        self.urls = patch.dict(TRADING_CONFIG, {"COINBASE_API_URL": self.exchange.rest_url,
+                                                "OANDA_API_URL": self.exchange.rest_url})
+        self.urls.start()
+        self.env = patch.dict("os.environ", CREDENTIALS)
+        self.env.start()
+        # Orders are journaled; keep them out of the configured trades.db.
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal = TradeJournal(db_file=os.path.join(self.tmpdir.name, "trades.db"), flush_interval=0.05)
+        self.journal_patch = patch("journal._journal", self.journal)
+        self.journal_patch.start()
+
+    def tearDown(self):
+        self.journal_patch.stop()
+        self.journal.close()
+        self.tmpdir.cleanup()
+        self.env.stop()
+        self.urls.stop()
+        self.exchange.stop()
+
+    def manager(self):
+        return APIManager(risk_engine=RiskEngine(capital=1e9, max_position_size=1.0, cooldown=0))
+
+    def test_token_bucket(self):
+        """The bucket allows a burst, then refills at the configured rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+        self.assertEqual([bucket.allow() for _ in range(3)], [True, True, False])
+        clock.now = 0.5
+        self.assertTrue(bucket.allow())
+        self.assertFalse(bucket.allow())
+
+    def test_orders_through_execute_trade(self):
+        """Real cbpro and oandapyV20 clients place orders against the mock."""
+        manager = self.manager()
+        manager.execute_trade("BTC-USD", 1, "coinbase", amount="50")
+        manager.execute_trade("EUR_USD", 0, "oanda", amount="100")
+        stats = self.exchange.stats()
+        self.assertEqual(stats["coinbase"], {"accepted": 1})
+        self.assertEqual(stats["oanda"], {"accepted": 2})  # a pricing quote to value the units, then the order
+        venues = [(venue, order.get("side") or order.get("units")) for venue, _, order in self.exchange.orders]
+        self.assertEqual(venues, [("coinbase", "buy"), ("oanda", "-100")])
+        self.assertIn(("coinbase", "BTC-USD"), manager.risk_engine.positions)
+        # 100 EUR_USD units are booked as dollars at the fill price.
+        self.assertAlmostEqual(manager.risk_engine.positions[("oanda", "EUR_USD")].notional, -108.0)
+
+    def test_throttled_order_is_not_booked(self):
+        """A 429 from Coinbase is treated as a failed order, not a fill."""
+        self.exchange.buckets["coinbase"] = TokenBucket(rate=0.001, burst=1)
+        manager = self.manager()
+        manager.execute_trade("BTC-USD", 1, "coinbase", amount="50")
+        manager.execute_trade("ETH-USD", 1, "coinbase", amount="50")
+        self.assertEqual(self.exchange.stats()["coinbase"], {"accepted": 1, "throttled": 1})
+        self.assertNotIn(("coinbase", "ETH-USD"), manager.risk_engine.positions)
+
+    def test_injected_errors(self):
+        """error_rate=1 fails every OANDA order with a 500."""
+        self.exchange.error_rate = 1.0
+        manager = self.manager()
+        manager.risk_engine.on_tick("EUR_USD", 1.08)  # a known price, so no pricing request is made
+        manager.execute_trade("EUR_USD", 1, "oanda", amount="100")
+        self.assertEqual(self.exchange.stats()["oanda"], {"errors": 1})
+        self.assertEqual(manager.risk_engine.positions, {})
+
+    def test_candles(self):
+        """Historical candles come back in the Coinbase row format, sorted by the client."""
+        end = 1_700_000_100
+        df = _fetch_candles("BTC", 300, start=end - 3000, end=end)
+        self.assertEqual(list(df.columns), ["time", "low", "high", "open", "close", "volume"])
+        self.assertEqual(len(df), 11)  # both ends of the range are inclusive
+        self.assertTrue(df["time"].is_monotonic_increasing)
+        self.assertTrue((df["low"] <= df["close"]).all() and (df["close"] <= df["high"]).all())
+        again = _fetch_candles("BTC", 300, start=end - 3000, end=end)
+        self.assertTrue(df["close"].equals(again["close"]))
+
+    def test_websocket_feed(self):
+        """Subscribing returns subscriptions, a level2 snapshot and streaming updates."""
+        async def read():
+            async with websockets.connect(self.exchange.ws_url) as ws:
+                await ws.send(json.dumps({"type": "subscribe", "channels": [
+                    {"name": "ticker", "product_ids": ["BTC-USD"]}, {"name": "level2", "product_ids": ["BTC-USD"]}]}))
+                return [json.loads(await ws.recv()) for _ in range(5)]
+
+        messages = asyncio.run(read())
+        kinds = [m["type"] for m in messages]
+        self.assertEqual(kinds[:2], ["subscriptions", "snapshot"])
+        self.assertIn("ticker", kinds[2:])
+        self.assertIn("l2update", kinds[2:])
+        ticker = next(m for m in messages if m["type"] == "ticker")
+        self.assertGreater(float(ticker["price"]), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,22 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
 import numpy as np
 from unittest.mock import patch, MagicMock
+from config import TRADING_CONFIG
+import model
 from model import train_or_update_model, predict_price
+from scaler import OnlineScaler
 
 class TestModel(unittest.TestCase):
     """Test Suite for AI Model Training & Predictions"""
 
     @patch("model.get_historical_data")
     @patch("model.preprocess_data")
-    @patch("model.Sequential")
+    @patch("model.build_model")
     def test_train_model_success(self, mock_model, mock_preprocess, mock_get_data):
         """Test model training with valid data."""
         mock_get_data.return_value = np.random.rand(100, 5)
@@ -24,6 +32,29 @@ class TestModel(unittest.TestCase):
         with self.assertRaises(Exception):
             train_or_update_model()
 
+    def test_one_training_at_a_time(self):
+        """Training requested while another runs is skipped, whichever path requested it."""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch(*args, **kwargs):
+            started.set()
+            release.wait(10)
+            return None
+
+        with patch("model.get_historical_data", side_effect=slow_fetch) as fetch:
+            first = threading.Thread(target=train_or_update_model)
+            first.start()
+            try:
+                self.assertTrue(started.wait(10))
+                self.assertFalse(train_or_update_model())
+                with patch.object(model, "_last_drift_retrain", float("-inf")):
+                    self.assertFalse(model._retrain_in_background("Drift detected"))
+            finally:
+                release.set()
+                first.join(10)
+            self.assertEqual(fetch.call_count, 1)
+            self.assertTrue(train_or_update_model())
+
     @patch("model.predict_price")
     def test_predict_price(self, mock_predict):
         """Test prediction output with mocked LSTM model."""
@@ -38,5 +69,26 @@ class TestModel(unittest.TestCase):
             prediction = predict_price()
             self.assertIsNone(prediction)
 
+    def test_scaler_mismatch_schedules_live_retrain(self):
+        """A scaler paired with another model aborts the prediction and retrains the live files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path, scaler_path = os.path.join(tmpdir, "m.h5"), os.path.join(tmpdir, "s.npz")
+            with open(model_path, "wb") as f:
+                f.write(b"weights")
+            OnlineScaler().fit(np.arange(10.0)).save(scaler_path, model_version="another-model")
+            window = [100.0] * TRADING_CONFIG["LOOKBACK"]
+            with patch.dict(TRADING_CONFIG, {"MODEL_FILE": model_path}), patch("model.SCALER_FILE", scaler_path), \
+                    patch("model.data_buffer", new=window), patch("model._retrain_in_background") as retrain:
+                self.assertIsNone(predict_price())
+            retrain.assert_called_once()
+            self.assertIs(retrain.call_args.kwargs["candidate"], False)
+
+    def test_import_does_not_load_tensorflow(self):
+        """NumPy-only inference processes can import the model module without TensorFlow."""
+        code = "import sys, model; sys.exit('tensorflow' in sys.modules)"
+        repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=repo, env=os.environ.copy(), capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr.decode()[-500:])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import unittest
+from orderbook import OrderBook, OrderBookManager
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "coinbase_level2.jsonl")
+
+class TestOrderBook(unittest.TestCase):
+    """Test Suite for Level-2 Order Book Maintenance"""
+
+    def setUp(self):
+        """Replay recorded Coinbase level2 messages into a manager."""
+        self.manager = OrderBookManager()
+        with open(FIXTURE) as f:
+            self.handled = [self.manager.handle(json.loads(line)) for line in f]
+        self.book = self.manager.get("BTC-USD")
+
+    def test_non_book_messages_are_skipped(self):
+        """Subscription and ticker messages are not consumed by the book."""
+        self.assertEqual(self.handled, [False, True, True, True, True, False, True, True])
+        self.assertIsNone(self.manager.get("ETH-USD"))
+
+    def test_top_of_book_after_updates(self):
+        """Best bid/ask reflect inserts and deletions from l2update."""
+        self.assertEqual(self.book.best_bid(), (43250.5, 0.25))
+        self.assertEqual(self.book.best_ask(), (43251.25, 0.6))
+        self.assertAlmostEqual(self.book.spread(), 0.75)
+
+    def test_depth_is_sorted(self):
+        """Depth lists bids descending and asks ascending."""
+        depth = self.book.depth(levels=3)
+        self.assertEqual([p for p, _ in depth["bids"]], [43250.5, 43250.12, 43250.0])
+        self.assertEqual([p for p, _ in depth["asks"]], [43251.25, 43251.5, 43252.75])
+        self.assertEqual(depth["bids"][2][1], 3.0)
+        self.assertNotIn(43249.5, [p for p, _ in self.book.depth(levels=10)["bids"]])
+
+    def test_vwap_for_size_walks_levels(self):
+        """A buy for 1.0 BTC sweeps 0.6 @ 43251.25 and 0.4 @ 43251.5."""
+        vwap, filled, unfilled = self.book.vwap_for_size("buy", size=1.0)
+        self.assertAlmostEqual(filled, 1.0)
+        self.assertEqual(unfilled, 0.0)
+        self.assertAlmostEqual(vwap, (0.6 * 43251.25 + 0.4 * 43251.5) / 1.0)
+        self.assertGreater(self.book.slippage_bps("buy", size=1.0), 0)
+
+    def test_vwap_for_funds(self):
+        """Funds-based sells are converted to size at each level."""
+        vwap, filled, _ = self.book.vwap_for_size("sell", funds=43250.5 * 0.25)
+        self.assertAlmostEqual(filled, 0.25)
+        self.assertAlmostEqual(vwap, 43250.5)
+        self.assertAlmostEqual(self.book.slippage_bps("sell", funds=43250.5 * 0.25), 0.0)
+
+    def test_empty_book(self):
+        """Empty books return no estimate."""
+        book = OrderBook("XRP-USD")
+        self.assertIsNone(book.mid())
+        self.assertEqual(book.vwap_for_size("buy", size=1.0), (None, 0.0, 1.0))
+
+    def test_order_beyond_depth(self):
+        """An order larger than the visible side reports its remainder and unbounded slippage."""
+        book = OrderBook("XRP-USD")
+        book.apply_snapshot([["0.5", "100"]], [["0.6", "100"], ["0.7", "50"]])
+        vwap, filled, unfilled = book.vwap_for_size("buy", size=200)
+        self.assertAlmostEqual(filled, 150)
+        self.assertAlmostEqual(unfilled, 50)
+        self.assertAlmostEqual(vwap, (100 * 0.6 + 50 * 0.7) / 150)
+        _, _, unfilled = book.vwap_for_size("sell", funds=60)
+        self.assertAlmostEqual(unfilled, 10)
+        self.assertEqual(book.slippage_bps("sell", funds=60), float("inf"))
+
+    def test_reads_during_feed_updates(self):
+        """Walking the book while the feed thread inserts and removes levels never fails mid-iteration."""
+        book = OrderBook("BTC-USD")
+        book.apply_snapshot([], [[str(100 + i), "1"] for i in range(200)])
+        stop = threading.Event()
+
+        def feed():
+            i = 0
+            while not stop.is_set():
+                price = str(100 + i % 200)
+                book.apply_changes([("sell", price, "0"), ("sell", price, "1")])
+                i += 1
+
+        writer = threading.Thread(target=feed)
+        writer.start()
+        try:
+            for _ in range(2000):
+                vwap, filled, unfilled = book.vwap_for_size("buy", size=150)
+                self.assertAlmostEqual(filled + unfilled, 150)
+        finally:
+            stop.set()
+            writer.join()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import queue
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from orderbook import OrderBookManager
+from pipeline import PipelineSupervisor, TickRing, execution_process, forward_book_message
+
+class TestTickRing(unittest.TestCase):
+    """Test Suite for the Shared-Memory Tick Ring"""
+
+    def setUp(self):
+        self.ring = TickRing(capacity=8, create=True)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_write_and_read_across_attachments(self):
+        """A reader attached by name sees records in publish order."""
+        reader = TickRing(self.ring.name)
+        try:
+            for i in range(5):
+                self.ring.write(1000.0 + i, 0, 100.0 + i, 0.5)
+            records, cursor, dropped = reader.read(0)
+            self.assertEqual(reader.capacity, 8)
+            self.assertEqual(cursor, 5)
+            self.assertEqual(dropped, 0)
+            np.testing.assert_array_equal(records[:, 2], [100, 101, 102, 103, 104])
+
+            records, cursor, _ = reader.read(cursor)
+            self.assertEqual(len(records), 0)
+        finally:
+            reader.close()
+
+    def test_lapped_reader_skips_ahead(self):
+        """A reader more than one ring behind gets the newest records and a drop count."""
+        for i in range(20):
+            self.ring.write(i, 0, float(i))
+        records, cursor, dropped = self.ring.read(0)
+        self.assertEqual(dropped, 13)
+        self.assertEqual(cursor, 20)
+        np.testing.assert_array_equal(records[:, 2], np.arange(13, 20))
+        self.assertEqual(self.ring.oldest(), 13)
+
+    def test_reader_exactly_one_ring_behind(self):
+        """The oldest slot is the next one the writer fills, so a reader `capacity` behind skips it."""
+        for i in range(8):
+            self.ring.write(i, 0, float(i))
+        records, cursor, dropped = self.ring.read(0)
+        self.assertEqual((dropped, cursor), (1, 8))
+        np.testing.assert_array_equal(records[:, 2], np.arange(1, 8))
+
+        records, _, dropped = self.ring.read(1)
+        self.assertEqual(dropped, 0)
+        np.testing.assert_array_equal(records[:, 2], np.arange(1, 8))
+
+    def test_max_records(self):
+        """Reads can be chunked."""
+        for i in range(6):
+            self.ring.write(i, 0, float(i))
+        records, cursor, _ = self.ring.read(0, max_records=4)
+        self.assertEqual((len(records), cursor), (4, 4))
+
+class TestExecutionStage(unittest.TestCase):
+    """Test Suite for the Execution Process and its Inputs"""
+
+    def test_dropped_book_update_is_resent_as_snapshot(self):
+        """After a full queue the next message for that product is the feed's whole book."""
+        books, resync, updates = OrderBookManager(), set(), queue.Queue(maxsize=1)
+        snapshot = {"type": "snapshot", "product_id": "BTC-USD", "bids": [["99", "1"]], "asks": [["101", "1"]]}
+        books.handle(snapshot)
+        forward_book_message(updates, books, snapshot, resync)
+        change = {"type": "l2update", "product_id": "BTC-USD", "changes": [["sell", "100.5", "2"]]}
+        books.handle(change)
+        forward_book_message(updates, books, change, resync)  # queue full: dropped
+        self.assertEqual(resync, {"BTC-USD"})
+
+        updates.get_nowait()
+        change = {"type": "l2update", "product_id": "BTC-USD", "changes": [["buy", "99.5", "3"]]}
+        books.handle(change)
+        forward_book_message(updates, books, change, resync)
+        resent = updates.get_nowait()
+        self.assertEqual(resent["type"], "snapshot")
+        self.assertEqual(resent["asks"], [(100.5, 2.0), (101.0, 1.0)])
+        self.assertEqual(resent["bids"], [(99.5, 3.0), (99.0, 1.0)])
+        self.assertEqual(resync, set())
+
+    def test_orders_use_forwarded_books(self):
+        """Signals are executed with order books built from the forwarded level-2 messages."""
+        ring = TickRing(capacity=16, create=True)
+        signals, events, book_updates = queue.Queue(), queue.Queue(), queue.Queue()
+        trading, stop = threading.Event(), threading.Event()
+        trading.set()
+        book_updates.put({"type": "snapshot", "product_id": "BTC-USD", "bids": [["99", "1"]], "asks": [["101", "1"]]})
+        manager = MagicMock()
+        manager.execute_trade.side_effect = lambda *args: stop.set()
+        try:
+            with patch("genetic_trading.APIManager", return_value=manager) as api_manager:
+                worker = threading.Thread(target=execution_process, args=(
+                    ring.name, ["BTC-USD"], signals, events, trading, stop, book_updates))
+                worker.start()
+                signals.put({"product_id": "ETH-USD", "signal": 1, "source": "ga"})
+                worker.join(10)
+            books = api_manager.call_args.kwargs["order_books"]
+            self.assertTrue(books.get("BTC-USD").synced)
+            self.assertEqual(books.get("BTC-USD").best_ask(), (101.0, 1.0))
+            manager.execute_trade.assert_called_once_with("ETH-USD", 1, "coinbase")
+        finally:
+            stop.set()
+            ring.close()
+
+class TestPipelineSupervisor(unittest.TestCase):
+    """Test Suite for the Pipeline Supervisor"""
+
+    def test_restarts_crashed_stage(self):
+        """A crashing stage is restarted while a healthy one keeps running."""
+        supervisor = PipelineSupervisor(stages={"crashy": (os._exit, (3,)), "steady": (time.sleep, (30,))},
+                                        capacity=16, max_backoff=0.0)
+        supervisor.start()
+        try:
+            deadline = time.monotonic() + 20
+            while supervisor.restarts["crashy"] < 2 and time.monotonic() < deadline:
+                time.sleep(0.1)
+            status = supervisor.status()
+            self.assertGreaterEqual(status["stages"]["crashy"]["restarts"], 2)
+            self.assertTrue(status["stages"]["steady"]["alive"])
+            self.assertEqual(status["stages"]["steady"]["restarts"], 0)
+        finally:
+            supervisor.stop(timeout=0.5)
+        self.assertFalse(any(p.is_alive() for p in supervisor.processes.values()))
+
+    def test_trading_flag(self):
+        """Trading is off until enabled."""
+        supervisor = PipelineSupervisor(stages={}, capacity=16)
+        try:
+            self.assertFalse(supervisor.status()["trading"])
+            supervisor.set_trading(True)
+            self.assertTrue(supervisor.status()["trading"])
+        finally:
+            supervisor.stop()
+
+    def test_submit_signal(self):
+        """Signals from outside the pipeline reach the execution queue."""
+        supervisor = PipelineSupervisor(stages={}, capacity=16)
+        try:
+            self.assertTrue(supervisor.submit_signal("ETH-USD", 0, source="ga"))
+            message = supervisor.signals.get(timeout=5)
+            self.assertEqual((message["product_id"], message["signal"], message["source"]), ("ETH-USD", 0, "ga"))
+        finally:
+            supervisor.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from genetic_trading import RuleBasedStrategy
+from config import TRADING_CONFIG
+from portfolio import PortfolioBacktest, load_close_matrix, run_portfolio_backtest
+
+class TestPortfolioBacktest(unittest.TestCase):
+    """Test Suite for the Vectorized Multi-Asset Backtest"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (3000, 5)), axis=0)),
+                                   columns=["BTC-USD", "ETH-USD", "LTC-USD", "XRP-USD", "ADA-USD"])
+        self.genes = [0.2, 0.3, 0.5, 0.6, 0.7, 0.3, 0.4]
+        self.backtest = PortfolioBacktest(self.closes, capital=1000, max_position_size=0.3,
+                                          max_concurrent_trades=2, fee_rate=0.001)
+
+    def test_asset_equity_matches_single_asset_fitness(self):
+        """Each asset's standalone curve ends where the GA's rule fitness does."""
+        result = self.backtest.run(self.genes)
+        for asset in self.closes:
+            strategy = RuleBasedStrategy(self.closes[asset].to_numpy(), pop_size=2, generations=1, fee_rate=0.001)
+            self.assertAlmostEqual(result["asset_equity"][asset].iloc[-1], strategy._evaluate_fitness(self.genes),
+                                   places=6)
+
+    def test_position_limits(self):
+        """At most max_concurrent_trades assets are held, each at no more than max_position_size."""
+        weights = self.backtest.run(self.genes)["weights"]
+        self.assertLessEqual((weights > 0).sum(axis=1).max(), 2)
+        self.assertLessEqual(weights.to_numpy().max(), 0.3)
+        # Five slots of 0.3 would lever the account; each is capped at 1/5 instead.
+        wide = PortfolioBacktest(self.closes, max_position_size=0.3, max_concurrent_trades=5).run(self.genes)
+        self.assertLessEqual(wide["weights"].sum(axis=1).max(), 1.0 + 1e-12)
+
+    def test_contributions_sum_to_portfolio_pnl(self):
+        """Per-asset P&L, fees included, adds up to the portfolio equity curve."""
+        result = self.backtest.run(self.genes)
+        np.testing.assert_allclose(1000 + result["contribution"].sum(axis=1), result["equity"], rtol=1e-9)
+        self.assertEqual(sum(m["trades"] for m in result["asset_metrics"].values()), result["metrics"]["trades"])
+
+    def test_fees_scale_with_turnover(self):
+        """Fees take exactly fee_rate of the equity traded at every weight change."""
+        paid = self.backtest.run(self.genes)
+        free = PortfolioBacktest(self.closes, capital=1000, max_position_size=0.3, max_concurrent_trades=2,
+                                 fee_rate=0.0).run(self.genes)
+        turnover = paid["weights"].diff().fillna(paid["weights"]).abs().sum(axis=1)
+        self.assertGreater(paid["metrics"]["trades"], 0)
+        np.testing.assert_allclose(paid["equity"] / free["equity"], np.cumprod(1 - 0.001 * turnover), rtol=1e-9)
+
+    def test_load_close_matrix_aligns_assets(self):
+        """Candles are joined on time, gaps carry the last close, and failed assets are skipped."""
+        def fake_history(asset, granularity, start=None, end=None):
+            times = {"BTC": [0, 300, 600, 900], "ETH": [300, 900], "LTC": []}[asset]
+            closes = {"BTC": 10.0, "ETH": 20.0, "LTC": 0.0}[asset] + np.arange(len(times))
+            return pd.DataFrame({"time": pd.to_datetime(times, unit="s"), "close": closes}) if times else None
+
+        with patch("portfolio.get_historical_data", side_effect=fake_history):
+            closes = load_close_matrix(["BTC-USD", "ETH-USD", "LTC-USD"])
+        self.assertEqual(list(closes.columns), ["BTC-USD", "ETH-USD"])
+        self.assertEqual(closes["ETH-USD"].tolist(), [20.0, 20.0, 21.0])
+        self.assertEqual(closes["BTC-USD"].tolist(), [11.0, 12.0, 13.0])
+
+    def test_no_assets_configured(self):
+        """An empty asset list loads nothing instead of failing to size the fetch pool."""
+        with patch.dict(TRADING_CONFIG, {"PORTFOLIO_ASSETS": []}), \
+                patch("portfolio.get_historical_data") as fetch:
+            self.assertIsNone(load_close_matrix())
+            self.assertIsNone(run_portfolio_backtest())
+        fetch.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
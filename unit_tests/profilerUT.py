@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from profiler import SamplingProfiler, thread_cpu_times
+
+def spin(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+def busy_worker(stop):
+    while not stop.is_set():
+        spin(0.005)
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test Suite for the Sampling Profiler"""
+
+    def setUp(self):
+        self.profiler = SamplingProfiler(interval=0.002)
+
+    def tearDown(self):
+        self.profiler.stop()
+
+    def test_thread_cpu_times_by_name(self):
+        """CPU time is reported per named thread."""
+        done = threading.Event()
+        worker = threading.Thread(target=lambda: (spin(0.05), done.wait()), name="cpu-burner")
+        worker.start()
+        try:
+            time.sleep(0.1)
+            self.assertGreaterEqual(thread_cpu_times()["cpu-burner"], 0.04)
+        finally:
+            done.set()
+            worker.join()
+
+    def test_samples_attribute_stacks_to_threads(self):
+        """Collapsed stacks start with the thread name and include the hot function."""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_worker, args=(stop,), name="hot-loop")
+        worker.start()
+        self.profiler.start()
+        time.sleep(0.2)
+        self.profiler.stop()
+        stop.set()
+        worker.join()
+
+        hot = [line for line in self.profiler.collapsed() if line.startswith("hot-loop;")]
+        self.assertTrue(hot)
+        self.assertIn("profilerUT:spin", hot[0])
+        self.assertTrue(hot[0].rsplit(" ", 1)[1].isdigit())
+        self.assertFalse(any(line.startswith("profiler;") for line in self.profiler.collapsed()))
+
+    def test_stage_accounting_only_when_enabled(self):
+        """Stages record calls and CPU while enabled and nothing while disabled."""
+        with self.profiler.stage("predict"):
+            spin(0.01)
+        self.assertEqual(self.profiler.stages, {})
+
+        self.profiler.start()
+        for _ in range(3):
+            with self.profiler.stage("predict"):
+                spin(0.01)
+        stats = self.profiler.report()["stages"]["predict"]
+        self.assertEqual(stats["calls"], 3)
+        self.assertGreaterEqual(stats["cpu_s"], 0.025)
+
+    def test_dump_writes_collapsed_and_report(self):
+        """Dump produces a flamegraph input file and a JSON report."""
+        self.profiler.start()
+        time.sleep(0.05)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            collapsed_path, report_path = self.profiler.dump(tmpdir)
+            self.assertTrue(os.path.getsize(collapsed_path) > 0)
+            with open(report_path) as f:
+                report = json.load(f)
+        self.assertGreater(report["samples"], 0)
+        self.assertIn("MainThread", report["threads"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock
+from risk import RiskEngine
+
+class FakeClock:
+    def __init__(self, now=1000.0): self.now = now
+    def __call__(self): return self.now
+
+class TestRiskEngine(unittest.TestCase):
+    """Test Suite for the In-Memory Position & Risk Book"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.engine = RiskEngine(capital=1000, max_position_size=0.1, max_concurrent_trades=2, cooldown=60,
+                                 stop_loss_percent=0.02, take_profit_percent=0.05, clock=self.clock)
+
+    def test_position_size_limit(self):
+        """Orders beyond MAX_POSITION_SIZE of capital are rejected."""
+        self.assertTrue(self.engine.check_order("coinbase", "BTC-USD", "buy", 100)[0])
+        allowed, reason = self.engine.check_order("coinbase", "BTC-USD", "buy", 150)
+        self.assertFalse(allowed)
+        self.assertIn("max size", reason)
+
+    def test_cooldown_and_reducing_orders(self):
+        """Cooldown blocks new risk but never blocks reducing a position."""
+        self.engine.on_fill("coinbase", "BTC-USD", "buy", 50, 100.0)
+        self.assertFalse(self.engine.check_order("coinbase", "BTC-USD", "buy", 10)[0])
+        self.assertTrue(self.engine.check_order("coinbase", "BTC-USD", "sell", 50)[0])
+        self.clock.now += 61
+        self.assertTrue(self.engine.check_order("coinbase", "BTC-USD", "buy", 10)[0])
+
+    def test_max_concurrent_trades(self):
+        """A new symbol is rejected once the concurrent position cap is hit."""
+        self.engine.on_fill("coinbase", "BTC-USD", "buy", 50, 100.0)
+        self.engine.on_fill("coinbase", "ETH-USD", "buy", 50, 10.0)
+        allowed, reason = self.engine.check_order("coinbase", "LTC-USD", "buy", 50)
+        self.assertFalse(allowed)
+        self.assertIn("concurrent", reason)
+
+    def test_fill_netting(self):
+        """Opposite fills net the position down and close it at zero."""
+        self.engine.on_fill("coinbase", "BTC-USD", "buy", 80, 100.0)
+        self.engine.on_fill("coinbase", "BTC-USD", "sell", 30, 101.0)
+        self.assertAlmostEqual(self.engine.positions[("coinbase", "BTC-USD")].notional, 50)
+        self.engine.on_fill("coinbase", "BTC-USD", "sell", 50, 101.0)
+        self.assertNotIn(("coinbase", "BTC-USD"), self.engine.positions)
+
+    def test_stop_loss_and_take_profit_triggers(self):
+        """Ticks crossing stop/take levels fire exactly once per position."""
+        callback = MagicMock()
+        self.engine.on_trigger(callback)
+        self.engine.on_fill("coinbase", "BTC-USD", "buy", 50, 100.0)
+        self.engine.on_fill("coinbase", "ETH-USD", "sell", 50, 10.0)
+
+        self.assertEqual(self.engine.on_tick("BTC-USD", 99.0), [])
+        fired = self.engine.on_tick("BTC-USD", 97.9)
+        self.assertEqual([reason for _, reason in fired], ["stop_loss"])
+        self.assertEqual(self.engine.on_tick("BTC-USD", 97.0), [])
+
+        fired = self.engine.on_tick("ETH-USD", 9.4)
+        self.assertEqual([reason for _, reason in fired], ["take_profit"])
+        self.assertEqual(callback.call_count, 2)
+
+    def test_stale_levels_are_ignored(self):
+        """Levels of a closed position do not fire for a newer one."""
+        self.engine.on_fill("coinbase", "BTC-USD", "buy", 50, 100.0)
+        self.engine.on_fill("coinbase", "BTC-USD", "sell", 50, 100.0)
+        self.clock.now += 61
+        self.engine.on_fill("coinbase", "BTC-USD", "buy", 50, 90.0)
+        self.assertEqual(self.engine.on_tick("BTC-USD", 93.0), [])
+        self.assertEqual(len(self.engine.on_tick("BTC-USD", 88.0)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
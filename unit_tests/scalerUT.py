@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from scaler import OnlineScaler, load_scaler, model_fingerprint
+
+class TestOnlineScaler(unittest.TestCase):
+    """Test Suite for the Online Scaler & .npz Persistence"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.X = rng.normal(100, 15, size=(500, 3))
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "scaler.npz")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_streaming_matches_batch_fit(self):
+        """Chunked partial_fit yields the same statistics as a single fit."""
+        batch = OnlineScaler().fit(self.X)
+        streaming = OnlineScaler()
+        for chunk in np.array_split(self.X, 7):
+            streaming.partial_fit(chunk)
+        np.testing.assert_allclose(streaming.data_min_, batch.data_min_)
+        np.testing.assert_allclose(streaming.data_max_, batch.data_max_)
+        np.testing.assert_allclose(streaming.mean_, self.X.mean(axis=0))
+        np.testing.assert_allclose(streaming.var_, self.X.var(axis=0))
+
+    def test_minmax_transform_round_trip(self):
+        """Transform maps the fitted range to [0, 1] and inverts exactly."""
+        scaler = OnlineScaler()
+        scaled = scaler.fit_transform(self.X)
+        self.assertAlmostEqual(scaled.min(), 0.0)
+        self.assertAlmostEqual(scaled.max(), 1.0)
+        np.testing.assert_allclose(scaler.inverse_transform(scaled), self.X)
+        np.testing.assert_allclose(scaler.inverse_transform(scaled[:, 0], column=0), self.X[:, 0])
+
+    def test_out_of_range_and_clip(self):
+        """Values beyond the training range are reported and can be clipped."""
+        scaler = OnlineScaler().fit(np.arange(10.0))
+        live = np.array([5.0, 12.0, -1.0, 3.0])
+        self.assertAlmostEqual(scaler.out_of_range(live)[0], 0.5)
+        clipped = scaler.transform(live, clip=True)
+        self.assertEqual(clipped.max(), 1.0)
+        self.assertEqual(clipped.min(), 0.0)
+
+    def test_save_and_load(self):
+        """Scaler persists to .npz with its model version."""
+        scaler = OnlineScaler("standard").fit(self.X)
+        scaler.save(self.path, model_version="123:456")
+        loaded = OnlineScaler.load(self.path)
+        self.assertEqual(loaded.mode, "standard")
+        self.assertEqual(loaded.model_version, "123:456")
+        np.testing.assert_allclose(loaded.transform(self.X), scaler.transform(self.X))
+
+    def test_load_scaler_caches_until_file_changes(self):
+        """load_scaler reuses the parsed scaler until the file is rewritten."""
+        OnlineScaler().fit(self.X).save(self.path)
+        first = load_scaler(self.path)
+        self.assertIs(load_scaler(self.path), first)
+        OnlineScaler().fit(self.X * 2).save(self.path)
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))
+        self.assertIsNot(load_scaler(self.path), first)
+
+    def test_model_fingerprint_tracks_file(self):
+        """Fingerprint changes when the model file is rewritten."""
+        model_path = os.path.join(self.tmpdir.name, "model.h5")
+        with open(model_path, "wb") as f:
+            f.write(b"v1")
+        before = model_fingerprint(model_path)
+        with open(model_path, "wb") as f:
+            f.write(b"v2-longer")
+        self.assertNotEqual(before, model_fingerprint(model_path))
+
+    def test_model_fingerprint_survives_copy_and_touch(self):
+        """Fingerprint depends on the content only, so copies and touched files still pair with their scaler."""
+        model_path = os.path.join(self.tmpdir.name, "model.h5")
+        with open(model_path, "wb") as f:
+            f.write(b"weights")
+        before = model_fingerprint(model_path)
+        os.utime(model_path, ns=(0, 1))
+        copy_path = os.path.join(self.tmpdir.name, "restored.h5")
+        shutil.copy(model_path, copy_path)
+        self.assertEqual(model_fingerprint(model_path), before)
+        self.assertEqual(model_fingerprint(copy_path), before)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from shadow import (RollingError, ShadowEvaluator, candidate_paths, discard_candidate, model_files_lock,
+                    promote_candidate)
+
+class TestShadowEvaluation(unittest.TestCase):
+    """Test Suite for Shadow Model Evaluation"""
+
+    def setUp(self):
+        self.shadow = ShadowEvaluator(window=10, min_samples=5, max_samples=20, margin=0.1)
+        self.shadow.start("candidate-v1")
+
+    def feed(self, live_error, candidate_error, n, start=0):
+        """Score n windows where the models miss a price of 100 by the given fractions."""
+        for t in range(start, start + n):
+            self.shadow.record("live", 100 * (1 + live_error), due=t + 1)
+            self.shadow.record("candidate", 100 * (1 + candidate_error), due=t + 1)
+            self.shadow.on_price(100.0, t + 1)
+
+    def test_rolling_error_window(self):
+        """Rolling MAE/RMSE cover only the last `window` errors."""
+        errors = RollingError(3)
+        for e in (10.0, -1.0, 2.0, -3.0):
+            errors.update(e)
+        self.assertEqual(errors.count, 3)
+        self.assertEqual(errors.resolved, 4)
+        self.assertAlmostEqual(errors.mae, 2.0)
+        self.assertAlmostEqual(errors.rmse, (14 / 3) ** 0.5)
+
+    def test_forecasts_wait_for_horizon(self):
+        """A forecast is only scored once its due time has passed."""
+        self.shadow.record("live", 110.0, due=50)
+        self.shadow.on_price(100.0, 49)
+        self.assertEqual(self.shadow.errors["live"].count, 0)
+        self.shadow.on_price(100.0, 50)
+        self.assertAlmostEqual(self.shadow.errors["live"].mae, 0.1)
+
+    def test_promotes_better_candidate(self):
+        """The candidate is promoted only after min_samples and only when it wins by the margin."""
+        self.feed(0.02, 0.01, 4)
+        self.assertIsNone(self.shadow.decision())
+        self.feed(0.02, 0.01, 1, start=4)
+        self.assertEqual(self.shadow.decision(), "promote")
+
+    def test_rejects_candidate_without_win(self):
+        """A candidate that never beats the live model is rejected after max_samples."""
+        self.feed(0.02, 0.019, 19)
+        self.assertIsNone(self.shadow.decision())
+        self.feed(0.02, 0.019, 1, start=19)
+        self.assertEqual(self.shadow.decision(), "reject")
+
+    def test_promote_and_discard_files(self):
+        """Promotion moves candidate files over the live ones; discarding removes them."""
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {"MODEL_FILE": os.path.join(tmp, "m.h5"), "SCALER_FILE": os.path.join(tmp, "s.npz"),
+                      "INFERENCE_FILE": os.path.join(tmp, "m.npz")}
+            with patch.dict("shadow.TRADING_CONFIG", config):
+                paths = candidate_paths()
+                self.assertEqual(paths["MODEL_FILE"], os.path.join(tmp, "m.candidate.h5"))
+                for key, path in paths.items():
+                    with open(path, "w") as f:
+                        f.write(key)
+                promote_candidate()
+                for key, path in config.items():
+                    with open(path) as f:
+                        self.assertEqual(f.read(), key)
+                    self.assertFalse(os.path.exists(paths[key]))
+                open(paths["MODEL_FILE"], "w").close()
+                discard_candidate()
+                self.assertFalse(os.path.exists(paths["MODEL_FILE"]))
+
+    def test_promotion_waits_for_readers(self):
+        """A reader holding the model-files lock sees either every live file or every promoted one."""
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {"MODEL_FILE": os.path.join(tmp, "m.h5"), "SCALER_FILE": os.path.join(tmp, "s.npz"),
+                      "INFERENCE_FILE": os.path.join(tmp, "m.npz")}
+            with patch.dict("shadow.TRADING_CONFIG", config):
+                for key in config:
+                    for path, text in ((config[key], "live"), (candidate_paths()[key], "candidate")):
+                        with open(path, "w") as f:
+                            f.write(text)
+                with model_files_lock:
+                    promotion = threading.Thread(target=promote_candidate)
+                    promotion.start()
+                    promotion.join(0.2)
+                    self.assertTrue(promotion.is_alive())
+                    for path in config.values():
+                        with open(path) as f:
+                            self.assertEqual(f.read(), "live")
+                promotion.join(5)
+                for path in config.values():
+                    with open(path) as f:
+                        self.assertEqual(f.read(), "candidate")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+
+try:
+    import tensorflow as tf
+    import tf_runtime
+except ImportError:
+    tf = None
+
+BASE = {"intra_op_threads": 0, "inter_op_threads": 0, "jit_compile": False,
+        "data_cache": False, "data_prefetch": False, "mixed_precision": False}
+
+@unittest.skipIf(tf is None, "TensorFlow is required")
+class TestTfRuntime(unittest.TestCase):
+    """Test Suite for the TensorFlow Execution Profile"""
+
+    def setUp(self):
+        self.X = np.random.rand(40, 5, 1)
+        self.y = np.random.rand(40, 1)
+
+    def test_default_profile_keeps_numpy_inputs(self):
+        """Without tf.data options the arrays go to fit unchanged."""
+        x, y, kwargs = tf_runtime.training_data(self.X, self.y, 16, profile=BASE)
+        self.assertIs(x, self.X)
+        self.assertEqual(kwargs, {"batch_size": 16})
+        self.assertEqual(tf_runtime.compile_options(BASE), {})
+
+    def test_tf_data_pipeline(self):
+        """Cache/prefetch builds a batched dataset covering every sample."""
+        profile = dict(BASE, data_cache=True, data_prefetch=True)
+        dataset, y, kwargs = tf_runtime.training_data(self.X, self.y, 16, profile=profile)
+        self.assertIsNone(y)
+        self.assertEqual(kwargs, {"shuffle": False})
+        sizes = [int(xb.shape[0]) for xb, _ in dataset]
+        self.assertEqual(sizes, [16, 16, 8])
+
+    def test_jit_compile_option(self):
+        """XLA is requested through compile arguments."""
+        self.assertEqual(tf_runtime.compile_options(dict(BASE, jit_compile=True)), {"jit_compile": True})
+
+    def test_mixed_precision_skipped_without_hardware_support(self):
+        """No fast half-precision path leaves the float32 policy in place."""
+        with patch("tf_runtime.mixed_precision_policy", return_value=None):
+            tf_runtime.configure_tensorflow(dict(BASE, mixed_precision=True))
+        self.assertEqual(tf.keras.mixed_precision.global_policy().name, "float32")
+        self.assertIsNone(tf_runtime.output_dtype())
+
+if __name__ == "__main__":
+    unittest.main()